@@ -0,0 +1,246 @@
+""" Micro-benchmarks for the Staircase hot path.
+
+    Measures add_response and replay throughput, _calc_reversals/
+    _calc_level cost versus nDown, DataWrangler query cost versus
+    history length, plot data preparation time and memory per
+    trial. Results are compared with the stored baselines in
+    baselines.json; a metric more than `threshold` (default 50%)
+    above its baseline is a regression. Timings are the best of
+    several repeats, but on a shared machine sub-microsecond
+    timings can still differ by up to 2x between runs, so --update
+    stores the median of several full runs rather than a single,
+    possibly lucky, one.
+
+    Usage (from the repository root):
+        python -m benchmarks.bench_staircase            compare
+        python -m benchmarks.bench_staircase --update   store baselines
+        python -m benchmarks.bench_staircase --update --runs 9
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models import staircase
+
+
+#########
+# BEGIN #
+#########
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+
+def _make_staircase(nDown=2):
+    """ Staircase that never finishes on its own.
+    """
+    return staircase.Staircase(
+        start_val=60,
+        step_sizes=[8,4],
+        nUp=1,
+        nDown=nDown,
+        nTrials=10**9,
+        nReversals=10**9,
+        rapid_descend=False,
+        min_val=0,
+        max_val=100
+    )
+
+
+def _responses(n, seed=0):
+    """ Reproducible random responses, 70% correct.
+    """
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random(n) < 0.7, 1, -1).tolist()
+
+
+def _filled_staircase(n, nDown=2):
+    """ Staircase with n trials of history.
+    """
+    s = _make_staircase(nDown)
+    for response in _responses(n):
+        s.add_response(response)
+    return s
+
+
+def _per_call(func, number, repeat=7):
+    """ Best time per call in seconds over repeat runs.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def bench_add_response(n=20000):
+    """ Seconds per add_response call.
+    """
+    responses = _responses(n)
+
+    def run():
+        s = _make_staircase()
+        for response in responses:
+            s.add_response(response)
+
+    return {'add_response_s': _per_call(run, 1, repeat=15) / n}
+
+
+def bench_replay(n=100000):
+    """ Seconds per trial replayed with models.replay.
+    """
+    config = _make_staircase().config()
+    responses = np.array(_responses(n))
+    return {'replay_s': _per_call(lambda: replay.replay(config, responses),
+                                  1) / n}
+
+
+def bench_calc_vs_nDown(nDowns=(1, 2, 4, 8), number=100000):
+    """ Seconds per _calc_reversals and _calc_level call for each nDown.
+    """
+    results = {}
+    for nDown in nDowns:
+        s = _filled_staircase(100, nDown)
+        results[f'calc_reversals_nDown{nDown}_s'] = _per_call(
+            s._calc_reversals, number)
+        results[f'calc_level_nDown{nDown}_s'] = _per_call(
+            s._calc_level, number)
+    return results
+
+
+def bench_queries_vs_history(sizes=(1000, 10000, 100000), number=20000):
+    """ Seconds per DataWrangler query for each history length.
+    """
+    results = {}
+    for n in sizes:
+        s = _filled_staircase(n)
+        dw = s.dw
+        results[f'correct_rows_{n}_s'] = _per_call(dw.correct_rows, number)
+        results[f'reversal_levels_{n}_s'] = _per_call(
+            dw.reversal_levels, number)
+        results[f'threshold_{n}_s'] = _per_call(s.threshold, number)
+    return results
+
+
+def bench_plot_series(sizes=(1000, 100000), number=None):
+    """ Seconds to prepare the plot_data series. By default each
+        size is called often enough to cover about 2 million trials
+        of history per repeat.
+    """
+    results = {}
+    for n in sizes:
+        s = _filled_staircase(n)
+        results[f'plot_series_{n}_s'] = _per_call(
+            s._plot_series, number or max(2 * 10**6 // n, 20))
+    return results
+
+
+def bench_memory_per_trial(n=20000):
+    """ Bytes allocated and retained per trial.
+    """
+    responses = _responses(n)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    s = _make_staircase()
+    for response in responses:
+        s.add_response(response)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'memory_per_trial_bytes': (after - before) / n}
+
+
+BENCHMARKS = (
+    bench_add_response,
+    bench_replay,
+    bench_calc_vs_nDown,
+    bench_queries_vs_history,
+    bench_plot_series,
+    bench_memory_per_trial,
+)
+
+
+def run_all():
+    """ Run every benchmark and return a dictionary of metrics.
+        Every metric is a cost: lower is better.
+    """
+    results = {}
+    for bench in BENCHMARKS:
+        results.update(bench())
+    return results
+
+
+def median_results(runs):
+    """ Return the median of each metric over a list of run_all
+        results.
+    """
+    return {name: float(np.median([run[name] for run in runs]))
+            for name in runs[0]}
+
+
+def compare(results, baselines, threshold=0.5):
+    """ Return {metric: (result, baseline)} for metrics more than
+        threshold above their baseline. Metrics without a baseline
+        are skipped.
+    """
+    return {
+        name: (value, baselines[name])
+        for name, value in results.items()
+        if name in baselines and value > baselines[name] * (1 + threshold)
+    }
+
+
+def load_baselines(path=BASELINE_PATH):
+    """ Read stored baselines, or return {} if there are none.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--update', action='store_true',
+                        help="store the results as the new baselines")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="allowed fractional slowdown (default 0.5)")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="full runs to take the median of with --update "
+                             "(default 5)")
+    args = parser.parse_args(argv)
+
+    if args.update:
+        results = median_results([run_all() for _ in range(args.runs)])
+    else:
+        results = run_all()
+    baselines = load_baselines()
+    for name, value in results.items():
+        base = baselines.get(name)
+        ratio = f"{value / base:6.2f}x" if base else "   new"
+        print(f"{name:32s} {value:12.4g} {ratio}")
+
+    if args.update:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold)
+    for name, (value, base) in regressions.items():
+        print(f"REGRESSION {name}: {value:.4g} vs baseline {base:.4g}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
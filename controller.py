@@ -4,14 +4,19 @@
 # Imports #
 ###########
 # Import data science packages
+import asyncio
 import random
+import time
 
 # Import GUI packages
 import tkinter as tk
 from tkinter import ttk
 
 # Import custom modules
+from models import events
+from models import pipeline
 from models import staircase
+from views import live_plot
 
 
 #########
@@ -36,25 +41,40 @@ s = staircase.Staircase(
 #############
 # Functions #
 #############
+def _show_finished(event):
+    if event['event'] == 'finished':
+        mean, sd = s.threshold()
+        status.set(f"Finished: threshold {mean:.1f} (SD {sd:.1f})")
+
+
 def _first_interval():
     if values[0] == 1:
-        s.add_response(1)
+        session.submit(1, onset_time=onset)
     elif values[1] == 1:
-        s.add_response(-1)
+        session.submit(-1, onset_time=onset)
 
 
 def _second_interval():
     if values[0] == 1:
-        s.add_response(-1)
+        session.submit(-1, onset_time=onset)
     elif values[1] == 1:
-        s.add_response(1)
+        session.submit(1, onset_time=onset)
+
+
+async def _main():
+    await asyncio.gather(
+        session.run(),
+        pipeline.pump_tk(root, on_close=session.stop)
+    )
 
 
 def _on_start():
     global values
+    global onset
     values = random.sample(interval_order, 2)
     int1.set(values[0])
     int2.set(values[1])
+    onset = time.perf_counter()
 
 
 #########
@@ -66,6 +86,7 @@ global int1
 global int2
 int1 = tk.IntVar(value=None)
 int2 = tk.IntVar(value=None)
+status = tk.StringVar(value="")
 
 # Frames
 frm_main = ttk.Frame(root)
@@ -90,4 +111,17 @@ ttk.Button(frm_main, text="2", command=_second_interval).grid(
 # Plot
 ttk.Button(frm_main, text="Plot", command=s.plot_data).grid(row=25, column=5, columnspan=15)
 
-root.mainloop()
+# Status
+ttk.Label(frm_main, textvariable=status).grid(row=30, column=5, columnspan=30)
+
+# Live track
+track = live_plot.LiveTrackPlot(s, master=frm_main, n_trials=s.nTrials,
+                                listen=False)
+track.widget.grid(row=35, column=5, columnspan=30)
+
+# Session pipeline: button callbacks only queue responses; scoring
+# and display run as separate stages on the asyncio loop
+session = pipeline.SessionPipeline(
+    s, display=[events.console_listener, track, _show_finished])
+
+asyncio.run(_main())
@@ -0,0 +1,131 @@
+""" Cohort analysis of archived session files.
+
+    analyze_sessions reads many session files (see models.session) in
+    worker processes and reduces each to one row of summary
+    statistics. Only the level, response and reversal columns are
+    read: text sessions are streamed line by line and binary sessions
+    are memory-mapped, and no Staircase or DataPoint objects are
+    built. Thresholds use the same reversal rules as
+    Staircase.threshold.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Import data science packages
+import numpy as np
+import pandas as pd
+
+# Import custom modules
+from models.session import load_session
+from models.staircase import reversal_window
+
+
+#########
+# BEGIN #
+#########
+COLUMNS = ('level', 'response', 'reversal')
+
+
+def find_sessions(root):
+    """ Return the paths of every session under root, sorted:
+        .csv and .jsonl files, and binary session directories
+        (those containing config.json).
+    """
+    paths = []
+    for folder, dirs, files in os.walk(root):
+        if 'config.json' in files:
+            paths.append(folder)
+            dirs.clear()
+            continue
+        paths.extend(os.path.join(folder, name) for name in files
+                     if name.endswith(('.csv', '.jsonl')))
+    return sorted(paths)
+
+
+def phase_starts(config, n_reversals):
+    """ Reversal count at which each step-size phase began, as
+        recorded by Staircase._update_step_index.
+    """
+    n_steps = len(config['step_sizes'])
+    return [i * config['nReversals'] for i in range(n_steps)
+            if i * config['nReversals'] <= n_reversals]
+
+
+def summarize_session(config, columns, last=4, exclude=0, phase=None):
+    """ Reduce one session's columns to a dictionary of statistics.
+        last, exclude and phase are as for Staircase.threshold.
+    """
+    levels = np.asarray(columns['level'])
+    reversal_levels = levels[np.asarray(columns['reversal'])]
+    n_reversals = len(reversal_levels)
+    starts = phase_starts(config, n_reversals)
+    start, stop = reversal_window(starts, n_reversals, last, exclude, phase)
+    window = reversal_levels[start:stop]
+
+    responses = np.asarray(columns['response'])
+    n_trials = len(levels)
+    finished = n_trials >= config['nTrials'] or (
+        len(starts) == len(config['step_sizes']) and
+        n_reversals - starts[-1] >= config['nReversals'])
+    return {
+        'n_trials': n_trials,
+        'n_correct': int((responses == 1).sum()),
+        'n_incorrect': int((responses == -1).sum()),
+        'n_reversals': n_reversals,
+        'threshold': window.mean() if len(window) else np.nan,
+        'threshold_sd': window.std(ddof=1) if len(window) > 1 else np.nan,
+        'final_level': levels[-1] if n_trials else np.nan,
+        'finished': bool(finished),
+    }
+
+
+def _analyze_file(path, last, exclude, phase):
+    """ Summarize one session file, recording rather than raising
+        read errors.
+    """
+    row = {'path': path}
+    try:
+        config, columns = load_session(path, mmap=True, names=COLUMNS)
+    except (OSError, ValueError, KeyError) as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row
+    row.update(config)
+    row.update(summarize_session(config, columns, last, exclude, phase))
+    row['error'] = None
+    return row
+
+
+def analyze_sessions(paths, last=4, exclude=0, phase=None, max_workers=None,
+                     chunksize=16):
+    """ Summarize every session in paths (a list of session paths,
+        or a directory to search with find_sessions).
+
+        Files are processed in a pool of max_workers processes, in
+        chunks of chunksize files; max_workers=1 runs in the calling
+        process. Return a DataFrame with one row per session: the
+        path, the session's configuration, the statistics from
+        summarize_session and an error column, which holds the read
+        error for files that could not be read (their statistics are
+        missing).
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = find_sessions(paths)
+    analyze = partial(_analyze_file, last=last, exclude=exclude, phase=phase)
+
+    if max_workers == 1:
+        rows = [analyze(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(pool.map(analyze, paths, chunksize=chunksize))
+
+    return pd.DataFrame(rows)
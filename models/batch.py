@@ -0,0 +1,212 @@
+""" Vectorized batch of independent adaptive staircases for simulation.
+
+    Advances N staircases in lockstep, holding levels, rule states,
+    step indices and reversal counts as NumPy arrays. Level and
+    reversal decisions are lookups in the same compiled transition
+    tables that Staircase uses (see models.rules).
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import rules
+
+
+#########
+# BEGIN #
+#########
+class BatchStaircase:
+    """ N independent staircases updated together.
+
+        start_val, nUp, nDown, rapid_descend, min_val and max_val
+        may be scalars or arrays of length n. step_sizes may be a
+        flat sequence shared by all runs, or a 2D array with one row
+        of step sizes per run. As with Staircase, each step size is
+        used for nReversals reversals and a run finishes after
+        nTrials trials or once the final step size has nReversals
+        reversals. Finished runs stop updating.
+    """
+    def __init__(self, n, start_val, step_sizes, nUp, nDown, nTrials,
+                 nReversals, rapid_descend, min_val, max_val):
+
+        # Assign arguments to attributes
+        self.n = n
+        self.step_sizes = np.broadcast_to(
+            np.atleast_2d(np.asarray(step_sizes, dtype=float)),
+            (n, np.shape(step_sizes)[-1])
+        )
+        self.nUp = np.broadcast_to(np.asarray(nUp, dtype=int), (n,))
+        self.nDown = np.broadcast_to(np.asarray(nDown, dtype=int), (n,))
+        self.nTrials = nTrials
+        self.nReversals = nReversals
+        self.rapid_descend = np.broadcast_to(
+            np.asarray(rapid_descend, dtype=bool), (n,))
+        self.min_val = np.broadcast_to(np.asarray(min_val, dtype=float), (n,))
+        self.max_val = np.broadcast_to(np.asarray(max_val, dtype=float), (n,))
+        self.current_level = np.broadcast_to(
+            np.asarray(start_val, dtype=float), (n,)).copy()
+
+        # Additional attributes
+        self.n_reversals = np.zeros(n, dtype=int)
+        self._step_index = np.zeros(n, dtype=int)
+        self.trial_counts = np.zeros(n, dtype=int)
+        self._trial_num = 0
+
+        # Transition tables of every run's rule, each run's rule
+        # state and the level move decided by its last response
+        self._next_state, self._moves, self._reversals, self._state = \
+            rules.compile_rules(n, nUp, nDown, rapid_descend)
+        self._move = np.zeros(n, dtype=np.int8)
+
+        # Row index for per-run step size lookups
+        self._rows = np.arange(n)
+
+        # Number of step-size phases; a run's reversal target is
+        # nReversals in each
+        self.n_phases = self.step_sizes.shape[1]
+        self._last_step = self.n_phases - 1
+        self._target_reversals = self.nReversals * self.n_phases
+
+
+    def _current_step(self):
+        """ Return the active step size for each run.
+        """
+        return self.step_sizes[self._rows, self._step_index]
+
+
+    @property
+    def converged(self):
+        """ Boolean mask of runs whose final step size has
+            reached nReversals reversals.
+        """
+        return self.n_reversals >= self._target_reversals
+
+
+    @property
+    def finished(self):
+        """ Boolean mask of runs that have finished.
+        """
+        return (self.trial_counts >= self.nTrials) | self.converged
+
+
+    def finished_at(self, run):
+        """ Return True if one run has finished (see finished),
+            without building the mask for every run.
+        """
+        return bool(self.trial_counts[run] >= self.nTrials or
+                    self.n_reversals[run] >= self._target_reversals)
+
+
+    def _calc_reversals(self, correct, active):
+        """ Look up each active run's next rule state, level move and
+            reversal. Return a boolean mask of active runs with a
+            reversal on this trial.
+        """
+        outcome = (~correct).astype(np.int64)
+        reversals = self._reversals[self._state, outcome] & active
+        self._move = np.where(active, self._moves[self._state, outcome], 0)
+        self._state = np.where(
+            active, self._next_state[self._state, outcome], self._state)
+
+        self.n_reversals += reversals
+        return reversals
+
+
+    def _update_step_index(self):
+        """ Use the next step size after every nReversals reversals.
+        """
+        np.minimum(self.n_reversals // self.nReversals, self._last_step,
+                   out=self._step_index)
+
+
+    def _calc_level(self):
+        """ Calculate the next presentation level for each run by
+            applying the move set by _calc_reversals (zero for runs
+            that are not active).
+        """
+        self.current_level += self._move * self._current_step()
+
+        # Make sure levels stay within the provided limits
+        np.minimum(self.current_level, self.max_val, out=self.current_level)
+        np.maximum(self.current_level, self.min_val, out=self.current_level)
+
+
+    def add_response(self, responses, runs=None):
+        """ Score one response per run (1 = correct, -1 = incorrect).
+            Check for reversals and advance step sizes.
+            Calculate next levels.
+            Increase trial counters.
+
+            If runs (indices or a boolean mask) is given, only those
+            runs are updated; responses may then be a scalar.
+            Responses for finished runs are ignored. Return a boolean
+            mask of runs that reversed.
+        """
+        responses = np.asarray(responses)
+        active = ~self.finished
+        if runs is not None:
+            selected = np.zeros(self.n, dtype=bool)
+            selected[runs] = True
+            active &= selected
+        if not np.all((responses == 1) | (responses == -1) | ~active):
+            raise ValueError("Responses must be 1 (correct) or -1 (incorrect)")
+        correct = responses == 1
+
+        reversals = self._calc_reversals(correct, active)
+        self._update_step_index()
+        self._calc_level()
+        self.trial_counts += active
+        self._trial_num += 1
+
+        return reversals
+
+
+    def run(self, responder, n_trials=None):
+        """ Drive all runs for up to n_trials (default: nTrials),
+            stopping early once every run has finished.
+
+            responder is called with the array of current levels and
+            must return an array of responses (1 or -1) of length n.
+            Return (levels, scores, reversals) as arrays of shape
+            (trials run, n). Entries after a run finished are nan,
+            0 and False respectively.
+        """
+        if n_trials is None:
+            n_trials = self.nTrials
+
+        levels = np.full((n_trials, self.n), np.nan)
+        scores = np.zeros((n_trials, self.n), dtype=np.int8)
+        reversals = np.zeros((n_trials, self.n), dtype=bool)
+
+        for trial in range(n_trials):
+            active = ~self.finished
+            if not active.any():
+                return levels[:trial], scores[:trial], reversals[:trial]
+            levels[trial, active] = self.current_level[active]
+            response = responder(self.current_level)
+            scores[trial, active] = np.asarray(
+                np.broadcast_to(response, (self.n,)))[active]
+            reversals[trial] = self.add_response(response)
+
+        return levels, scores, reversals
+
+
+def reversal_thresholds(levels, reversals, last):
+    """ Return the mean level of the last `last` reversals of each
+        run, from (trials, runs) arrays as returned by
+        BatchStaircase.run. Runs without reversals give nan.
+    """
+    counts = np.cumsum(reversals, axis=0)
+    mask = reversals & (counts > counts[-1] - last)
+    total = np.where(mask, levels, 0).sum(axis=0)
+    n = mask.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, total / n, np.nan)
@@ -0,0 +1,219 @@
+""" Bayesian adaptive tracker (QUEST / PSI style).
+
+    BayesianStaircase keeps a posterior over psychometric threshold
+    (and optionally slope) on a fixed grid and chooses each
+    presentation level from it. It shares the Staircase interface:
+    current_level, add_response, run, finished, threshold, listeners
+    and a DataWrangler trial log (the trial loop, listeners and log
+    come from the same Tracker base class), so it can be driven,
+    persisted and displayed the same way.
+
+    Likelihood tables for every (level, threshold, slope) are computed
+    once. An update multiplies the posterior by one row of a table.
+    PSI level selection (minimum expected posterior entropy) reduces
+    to two matrix-vector products with cached tables, because the
+    entropy terms that depend only on the likelihood are precomputed.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models.staircase import DataWrangler, Tracker
+
+
+#########
+# BEGIN #
+#########
+def _xlogx(x):
+    """ x * log(x), with 0 * log(0) = 0.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(x > 0, x * np.log(x), 0.0)
+
+
+class BayesianStaircase(Tracker):
+    """ Adaptive tracker with a gridded posterior over a logistic
+        psychometric function:
+
+            p = guess_rate + (1 - guess_rate - lapse_rate) /
+                (1 + exp(-slope * (level - threshold)))
+
+        Levels and candidate thresholds lie on a grid from min_val to
+        max_val in steps of grid_step. slopes lists candidate slopes
+        (one value fixes the slope). The prior is uniform, or normal
+        around start_val if prior_sd is given.
+
+        method chooses the next level:
+            'psi'   - minimum expected posterior entropy
+            'quest' - posterior mean threshold
+        The first trial is presented at the grid level nearest
+        start_val.
+
+        The track finishes after nTrials trials, or sooner once the
+        posterior SD of threshold falls below sd_stop.
+    """
+    METHODS = ('psi', 'quest')
+
+    def __init__(self, start_val, min_val, max_val, nTrials, slopes=(0.5,),
+                 guess_rate=0.5, lapse_rate=0.02, grid_step=1.0,
+                 method='psi', prior_sd=None, sd_stop=None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}")
+
+        # Assign arguments to attributes
+        self.start_val = start_val
+        self.min_val = min_val
+        self.max_val = max_val
+        self.nTrials = nTrials
+        self.slopes = list(np.atleast_1d(slopes))
+        self.guess_rate = guess_rate
+        self.lapse_rate = lapse_rate
+        self.grid_step = grid_step
+        self.method = method
+        self.prior_sd = prior_sd
+        self.sd_stop = sd_stop
+
+        # Grids: presentation levels and thresholds share one grid
+        self.grid = np.arange(min_val, max_val + grid_step / 2, grid_step)
+        self.current_level = self.grid[
+            np.abs(self.grid - start_val).argmin()].item()
+        slope = np.asarray(self.slopes)
+
+        # Likelihood of a correct response, (level, threshold, slope),
+        # flattened over (threshold, slope) to match the posterior
+        core = 1 / (1 + np.exp(-slope[None, None, :] *
+                               (self.grid[:, None, None] -
+                                self.grid[None, :, None])))
+        table = guess_rate + (1 - guess_rate - lapse_rate) * core
+        self._p_correct = table.reshape(len(self.grid), -1)
+        self._p_incorrect = 1 - self._p_correct
+
+        # Entropy terms that depend only on the likelihood
+        self._xlogx_table = _xlogx(self._p_correct) + \
+            _xlogx(self._p_incorrect)
+
+        # Posterior over (threshold, slope), flattened
+        prior = np.ones((len(self.grid), len(self.slopes)))
+        if prior_sd is not None:
+            prior *= np.exp(-0.5 * ((self.grid[:, None] - start_val) /
+                                    prior_sd) ** 2)
+        self.posterior = (prior / prior.sum()).ravel()
+
+        self._trial_num = 0
+
+        # Create DataWrangler to hold data points
+        self.dw = DataWrangler()
+
+        # Callables that receive per-trial event dictionaries
+        self._listeners = []
+
+
+    def config(self):
+        """ Return the constructor arguments as a dictionary.
+        """
+        return {
+            'start_val': self.start_val,
+            'min_val': self.min_val,
+            'max_val': self.max_val,
+            'nTrials': self.nTrials,
+            'slopes': [float(s) for s in self.slopes],
+            'guess_rate': self.guess_rate,
+            'lapse_rate': self.lapse_rate,
+            'grid_step': self.grid_step,
+            'method': self.method,
+            'prior_sd': self.prior_sd,
+            'sd_stop': self.sd_stop,
+        }
+
+
+    def _marginal(self, axis):
+        """ Posterior marginal over thresholds (axis=1) or slopes
+            (axis=0).
+        """
+        return self.posterior.reshape(len(self.grid), -1).sum(axis=axis)
+
+
+    def threshold(self):
+        """ Return (mean, sd) of the posterior over threshold.
+        """
+        marginal = self._marginal(1)
+        mean = marginal @ self.grid
+        sd = np.sqrt(max(marginal @ self.grid ** 2 - mean * mean, 0.0))
+        return float(mean), float(sd)
+
+
+    def slope(self):
+        """ Return (mean, sd) of the posterior over slope.
+        """
+        marginal = self._marginal(0)
+        slopes = np.asarray(self.slopes)
+        mean = marginal @ slopes
+        sd = np.sqrt(max(marginal @ slopes ** 2 - mean * mean, 0.0))
+        return float(mean), float(sd)
+
+
+    @property
+    def finished(self):
+        """ True once nTrials trials have been run, or the threshold
+            posterior SD is below sd_stop.
+        """
+        if self._trial_num >= self.nTrials:
+            return True
+        return self.sd_stop is not None and \
+            self.threshold()[1] < self.sd_stop
+
+
+    def _next_level(self):
+        """ Choose the next presentation level from the posterior.
+        """
+        if self.method == 'quest':
+            mean = self.threshold()[0]
+            return self.grid[np.abs(self.grid - mean).argmin()].item()
+
+        # Expected posterior entropy for each level, up to a
+        # constant: -E[sum p log p] over both outcomes reduces to
+        # the cached xlogx table and the outcome probabilities
+        p_correct = self._p_correct @ self.posterior
+        expected = -(self._xlogx_table @ self.posterior) + \
+            _xlogx(p_correct) + _xlogx(1 - p_correct)
+        return self.grid[expected.argmin()].item()
+
+
+    def _update_posterior(self, response):
+        """ Multiply the posterior by the likelihood of a response
+            at the current level.
+        """
+        row = int(round((self.current_level - self.min_val) /
+                        self.grid_step))
+        table = self._p_correct if response == 1 else self._p_incorrect
+        posterior = self.posterior * table[row]
+        self.posterior = posterior / posterior.sum()
+
+
+    def add_data_point(self, response):
+        """ Log a new trial at the current level.
+        """
+        dp = self.dw.new_data_point()
+        dp.trial_number = self._trial_num
+        dp.level = self.current_level
+        dp.response = response if response in (1, -1) else 0
+        return dp
+
+
+    def _update(self, dp, response):
+        """ Update the posterior and choose the next level. Invalid
+            responses are logged as 0 and do not change the
+            posterior.
+        """
+        if response in (1, -1):
+            self._update_posterior(response)
+            self.current_level = self._next_level()
+        self._trial_num += 1
@@ -0,0 +1,81 @@
+""" Bootstrap confidence intervals for staircase thresholds.
+
+    Both methods draw every resample at once: resample_reversals
+    indexes the reversal levels with one (n_resamples, n_reversals)
+    array, and resimulate runs all resamples as the runs of one
+    BatchStaircase, so neither loops over resamples in Python.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models.batch import BatchStaircase, reversal_thresholds
+from models.observers import LogisticObserver
+
+
+#########
+# BEGIN #
+#########
+def _summary(estimate, samples, ci):
+    """ Percentile interval and standard error of bootstrap samples.
+        Samples that are nan (e.g. runs without reversals) are left
+        out.
+    """
+    samples = samples[~np.isnan(samples)]
+    if not len(samples):
+        return {'threshold': estimate, 'ci': (np.nan, np.nan),
+                'se': np.nan, 'n_resamples': 0}
+    low, high = np.percentile(samples, [50 * (1 - ci), 50 * (1 + ci)])
+    return {
+        'threshold': estimate,
+        'ci': (float(low), float(high)),
+        'se': float(np.std(samples, ddof=1)) if len(samples) > 1 else np.nan,
+        'n_resamples': len(samples),
+    }
+
+
+def resample_reversals(levels, n_resamples=10000, ci=0.95, seed=None):
+    """ Nonparametric bootstrap of the mean of reversal levels.
+
+        Return a dictionary with the observed mean (threshold), the
+        ci-level percentile interval (ci), the bootstrap standard
+        error (se) and n_resamples.
+    """
+    levels = np.asarray(levels, dtype=float)
+    if not len(levels):
+        return _summary(np.nan, np.array([]), ci)
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(levels), (n_resamples, len(levels)))
+    return _summary(float(levels.mean()), levels[rows].mean(axis=1), ci)
+
+
+def resimulate(staircase, observer=None, last=4, n_resamples=10000,
+               ci=0.95, seed=None):
+    """ Parametric bootstrap: re-run the staircase's procedure
+        n_resamples times against an observer and take the mean of
+        the last `last` reversals of each run.
+
+        observer defaults to a logistic observer fitted to the
+        staircase's own trials (see models.psychometric), seeded
+        with seed. The threshold reported is the staircase's
+        observed one.
+    """
+    if observer is None:
+        from models import psychometric
+        fit = psychometric.fit_staircase(staircase)
+        observer = LogisticObserver(fit['threshold'], fit['slope'],
+                                    fit['guess_rate'], fit['lapse_rate'],
+                                    seed=seed)
+
+    batch = BatchStaircase(n=n_resamples, **staircase.config())
+    levels, _, reversals = batch.run(observer)
+    samples = reversal_thresholds(levels, reversals, last)
+    return _summary(float(staircase.threshold(last)[0]), samples, ci)
@@ -0,0 +1,95 @@
+""" Listeners for Staircase events.
+
+    A listener is any callable that accepts an event dictionary.
+    Register one with Staircase.add_listener. Every event has an
+    'event' key: 'trial' (one per trial, with the DataPoint fields,
+    'n_reversals' and 'next_level'), 'finished' or 'ignored'.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import json
+import logging
+import queue
+import threading
+
+
+#########
+# BEGIN #
+#########
+def console_listener(event):
+    """ Print events to the console in the original staircase format.
+    """
+    if event['event'] == 'trial':
+        print(f"\nstaircase: Trial number: {event['trial_number']}")
+        if event['response'] == 1:
+            print("staircase: Correct")
+        elif event['response'] == -1:
+            print("staircase: Incorrect")
+        else:
+            print("staircase: Invalid response!")
+        print(f"staircase: {event}")
+        print(f"staircase: # of reversals: {event['n_reversals']}")
+    elif event['event'] == 'finished':
+        print("staircase: Staircase finished")
+    elif event['event'] == 'ignored':
+        print("staircase: Staircase finished; response ignored")
+
+
+class LoggingListener:
+    """ Forward events to a standard library logger. The event
+        dictionary is passed as the 'event' attribute of the
+        log record.
+    """
+    def __init__(self, logger, level=logging.INFO):
+        self.logger = logger
+        self.level = level
+
+
+    def __call__(self, event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s", event['event'],
+                            extra={'event': event})
+
+
+class AsyncFileListener:
+    """ Write events to a file as JSON lines from a background
+        thread, so the caller only pays for a queue put.
+        Call close() to flush and stop the writer.
+    """
+    def __init__(self, path, mode='a'):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, mode)
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+
+    def __call__(self, event):
+        self._queue.put(event)
+
+
+    def _write(self):
+        """ Drain the queue to the file until a None sentinel.
+        """
+        while True:
+            event = self._queue.get()
+            if event is None:
+                break
+            self._file.write(json.dumps(event) + "\n")
+            if self._queue.empty():
+                self._file.flush()
+        self._file.close()
+
+
+    def close(self):
+        """ Write any queued events and close the file.
+        """
+        self._queue.put(None)
+        self._thread.join()
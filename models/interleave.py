@@ -0,0 +1,125 @@
+""" Interleaved staircases sharing one session.
+
+    InterleavedStaircases keeps every track in a single BatchStaircase
+    (one array element per track), picks which track to present next
+    and routes each response back to that track.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models.batch import BatchStaircase
+
+
+#########
+# BEGIN #
+#########
+class InterleavedStaircases:
+    """ Schedule and update n interleaved staircase tracks.
+
+        Staircase arguments may be scalars or one value per track
+        (see BatchStaircase), e.g. different start values for
+        descending and ascending tracks. labels optionally names the
+        tracks (frequency, ear, ...).
+
+        schedule chooses the next unfinished track:
+            'random'          - uniformly at random
+            'round_robin'     - in turn
+            'least_converged' - fewest reversals so far (ties:
+                                lowest index)
+    """
+    SCHEDULES = ('random', 'round_robin', 'least_converged')
+
+    def __init__(self, n, start_val, step_sizes, nUp, nDown, nTrials,
+                 nReversals, rapid_descend, min_val, max_val, labels=None,
+                 schedule='random', seed=None):
+        if schedule not in self.SCHEDULES:
+            raise ValueError(f"Unknown schedule: {schedule}")
+
+        self.tracks = BatchStaircase(
+            n, start_val, step_sizes, nUp, nDown, nTrials, nReversals,
+            rapid_descend, min_val, max_val)
+        self.labels = list(labels) if labels is not None else list(range(n))
+        self.schedule = schedule
+        self.rng = np.random.default_rng(seed)
+
+        # Running sum and count of reversal levels in each track's
+        # final step-size phase, for an O(1) threshold estimate
+        self._rev_sum = np.zeros(n)
+        self._rev_count = np.zeros(n, dtype=int)
+
+        self._next_robin = 0
+        self.current_track = None
+
+
+    @property
+    def finished(self):
+        """ True once every track has finished.
+        """
+        return bool(self.tracks.finished.all())
+
+
+    def next_track(self):
+        """ Choose the next track and return (track, level), or
+            None if every track has finished.
+        """
+        active = ~self.tracks.finished
+        if not active.any():
+            self.current_track = None
+            return None
+
+        if self.schedule == 'random':
+            track = self.rng.choice(np.flatnonzero(active))
+        elif self.schedule == 'round_robin':
+            order = np.roll(np.arange(self.tracks.n), -self._next_robin)
+            track = order[active[order]][0]
+            self._next_robin = (track + 1) % self.tracks.n
+        else:
+            progress = np.where(active, self.tracks.n_reversals, np.inf)
+            track = np.argmin(progress)
+
+        self.current_track = int(track)
+        return self.current_track, self.tracks.current_level[track].item()
+
+
+    def add_response(self, response):
+        """ Route a response (1 or -1) to the current track. Return
+            True if it produced a reversal.
+        """
+        if self.current_track is None:
+            raise RuntimeError("No track selected; call next_track() first")
+
+        track = self.current_track
+        level = self.tracks.current_level[track]
+        phase = self.tracks._step_index[track]
+        reversed_ = self.tracks.add_response(response, runs=track)[track]
+        if reversed_ and phase == self.tracks.n_phases - 1:
+            self._rev_sum[track] += level
+            self._rev_count[track] += 1
+
+        self.current_track = None
+        return bool(reversed_)
+
+
+    def status(self, track):
+        """ Return a dictionary describing one track.
+        """
+        t = self.tracks
+        count = self._rev_count[track]
+        return {
+            'label': self.labels[track],
+            'level': t.current_level[track].item(),
+            'trials': t.trial_counts[track].item(),
+            'reversals': t.n_reversals[track].item(),
+            'step_index': t._step_index[track].item(),
+            'threshold': self._rev_sum[track] / count if count else np.nan,
+            'finished': t.finished_at(track),
+        }
@@ -0,0 +1,173 @@
+""" Opt-in runtime metrics for staircases.
+
+    Metrics collects counters and timers and exports them as a
+    snapshot dictionary or as Prometheus text exposition format.
+    instrument wraps chosen methods of one object with timers by
+    setting instance attributes that shadow the class methods, and
+    uninstrument deletes them again, so objects that are not
+    instrumented run exactly the same code as before.
+
+    See Staircase.enable_metrics and DataWrangler.enable_metrics for
+    what is measured.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import bisect
+import time
+
+
+#########
+# BEGIN #
+#########
+class _Timer:
+    """ Count, total, maximum and histogram of one timer.
+    """
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self, n_buckets):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * n_buckets
+
+
+class Metrics:
+    """ Named counters and timers. Timers keep a count, total,
+        maximum and a histogram over BUCKETS (upper bounds, in
+        seconds). One Metrics can be shared by many objects.
+    """
+    BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+
+
+    def count(self, name, n=1):
+        """ Add n to a counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+
+    def _timer(self, name):
+        """ Return the named timer, creating it if needed.
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _Timer(len(self.BUCKETS) + 1)
+        return timer
+
+
+    def observe(self, name, seconds):
+        """ Record one timing.
+        """
+        timer = self._timer(name)
+        timer.count += 1
+        timer.total += seconds
+        if seconds > timer.max:
+            timer.max = seconds
+        timer.buckets[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+
+    def timed(self, name, func, counter=None):
+        """ Return func wrapped with a timer. If counter is given, it
+            is incremented whenever func returns a true value.
+        """
+        perf_counter = time.perf_counter
+        bisect_left = bisect.bisect_left
+        bounds = self.BUCKETS
+        timer = self._timer(name)
+        counters = self.counters
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - start
+                timer.count += 1
+                timer.total += seconds
+                if seconds > timer.max:
+                    timer.max = seconds
+                timer.buckets[bisect_left(bounds, seconds)] += 1
+            if counter is not None and result:
+                counters[counter] = counters.get(counter, 0) + 1
+            return result
+        wrapper.__wrapped__ = func
+        return wrapper
+
+
+    def reset(self):
+        """ Zero every counter and timer. Timed methods keep
+            recording into the same timers.
+        """
+        self.counters.clear()
+        for timer in self.timers.values():
+            timer.__init__(len(self.BUCKETS) + 1)
+
+
+    def snapshot(self):
+        """ Return a dictionary of counters and timers. Each timer
+            has count, total, mean and max (seconds) and buckets
+            (upper bound: number of timings, not cumulative; the
+            last bound is inf).
+        """
+        bounds = self.BUCKETS + (float('inf'),)
+        return {
+            'counters': dict(self.counters),
+            'timers': {
+                name: {
+                    'count': timer.count,
+                    'total': timer.total,
+                    'mean': timer.total / timer.count if timer.count
+                            else float('nan'),
+                    'max': timer.max,
+                    'buckets': dict(zip(bounds, timer.buckets)),
+                }
+                for name, timer in self.timers.items()
+            },
+        }
+
+
+    def to_prometheus(self, prefix='staircase'):
+        """ Return the metrics in Prometheus text exposition format:
+            counters as <prefix>_<name>_total, timers as histograms
+            named <prefix>_<name>_seconds.
+        """
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, timer in sorted(self.timers.items()):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(self.BUCKETS + ('+Inf',), timer.buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum {timer.total!r}")
+            lines.append(f"{metric}_count {timer.count}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument(obj, metrics, methods):
+    """ Time methods of one object. methods lists (attribute, timer
+        name, counter name or None) tuples, as for Metrics.timed.
+    """
+    for attr, name, counter in methods:
+        setattr(obj, attr, metrics.timed(name, getattr(obj, attr), counter))
+
+
+def uninstrument(obj, methods):
+    """ Remove the timers set by instrument.
+    """
+    for attr, _, _ in methods:
+        obj.__dict__.pop(attr, None)
@@ -0,0 +1,483 @@
+""" Simulated observers for driving staircases.
+
+    An observer is called with an array of presentation levels and
+    returns an array of responses (1 = correct, -1 = incorrect), so
+    it can drive Staircase.run (one level) or BatchStaircase.run
+    (one level per run) directly. Each call is one trial: observers
+    whose behaviour changes over a session (FatigueObserver,
+    AttentionLapseObserver) advance one trial per call, for every
+    level in the call at once. sequence generates responses to a
+    whole series of consecutive trials in one call.
+
+    Random numbers come from a seeded numpy Generator and are drawn
+    in blocks, so one-level calls do not pay for a generator call
+    each.
+
+    Psychometric functions:
+        LogisticObserver    - logistic in level
+        GumbelObserver      - Weibull in linear amplitude, i.e. a
+                              Gumbel function of level in dB
+        TwoIntervalObserver - two-interval forced choice (as in
+                              controller.py) simulated by signal
+                              detection, with optional interval bias
+
+    Wrappers that change another observer's behaviour:
+        FatigueObserver        - threshold drifts over trials
+        AttentionLapseObserver - bouts of inattention during which
+                                 responses are guesses
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+from scipy import special
+
+
+#########
+# BEGIN #
+#########
+class Observer:
+    """ Base class for observers. Subclasses define p_correct
+        (and level_at, where the function can be inverted).
+
+        guess_rate is the probability of a correct response when
+        the stimulus is not detected (0.5 for a two-interval task);
+        lapse_rate is the probability of an error at any level.
+        seed may be an integer, None or a numpy Generator.
+    """
+    # Uniform random numbers drawn from the generator at a time
+    BLOCK_SIZE = 4096
+
+    def __init__(self, guess_rate=0.5, lapse_rate=0.0, seed=None):
+        self.guess_rate = guess_rate
+        self.lapse_rate = lapse_rate
+        self.rng = np.random.default_rng(seed)
+        self._block = np.empty(0)
+        self._used = 0
+
+
+    def _scale(self, core):
+        """ Map a detection probability to p(correct), allowing
+            for guesses and lapses.
+        """
+        return self.guess_rate + (1 - self.guess_rate - self.lapse_rate) * core
+
+
+    def _unscale(self, p):
+        """ Invert _scale. Return nan if p is out of range.
+        """
+        core = (p - self.guess_rate) / (1 - self.guess_rate - self.lapse_rate)
+        return core if 0 < core < 1 else np.nan
+
+
+    def _uniform(self, shape):
+        """ Return uniform random numbers of the given shape, taken
+            from the current block of the generator's output.
+        """
+        n = int(np.prod(shape))
+        if n > self.BLOCK_SIZE:
+            if self._used < len(self._block):
+                head = self._block[self._used:]
+                self._used = len(self._block)
+                tail = self.rng.random(n - len(head))
+                return np.concatenate([head, tail]).reshape(shape)
+            return self.rng.random(shape)
+        if self._used + n > len(self._block):
+            rest = self._block[self._used:]
+            self._block = np.concatenate(
+                [rest, self.rng.random(self.BLOCK_SIZE)])
+            self._used = 0
+        values = self._block[self._used:self._used + n]
+        self._used += n
+        return values.reshape(shape)
+
+
+    def _respond(self, p):
+        """ Draw a response for each probability of a correct
+            response.
+        """
+        if np.ndim(p) == 0:
+            # One trial: skip the array machinery
+            if self._used == len(self._block):
+                self._block = self.rng.random(self.BLOCK_SIZE)
+                self._used = 0
+            self._used += 1
+            return 1 if self._block[self._used - 1] < p else -1
+        p = np.asarray(p)
+        responses = np.where(self._uniform(p.shape) < p, 1, -1)
+        return responses.item() if responses.ndim == 0 else responses
+
+
+    def p_correct(self, levels):
+        """ Return the probability of a correct response at each level.
+        """
+        raise NotImplementedError
+
+
+    def level_at(self, p):
+        """ Return the level at which p_correct equals p, or nan if
+            p is out of the function's range.
+        """
+        raise NotImplementedError
+
+
+    def __call__(self, levels):
+        """ Return a response for each level.
+        """
+        return self._respond(self.p_correct(levels))
+
+
+    def sequence(self, levels):
+        """ Return responses to levels presented on consecutive
+            trials, drawn in one vectorized call. For observers that
+            do not change over trials this is the same as calling
+            the observer with all the levels.
+        """
+        return np.asarray(self(np.asarray(levels, dtype=float)))
+
+
+class LogisticObserver(Observer):
+    """ Observer whose probability of a correct response follows a
+        logistic psychometric function of level:
+
+            p = guess_rate + (1 - guess_rate - lapse_rate) /
+                (1 + exp(-slope * (level - threshold)))
+
+        guess_rate is 0.5 for a two-interval task.
+    """
+    def __init__(self, threshold, slope, guess_rate=0.5, lapse_rate=0.0,
+                 seed=None):
+        super().__init__(guess_rate, lapse_rate, seed)
+        self.threshold = threshold
+        self.slope = slope
+
+
+    def p_correct(self, levels):
+        """ Return the probability of a correct response at each level.
+        """
+        core = 1 / (1 + np.exp(-self.slope * (np.asarray(levels) - self.threshold)))
+        return self._scale(core)
+
+
+    def level_at(self, p):
+        """ Return the level at which p_correct equals p, or nan if
+            p is out of the function's range.
+        """
+        core = self._unscale(p)
+        return self.threshold - np.log(1 / core - 1) / self.slope
+
+
+class GumbelObserver(Observer):
+    """ Observer whose probability of detection follows a Weibull
+        function of stimulus amplitude. With levels in dB this is a
+        Gumbel function of level, psychometric.py's 'gumbel':
+
+            p = guess_rate + (1 - guess_rate - lapse_rate) *
+                (1 - exp(-10 ** (slope * (level - threshold) / 20)))
+
+        slope is the Weibull shape parameter (beta). Detection
+        probability at threshold is 1 - 1/e.
+    """
+    def __init__(self, threshold, slope, guess_rate=0.5, lapse_rate=0.0,
+                 seed=None):
+        super().__init__(guess_rate, lapse_rate, seed)
+        self.threshold = threshold
+        self.slope = slope
+
+
+    def p_correct(self, levels):
+        """ Return the probability of a correct response at each level.
+        """
+        exponent = self.slope * (np.asarray(levels) - self.threshold) / 20
+        core = -np.expm1(-10.0 ** np.minimum(exponent, 300))
+        return self._scale(core)
+
+
+    def level_at(self, p):
+        """ Return the level at which p_correct equals p, or nan if
+            p is out of the function's range.
+        """
+        core = self._unscale(p)
+        return self.threshold + 20 * np.log10(-np.log1p(-core)) / self.slope
+
+
+class TwoIntervalObserver(Observer):
+    """ Two-interval forced-choice observer, as in controller.py's
+        task: the stimulus is in interval 1 or 2 at random, and the
+        observer picks the interval with the larger internal
+        response. Internal responses are unit-variance normal, with
+        a mean of d' in the stimulus interval, where
+
+            d' = 10 ** (slope * (level - threshold) / 20)
+
+        so d' = 1 at threshold. bias is added to the internal
+        response in interval 1 (positive bias favours interval 1).
+        On a lapse the observer picks an interval at random.
+    """
+    def __init__(self, threshold, slope=1.0, bias=0.0, lapse_rate=0.0,
+                 seed=None):
+        super().__init__(0.5, lapse_rate, seed)
+        self.threshold = threshold
+        self.slope = slope
+        self.bias = bias
+
+
+    def d_prime(self, levels):
+        """ Return the sensitivity at each level.
+        """
+        exponent = self.slope * (np.asarray(levels) - self.threshold) / 20
+        return 10.0 ** np.minimum(exponent, 300)
+
+
+    def p_correct(self, levels):
+        """ Return the probability of a correct response at each
+            level, averaged over stimulus intervals.
+        """
+        d = self.d_prime(levels)
+        core = (special.ndtr((d + self.bias) / np.sqrt(2)) +
+                special.ndtr((d - self.bias) / np.sqrt(2))) / 2
+        # A lapse is a guess, which is correct half the time
+        return self.lapse_rate / 2 + (1 - self.lapse_rate) * core
+
+
+    def level_at(self, p):
+        """ Return the level at which p_correct equals p, or nan if
+            p is out of the function's range (without bias).
+        """
+        core = (p - self.lapse_rate / 2) / (1 - self.lapse_rate)
+        if self.bias or not 0.5 < core < 1:
+            return np.nan
+        d = np.sqrt(2) * special.ndtri(core)
+        return self.threshold + 20 * np.log10(d) / self.slope
+
+
+    def intervals(self, levels):
+        """ Simulate the trials at each level. Return (stimulus
+            interval, chosen interval), each 1 or 2.
+        """
+        d = self.d_prime(levels)
+        draws = self._uniform((4,) + np.shape(levels))
+        stimulus = np.where(draws[0] < 0.5, 1, 2)
+        first = special.ndtri(draws[1]) + np.where(stimulus == 1, d, 0.0) + \
+            self.bias
+        second = special.ndtri(draws[2]) + np.where(stimulus == 2, d, 0.0)
+        chosen = np.where(first >= second, 1, 2)
+        # Given a lapse, draws[3] is uniform below lapse_rate
+        lapse = draws[3] < self.lapse_rate
+        guess = np.where(draws[3] < self.lapse_rate / 2, 1, 2)
+        chosen = np.where(lapse, guess, chosen)
+        return stimulus, chosen
+
+
+    def __call__(self, levels):
+        """ Return a response for each level.
+        """
+        stimulus, chosen = self.intervals(levels)
+        responses = np.where(stimulus == chosen, 1, -1)
+        return responses.item() if responses.ndim == 0 else responses
+
+
+class _Wrapper(Observer):
+    """ Base class for observers that change another observer's
+        behaviour. The wrapped observer's generator, guess_rate and
+        lapse_rate are used, so wrappers can wrap each other.
+    """
+    def __init__(self, observer):
+        self.observer = observer
+
+
+    @property
+    def rng(self):
+        return self.observer.rng
+
+
+    @property
+    def guess_rate(self):
+        return self.observer.guess_rate
+
+
+    @property
+    def lapse_rate(self):
+        return self.observer.lapse_rate
+
+
+    def _uniform(self, shape):
+        return self.observer._uniform(shape)
+
+
+    def _respond(self, p):
+        return self.observer._respond(p)
+
+
+class FatigueObserver(_Wrapper):
+    """ Wrap an observer so that its threshold drifts by drift
+        (level units) per trial, starting from the wrapped
+        observer's threshold on trial 0. Random numbers come from
+        the wrapped observer's generator.
+    """
+    def __init__(self, observer, drift):
+        super().__init__(observer)
+        self.drift = drift
+        self.trial = 0
+
+
+    def reset(self):
+        """ Start again from trial 0.
+        """
+        self.trial = 0
+
+
+    def p_correct(self, levels, trials=None):
+        """ Return the probability of a correct response at each
+            level on the given trials (default: the current trial).
+        """
+        if trials is None:
+            trials = self.trial
+        return self.observer.p_correct(
+            np.asarray(levels) - self.drift * np.asarray(trials))
+
+
+    def level_at(self, p, trial=None):
+        """ Return the level at which p_correct equals p on a trial
+            (default: the current trial).
+        """
+        if trial is None:
+            trial = self.trial
+        return self.observer.level_at(p) + self.drift * trial
+
+
+    def __call__(self, levels):
+        """ Return a response for each level, and move on one trial.
+        """
+        responses = self._respond(self.p_correct(levels))
+        self.trial += 1
+        return responses
+
+
+    def sequence(self, levels):
+        """ Return responses to levels presented on consecutive
+            trials, drawn in one vectorized call.
+        """
+        levels = np.asarray(levels, dtype=float)
+        trials = self.trial + np.arange(len(levels))
+        responses = self._respond(self.p_correct(levels, trials))
+        self.trial += len(levels)
+        return np.asarray(responses)
+
+
+class AttentionLapseObserver(_Wrapper):
+    """ Wrap an observer so that it has bouts of inattention, during
+        which it responds correctly with the wrapped observer's
+        guess_rate whatever the level.
+
+        An attentive observer starts a bout with probability
+        p_lapse per trial, and bouts last mean_duration trials on
+        average (geometric durations). A new bout can start as soon
+        as one ends, so mean_duration=1 gives independent
+        single-trial lapses. Each level in a call (e.g. each
+        BatchStaircase run) has its own attention state. Random
+        numbers come from the wrapped observer's generator.
+    """
+    def __init__(self, observer, p_lapse, mean_duration=1.0):
+        if mean_duration < 1:
+            raise ValueError("mean_duration must be at least 1")
+        super().__init__(observer)
+        self.p_lapse = p_lapse
+        self.mean_duration = mean_duration
+        self.lapsed = None
+
+
+    def reset(self):
+        """ Make every run attentive again.
+        """
+        self.lapsed = None
+
+
+    def _inattentive(self):
+        """ Long-run fraction of trials spent inattentive.
+        """
+        p_end = 1 / self.mean_duration
+        return self.p_lapse / (self.p_lapse + p_end * (1 - self.p_lapse))
+
+
+    def p_correct(self, levels):
+        """ Return the long-run probability of a correct response at
+            each level, averaged over attention states.
+        """
+        inattentive = self._inattentive()
+        return inattentive * self.guess_rate + \
+            (1 - inattentive) * self.observer.p_correct(levels)
+
+
+    def level_at(self, p):
+        """ Return the level at which the long-run p_correct equals
+            p, or nan if p is out of its range.
+        """
+        inattentive = self._inattentive()
+        return self.observer.level_at(
+            (p - inattentive * self.guess_rate) / (1 - inattentive))
+
+
+    def _step(self, lapsed, draws):
+        """ Advance attention states by one trial.
+        """
+        # A bout that ends can be followed at once by a new one
+        p_end = 1 / self.mean_duration
+        return draws < np.where(lapsed, 1 - p_end * (1 - self.p_lapse),
+                                self.p_lapse)
+
+
+    def __call__(self, levels):
+        """ Return a response for each level, and move on one trial.
+        """
+        shape = np.shape(levels)
+        if self.lapsed is None or self.lapsed.shape != shape:
+            self.lapsed = np.zeros(shape, dtype=bool)
+        self.lapsed = self._step(self.lapsed, self._uniform(shape))
+        p = np.where(self.lapsed, self.guess_rate,
+                     self.observer.p_correct(levels))
+        return self._respond(p)
+
+
+    def sequence(self, levels):
+        """ Return responses to levels presented on consecutive
+            trials of one run. Attention bouts are laid out from
+            geometric draws of their start gaps and durations rather
+            than trial by trial.
+        """
+        levels = np.asarray(levels, dtype=float)
+        n = len(levels)
+        p_end = 1 / self.mean_duration
+        change = np.zeros(n + 1, dtype=np.int64)
+
+        # Finish a bout carried over from earlier calls
+        position = 0
+        if self.lapsed is not None and self.lapsed.size and \
+        self.lapsed.flat[0]:
+            position = min(self.rng.geometric(p_end) - 1, n)
+            change[0] += 1
+            change[position] -= 1
+
+        # Each bout starts after an attentive gap; draw bouts in
+        # blocks until the sequence is covered
+        while self.p_lapse > 0 and position < n:
+            size = int((n - position) * self.p_lapse) + 16
+            gaps = self.rng.geometric(self.p_lapse, size) - 1
+            durations = self.rng.geometric(p_end, size)
+            ends = position + np.cumsum(gaps + durations)
+            starts = ends - durations
+            np.add.at(change, np.minimum(starts, n), 1)
+            np.add.at(change, np.minimum(ends, n), -1)
+            position = ends[-1]
+
+        lapsed = np.cumsum(change[:n]) > 0
+        if n:
+            self.lapsed = np.array(lapsed[-1])
+        p = np.where(lapsed, self.guess_rate, self.observer.p_correct(levels))
+        return np.asarray(self._respond(p))
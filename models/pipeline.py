@@ -0,0 +1,153 @@
+""" Asyncio session pipeline decoupling UI, scoring, storage and display.
+
+    Responses submitted from the UI go onto a queue. Separate stages
+    update the staircase, persist trial events (in a worker thread)
+    and display them, connected by asyncio queues. Each downstream
+    stage drains everything that is waiting, so a slow consumer
+    handles a backlog in one pass instead of holding up the UI.
+    pump_tk runs a tkinter window's event processing inside the same
+    asyncio loop.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import asyncio
+import time
+
+
+#########
+# BEGIN #
+#########
+async def _drain(queue):
+    """ Wait for one item, then take everything else waiting.
+    """
+    items = [await queue.get()]
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+async def pump_tk(root, interval=0.005, on_close=None):
+    """ Process tkinter events every interval seconds until the
+        window is destroyed, then call on_close.
+    """
+    import tkinter as tk
+    try:
+        while True:
+            root.update()
+            await asyncio.sleep(interval)
+    except tk.TclError:
+        pass
+    finally:
+        if on_close is not None:
+            on_close()
+
+
+class SessionPipeline:
+    """ Run a Staircase session as queued asyncio stages.
+
+        persist callables receive each trial event in a worker
+        thread (e.g. a SessionWriter). display callables receive
+        each event on the event loop thread, which is also the
+        tkinter thread when pump_tk is used (e.g. LiveTrackPlot,
+        console_listener).
+    """
+    def __init__(self, staircase, persist=None, display=None):
+        self.staircase = staircase
+        self.persist = list(persist or [])
+        self.display = list(display or [])
+
+        self._responses = asyncio.Queue()
+        self._to_persist = asyncio.Queue()
+        self._to_display = asyncio.Queue()
+        staircase.add_listener(self._fan_out)
+
+
+    def _fan_out(self, event):
+        """ Staircase listener: pass events to downstream stages.
+        """
+        self._to_persist.put_nowait(event)
+        self._to_display.put_nowait(event)
+
+
+    def submit(self, response, onset_time=None):
+        """ Queue a response, timestamped on arrival. onset_time
+            is the time.perf_counter() time of stimulus onset. Safe
+            to call from tkinter callbacks running under pump_tk.
+        """
+        self._responses.put_nowait(
+            (response, onset_time, time.perf_counter()))
+
+
+    def stop(self):
+        """ End the session once queued responses are handled.
+        """
+        self._responses.put_nowait(None)
+
+
+    async def _update_stage(self):
+        """ Apply responses to the staircase until it finishes or
+            the pipeline is stopped.
+        """
+        while not self.staircase.finished:
+            item = await self._responses.get()
+            if item is None:
+                break
+            response, onset_time, response_time = item
+            self.staircase.add_response(response, onset_time, response_time)
+
+        # Tell downstream stages there is nothing more to come
+        self._to_persist.put_nowait(None)
+        self._to_display.put_nowait(None)
+
+
+    def _write(self, events):
+        """ Send events to the persist callables.
+        """
+        for event in events:
+            for persist in self.persist:
+                persist(event)
+
+
+    async def _persist_stage(self):
+        """ Hand batches of events to a worker thread.
+        """
+        while True:
+            events = await _drain(self._to_persist)
+            done = events[-1] is None
+            events = [e for e in events if e is not None]
+            if events and self.persist:
+                await asyncio.to_thread(self._write, events)
+            if done:
+                break
+
+
+    async def _display_stage(self):
+        """ Show events on the event loop thread.
+        """
+        while True:
+            events = await _drain(self._to_display)
+            for event in events:
+                if event is None:
+                    return
+                for display in self.display:
+                    display(event)
+            # Let the UI run between batches
+            await asyncio.sleep(0)
+
+
+    async def run(self):
+        """ Run every stage until the session ends.
+        """
+        await asyncio.gather(
+            self._update_stage(),
+            self._persist_stage(),
+            self._display_stage(),
+        )
+        self.staircase.remove_listener(self._fan_out)
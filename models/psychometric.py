@@ -0,0 +1,258 @@
+""" Maximum-likelihood psychometric function fits.
+
+    Trials are binned by unique level into (levels, n, k) counts, so
+    the likelihood costs one vectorized pass over the distinct levels
+    rather than over every trial. The fit optimizes threshold, log
+    slope and (optionally) lapse rate with L-BFGS-B, and confidence
+    intervals come from the inverse of the numerical Hessian of the
+    negative log-likelihood at the optimum. fit_many warm-starts each
+    fit from the previous one, which suits long runs of similar
+    archived sessions.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+from scipy import optimize, special, stats
+
+
+#########
+# BEGIN #
+#########
+FUNCTIONS = ('logistic', 'weibull', 'gumbel')
+MAX_LAPSE = 0.1
+# Bounds on log slope, keeping the optimizer out of overflow
+LOG_SLOPE_BOUNDS = {'logistic': (-8, 4), 'weibull': (np.log(0.1), np.log(100)),
+                    'gumbel': (np.log(0.1), np.log(100))}
+
+
+def _gumbel_power(levels, threshold, slope):
+    """ 10 ** (slope * (level - threshold) / 20), kept finite.
+    """
+    return 10.0 ** np.minimum(slope * (levels - threshold) / 20, 300)
+
+
+def _core(function, levels, threshold, slope):
+    """ Psychometric function without guess and lapse rates.
+    """
+    if function == 'logistic':
+        return special.expit(slope * (levels - threshold))
+    if function == 'gumbel':
+        return -np.expm1(-_gumbel_power(levels, threshold, slope))
+    return 1 - np.exp(-(levels / threshold) ** slope)
+
+
+def psychometric(levels, threshold, slope, guess_rate=0.5, lapse_rate=0.0,
+                 function='logistic'):
+    """ Return p(correct) at each level.
+
+        logistic: core = 1 / (1 + exp(-slope * (level - threshold)))
+        weibull:  core = 1 - exp(-(level / threshold) ** slope)
+        gumbel:   core = 1 - exp(-10 ** (slope * (level - threshold) / 20))
+
+        gumbel is the weibull function of linear amplitude written for
+        levels in dB (amplitude = 10 ** (level / 20)), so slope is the
+        same Weibull shape parameter and levels can be negative.
+
+        p = guess_rate + (1 - guess_rate - lapse_rate) * core
+    """
+    if function not in FUNCTIONS:
+        raise ValueError(f"Unknown function: {function}")
+    core = _core(function, np.asarray(levels, dtype=float), threshold, slope)
+    return guess_rate + (1 - guess_rate - lapse_rate) * core
+
+
+def bin_trials(levels, responses):
+    """ Collapse trials to unique levels. Return (levels, n, k):
+        the distinct levels, trials at each and correct responses at
+        each. Responses other than 1 and -1 are left out.
+    """
+    levels = np.asarray(levels, dtype=float)
+    responses = np.asarray(responses)
+    valid = (responses == 1) | (responses == -1)
+    unique, inverse = np.unique(levels[valid], return_inverse=True)
+    n = np.bincount(inverse, minlength=len(unique))
+    k = np.bincount(inverse, weights=responses[valid] == 1,
+                    minlength=len(unique))
+    return unique, n, k
+
+
+def _unpack(params, fit_lapse, lapse_rate):
+    """ Map optimizer parameters to (threshold, slope, lapse_rate).
+    """
+    threshold, log_slope = params[0], params[1]
+    lapse = params[2] if fit_lapse else lapse_rate
+    return threshold, np.exp(log_slope), lapse
+
+
+def _nll(params, levels, n, k, guess_rate, lapse_rate, fit_lapse, function,
+         grad=False):
+    """ Binomial negative log-likelihood of binned trials, and its
+        gradient with respect to params if grad is True.
+    """
+    threshold, slope, lapse = _unpack(params, fit_lapse, lapse_rate)
+    core = _core(function, levels, threshold, slope)
+    scale = 1 - guess_rate - lapse
+    p = np.clip(guess_rate + scale * core, 1e-10, 1 - 1e-10)
+    nll = -np.sum(k * np.log(p) + (n - k) * np.log1p(-p))
+    if not grad:
+        return nll
+
+    # Chain rule through p, then the core function
+    dp = -(k / p - (n - k) / (1 - p))
+    if function == 'logistic':
+        dcore = core * (1 - core)
+        d_threshold = -slope * dcore
+        d_log_slope = slope * (levels - threshold) * dcore
+    elif function == 'gumbel':
+        u = _gumbel_power(levels, threshold, slope)
+        dcore = np.exp(-u) * u * np.log(10) / 20
+        d_threshold = -slope * dcore
+        d_log_slope = slope * (levels - threshold) * dcore
+    else:
+        u = (levels / threshold) ** slope
+        dcore = np.exp(-u) * u
+        d_threshold = -slope / threshold * dcore
+        d_log_slope = slope * np.log(levels / threshold) * dcore
+    gradient = [np.sum(dp * scale * d_threshold),
+                np.sum(dp * scale * d_log_slope)]
+    if fit_lapse:
+        gradient.append(np.sum(dp * -core))
+    return nll, np.array(gradient)
+
+
+def _hessian(grad, x, eps=1e-5):
+    """ Central-difference Hessian of a function from its gradient.
+    """
+    x = np.asarray(x, dtype=float)
+    h = eps * np.maximum(1, np.abs(x))
+    hess = np.empty((len(x), len(x)))
+    for i in range(len(x)):
+        step = np.zeros(len(x))
+        step[i] = h[i]
+        hess[i] = (grad(x + step) - grad(x - step)) / (2 * h[i])
+    return (hess + hess.T) / 2
+
+
+def _initial_guess(levels, n, k, function):
+    """ Starting (threshold, log slope) from the binned data.
+    """
+    weights = n / n.sum()
+    threshold = np.sum(weights * levels)
+    spread = np.sqrt(np.sum(weights * (levels - threshold) ** 2))
+    if function == 'weibull':
+        return [threshold, np.log(3.5)]
+    if function == 'gumbel':
+        return [threshold, np.log(20 / np.log(10) / (spread or 1))]
+    return [threshold, -np.log(spread or 1)]
+
+
+def fit(levels, responses, function='logistic', guess_rate=0.5,
+        lapse_rate=0.0, fit_lapse=False, x0=None, ci=0.95):
+    """ Fit a psychometric function to trials by maximum likelihood.
+
+        guess_rate is fixed (0.5 for a two-interval task). lapse_rate
+        is fixed unless fit_lapse is True, in which case it is fitted
+        within [0, MAX_LAPSE]. x0 is an earlier result to start from.
+        Weibull fits need positive levels.
+
+        Return a dictionary with threshold, slope, lapse_rate, their
+        ci-level Wald confidence intervals (threshold_ci, slope_ci),
+        nll, n_trials and converged.
+    """
+    if function not in FUNCTIONS:
+        raise ValueError(f"Unknown function: {function}")
+    levels, n, k = bin_trials(levels, responses)
+    if len(levels) < 2:
+        raise ValueError("Need trials at two or more levels to fit")
+    if function == 'weibull' and levels.min() <= 0:
+        raise ValueError("Weibull fits need positive levels")
+
+    low, high = levels.min(), levels.max()
+    if function == 'weibull':
+        low = low / 10
+    bounds = [(low, high), LOG_SLOPE_BOUNDS[function]]
+    if fit_lapse:
+        bounds.append((0, MAX_LAPSE))
+    args = (levels, n, k, guess_rate, lapse_rate, fit_lapse, function)
+
+    # Start lapse-free (a large starting lapse rate can lead to a
+    # local minimum with a steep slope). A warm start is only used
+    # if it beats the data-driven guess, so one degenerate fit does
+    # not trap the ones after it.
+    starts = [_initial_guess(levels, n, k, function) + [0.0]]
+    if x0 is not None:
+        starts.append([x0['threshold'], np.log(x0['slope']),
+                       x0['lapse_rate']])
+    starts = [np.clip(x[:len(bounds)], *np.array(bounds, dtype=float).T)
+              for x in starts]
+    start = min(starts, key=lambda x: _nll(x, *args))
+
+    result = optimize.minimize(_nll, start, args=args + (True,), jac=True,
+                               method='L-BFGS-B', bounds=bounds)
+    threshold, slope, lapse = _unpack(result.x, fit_lapse, lapse_rate)
+
+    # Wald intervals from the observed information (nan where the
+    # curvature is not positive). A lapse rate fitted onto a bound is
+    # treated as fixed. The slope interval is formed on the log scale
+    # and transformed back.
+    z = stats.norm.ppf(0.5 + ci / 2)
+    log_slope = result.x[1]
+    free = fit_lapse and 0 < lapse < MAX_LAPSE
+    x = result.x if free else result.x[:2]
+    hess_args = (*args[:4], lapse, free, function, True)
+    try:
+        cov = np.linalg.inv(
+            _hessian(lambda x: _nll(x, *hess_args)[1], x))
+        var = np.diag(cov)
+    except np.linalg.LinAlgError:
+        var = np.full(len(x), np.nan)
+    se = np.sqrt(np.where(var > 0, var, np.nan))
+    return {
+        'function': function,
+        'threshold': float(threshold),
+        'slope': float(slope),
+        'guess_rate': guess_rate,
+        'lapse_rate': float(lapse),
+        'threshold_ci': (float(threshold - z * se[0]),
+                         float(threshold + z * se[0])),
+        'slope_ci': (float(np.exp(min(log_slope - z * se[1], 700))),
+                     float(np.exp(min(log_slope + z * se[1], 700)))),
+        'nll': float(result.fun),
+        'n_trials': int(n.sum()),
+        'converged': bool(result.success),
+    }
+
+
+def fit_staircase(staircase, **kwargs):
+    """ Fit the trial log of a Staircase. Keyword arguments are
+        passed to fit.
+    """
+    dw = staircase.dw
+    return fit(dw.column('level'), dw.column('response'), **kwargs)
+
+
+def fit_many(sessions, warm_start=True, **kwargs):
+    """ Fit a sequence of (levels, responses) pairs and return a
+        list of results. Each fit starts from the previous successful
+        one when warm_start is True. Sessions that cannot be fitted
+        give None.
+    """
+    results = []
+    previous = None
+    for levels, responses in sessions:
+        try:
+            result = fit(levels, responses,
+                         x0=previous if warm_start else None, **kwargs)
+        except ValueError:
+            result = None
+        if result is not None and result['converged']:
+            previous = result
+        results.append(result)
+    return results
@@ -0,0 +1,178 @@
+""" Replay recorded response sequences through the staircase rules.
+
+    replay runs the Staircase update rules in a single tight loop over
+    plain Python numbers, without DataPoints, listeners or per-trial
+    index upkeep, and returns the whole trajectory as arrays.
+    to_staircase turns a replay into a Staircase (bulk-loading its
+    DataWrangler) and verify compares a replay with the levels and
+    reversals stored in a session.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import rules
+from models.staircase import DataWrangler, Staircase
+
+
+#########
+# BEGIN #
+#########
+def replay(config, responses, start=None):
+    """ Apply responses to a fresh staircase with the given
+        configuration (see Staircase.config), or to one continuing
+        from start (a StaircaseSnapshot) if given. As with
+        Staircase.add_response, responses after the staircase has
+        finished are ignored.
+
+        Return (columns, state): columns maps trial_number, level,
+        response, reversal and step_size to arrays with one entry per
+        trial applied, and state holds the Staircase attributes at
+        the end of the replay.
+    """
+    step_sizes = list(config['step_sizes'])
+    transitions = rules.compile_rule(
+        config['nUp'], config['nDown'], config['rapid_descend']).transitions
+    nTrials = config['nTrials']
+    nReversals = config['nReversals']
+    min_val = config['min_val']
+    max_val = config['max_val']
+    last_step = len(step_sizes) - 1
+
+    level = config['start_val']
+    step_index = 0
+    rule_state = 0
+    move = 0
+    pattern = False
+    n_rev = 0
+    phase_starts = [0]
+    first = 0
+    if start is not None:
+        level = start.level
+        step_index = start.step_index
+        rule_state = start.rule_state
+        pattern = start.reversal_pattern
+        n_rev = start.n_reversals
+        phase_starts = list(start.phase_starts)
+        first = start.trial_num
+
+    levels = []
+    scores = []
+    reversals = []
+    steps = []
+    if isinstance(responses, np.ndarray):
+        responses = responses.tolist()
+
+    for trial, response in enumerate(responses, first):
+        if trial >= nTrials or (step_index == last_step and
+                                n_rev - phase_starts[-1] >= nReversals):
+            break
+        levels.append(level)
+        steps.append(step_sizes[step_index])
+
+        # Look up the rule transition; an invalid response is never
+        # a reversal
+        if response == 1:
+            rule_state, move, pattern = transitions[rule_state][0]
+            scores.append(1)
+        elif response == -1:
+            rule_state, move, pattern = transitions[rule_state][1]
+            scores.append(-1)
+        else:
+            move = 0
+            pattern = False
+            scores.append(0)
+
+        # Reversal and step-size phase
+        reversals.append(pattern)
+        if pattern:
+            n_rev += 1
+            if n_rev - phase_starts[-1] >= nReversals and \
+            step_index < last_step:
+                step_index += 1
+                phase_starts.append(n_rev)
+
+        # Next level
+        if move:
+            level = level + move * step_sizes[step_index]
+        if level > max_val:
+            level = max_val
+        elif level < min_val:
+            level = min_val
+
+    n = len(levels)
+    columns = {
+        'trial_number': np.arange(first, first + n,
+                                  dtype=DataWrangler.columns['trial_number']),
+        'level': np.array(levels, dtype=DataWrangler.columns['level']),
+        'response': np.array(scores, dtype=DataWrangler.columns['response']),
+        'reversal': np.array(reversals, dtype=DataWrangler.columns['reversal']),
+        'step_size': np.array(steps, dtype=DataWrangler.columns['step_size']),
+    }
+    state = {
+        'current_level': level,
+        '_step_index': step_index,
+        '_trial_num': first + n,
+        '_n_reversals': n_rev,
+        '_rule_state': rule_state,
+        '_reversal_pattern': pattern,
+        '_phase_starts': phase_starts,
+    }
+    return columns, state
+
+
+def to_staircase(config, responses):
+    """ Return a Staircase that has received responses, built from
+        a replay. Testing can continue from it with add_response.
+    """
+    columns, state = replay(config, responses)
+    s = Staircase(**config)
+    s.dw.extend(columns)
+    for name, value in state.items():
+        setattr(s, name, value)
+    return s
+
+
+def verify(config, columns):
+    """ Replay the responses in a session's columns and compare the
+        result with its stored levels and reversals.
+
+        Return a dictionary with match (True if both agree on every
+        trial), n_trials (stored) and n_replayed, and the first
+        trial at which levels and reversals differ (None if they
+        never do).
+    """
+    replayed, _ = replay(config, columns['response'])
+    n = min(len(replayed['level']), len(columns['level']))
+
+    def first_difference(a, b):
+        diff = np.flatnonzero(np.asarray(a[:n]) != np.asarray(b[:n]))
+        return int(diff[0]) if len(diff) else None
+
+    level = first_difference(replayed['level'], columns['level'])
+    reversal = first_difference(replayed['reversal'], columns['reversal'])
+    return {
+        'match': level is None and reversal is None and
+                 len(replayed['level']) == len(columns['level']),
+        'n_trials': len(columns['level']),
+        'n_replayed': len(replayed['level']),
+        'level_mismatch': level,
+        'reversal_mismatch': reversal,
+    }
+
+
+def verify_session(path, fmt=None):
+    """ Verify a session file (see verify).
+    """
+    from models.session import load_session
+    config, columns = load_session(
+        path, fmt, mmap=True, names=('level', 'response', 'reversal'))
+    return verify(config, columns)
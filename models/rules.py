@@ -0,0 +1,182 @@
+""" Transformed up-down rules compiled to transition tables.
+
+    A rule (nUp, nDown, rapid_descend) is turned into a small finite
+    state machine. A state is (direction of the last level change,
+    consecutive correct responses, consecutive incorrect responses,
+    whether a reversal has happened yet). For each state and outcome
+    (correct or incorrect) the table holds the next state, the level
+    move (-1 = one step down, 0 = stay, 1 = one step up) and whether
+    the move is a reversal, so a trial update is one lookup.
+
+    The rule:
+        - nDown consecutive correct responses step down
+        - nUp consecutive incorrect responses step up
+        - a step in the opposite direction to the previous step is
+          a reversal
+        - with rapid_descend, every correct response steps down
+          until the first reversal
+
+    Step sizes are not part of the table: which step size is active
+    depends on the reversal count, which Staircase and BatchStaircase
+    keep alongside the state.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import functools
+
+# Import data science packages
+import numpy as np
+
+
+#########
+# BEGIN #
+#########
+# Outcome index of each response
+OUTCOMES = {1: 0, -1: 1}
+
+
+class TransitionTable:
+    """ Compiled form of one transformed up-down rule.
+
+        states lists the (direction, n_correct, n_incorrect,
+        reversed) tuple of each state; state 0 is the start.
+        transitions[state][outcome] is a (next_state, move,
+        reversal) tuple for scalar use; next_state, move and
+        reversal hold the same as (states, 2) arrays for vectorized
+        use.
+    """
+    def __init__(self, nUp, nDown, rapid_descend):
+        if int(nUp) != nUp or int(nDown) != nDown or nUp < 1 or nDown < 1:
+            raise ValueError("nUp and nDown must be positive integers")
+        self.nUp = int(nUp)
+        self.nDown = int(nDown)
+        self.rapid_descend = bool(rapid_descend)
+
+        # Enumerate the states reachable from the start
+        self.states = [(0, 0, 0, False)]
+        index = {self.states[0]: 0}
+        self.transitions = []
+        for state in self.states:
+            row = []
+            for correct in (True, False):
+                nxt, move, reversal = self._step(state, correct)
+                if nxt not in index:
+                    index[nxt] = len(self.states)
+                    self.states.append(nxt)
+                row.append((index[nxt], move, reversal))
+            self.transitions.append(tuple(row))
+
+        table = np.array(self.transitions, dtype=np.int64)
+        self.next_state = table[:, :, 0]
+        self.move = table[:, :, 1].astype(np.int8)
+        self.reversal = table[:, :, 2].astype(bool)
+
+
+    def _step(self, state, correct):
+        """ Apply one outcome to a state. Return (next state, move,
+            reversal).
+        """
+        direction, n_correct, n_incorrect, reversed_ = state
+        n_down = 1 if self.rapid_descend and not reversed_ else self.nDown
+
+        move = 0
+        if correct:
+            n_correct, n_incorrect = n_correct + 1, 0
+            if n_correct >= n_down:
+                move = -1
+        else:
+            n_correct, n_incorrect = 0, n_incorrect + 1
+            if n_incorrect >= self.nUp:
+                move = 1
+
+        reversal = False
+        if move:
+            reversal = direction != 0 and move != direction
+            direction = move
+            n_correct = n_incorrect = 0
+        return (direction, n_correct, n_incorrect, reversed_ or reversal), \
+            move, reversal
+
+
+    def __len__(self):
+        return len(self.states)
+
+
+    def counts(self, state):
+        """ Return (consecutive correct, consecutive incorrect)
+            responses since the last level change.
+        """
+        return self.states[state][1:3]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rule(nUp, nDown, rapid_descend):
+    """ Return the (cached) TransitionTable for a rule.
+    """
+    return TransitionTable(nUp, nDown, rapid_descend)
+
+
+def compile_rules(n, nUp, nDown, rapid_descend):
+    """ Stack the tables of n runs whose rules may differ.
+
+        nUp, nDown and rapid_descend may be scalars or arrays of
+        length n. Return (next_state, move, reversal, start): the
+        tables of every distinct rule concatenated, with state
+        numbers offset to match, and each run's start state.
+    """
+    params = [np.broadcast_to(np.asarray(p), (n,))
+              for p in (nUp, nDown, rapid_descend)]
+    keys = list(zip(*(p.tolist() for p in params)))
+
+    offsets = {}
+    next_state, move, reversal = [], [], []
+    size = 0
+    for key in dict.fromkeys(keys):
+        table = compile_rule(*key)
+        offsets[key] = size
+        next_state.append(table.next_state + size)
+        move.append(table.move)
+        reversal.append(table.reversal)
+        size += len(table)
+
+    start = np.array([offsets[key] for key in keys], dtype=np.int64)
+    return (np.concatenate(next_state), np.concatenate(move),
+            np.concatenate(reversal), start)
+
+
+def convergence_point(nUp, nDown, tol=1e-10):
+    """ Return the p(correct) at which a rule's expected level
+        change is zero, i.e. the point on the psychometric function
+        the track converges to (0.5 ** (1 / nDown) for 1-up rules).
+    """
+    table = compile_rule(nUp, nDown, False)
+    size = len(table)
+    rows = np.arange(size)
+
+    def drift(p):
+        # Stationary distribution of the rule states for this p
+        chain = np.zeros((size, size))
+        np.add.at(chain, (rows, table.next_state[:, 0]), p)
+        np.add.at(chain, (rows, table.next_state[:, 1]), 1 - p)
+        system = np.vstack([chain.T - np.eye(size), np.ones(size)])
+        target = np.zeros(size + 1)
+        target[-1] = 1
+        stationary = np.linalg.lstsq(system, target, rcond=None)[0]
+        return stationary @ (p * table.move[:, 0] + (1 - p) * table.move[:, 1])
+
+    # Drift falls from +1 (always wrong) to -1 (always right)
+    low, high = 0.0, 1.0
+    while high - low > tol:
+        mid = (low + high) / 2
+        if drift(mid) > 0:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
@@ -0,0 +1,523 @@
+""" Local asyncio service hosting many Staircase sessions.
+
+    SessionServer keeps one Staircase per session ID and accepts
+    requests over TCP, so tablets in several booths can share one
+    backend process. Each request is a JSON object with an 'op' and
+    gets a JSON reply with 'ok' (and 'error' when ok is false). Two
+    framings are accepted on the same port:
+        - one JSON object per line, with one reply line per request
+          (requests can be pipelined)
+        - HTTP/1.1 POST /<op> with a JSON body (keep-alive)
+
+    Operations:
+        create  - start a session from 'config' (Staircase arguments)
+                  under 'session' (default: a new random ID); an ID
+                  with a session file on disk is resumed from it
+        respond - apply 'response' (1 or -1, optional 'onset_time'
+                  and 'response_time') and return the next level
+        status  - current level, trial number, reversals, threshold
+        close   - persist and release a session
+        metrics - runtime metrics, if enabled (also GET /metrics)
+
+    Trial events are buffered in memory and written to one session
+    file per ID (see models.session) in a worker thread, every
+    flush_interval seconds or once batch_size events are waiting.
+    Requests wait for a flush if more than max_pending events are
+    unwritten, and sessions are limited to max_trials trials, which
+    bounds memory per session.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+import uuid
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import session
+from models.metrics import Metrics
+from models.staircase import Staircase
+
+
+#########
+# BEGIN #
+#########
+# Session IDs double as file names
+_SESSION_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+_HTTP_REQUEST = re.compile(rb'[A-Z]+ (\S+) HTTP/1\.[01]\r?\n')
+_EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'binary': ''}
+
+
+class RequestError(Exception):
+    """ A request that cannot be carried out; reported to the client.
+    """
+
+
+def _jsonable(value):
+    """ json.dumps default for numpy values.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(reply):
+    """ Serialize a reply, with nan as null.
+    """
+    for key, value in reply.items():
+        if isinstance(value, float) and value != value:
+            reply[key] = None
+    return json.dumps(reply, default=_jsonable).encode()
+
+
+class SessionServer:
+    """ Host Staircase sessions keyed by session ID and persist them
+        under root in the given session format.
+
+        With a models.metrics.Metrics as metrics, every session's
+        Staircase records into it (see Staircase.enable_metrics),
+        along with the counters requests, request_errors and
+        persist_errors and the timer persist. The metrics op returns a snapshot, and
+        GET /metrics returns Prometheus text.
+    """
+    def __init__(self, root, fmt='jsonl', host='127.0.0.1', port=0,
+                 batch_size=256, flush_interval=0.5, max_pending=4096,
+                 max_trials=10000, max_sessions=None, fsync=False,
+                 metrics=None):
+        self.root = root
+        self.fmt = fmt
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_trials = max_trials
+        self.max_sessions = max_sessions
+        self.fsync = fsync
+        self.metrics = metrics
+
+        # Live sessions: ID -> (Staircase, SessionWriter)
+        self.sessions = {}
+
+        # Unwritten trial events: file path -> (SessionWriter, [events])
+        self._pending = {}
+        self._n_pending = 0
+
+        # Batches of events that could not be written
+        self.persist_errors = 0
+
+        self._server = None
+        self._flush_task = None
+        self._flush_lock = None
+        self._flush_requested = None
+
+
+    def path(self, session_id):
+        """ Return the session file path for an ID.
+        """
+        return os.path.join(self.root, session_id + _EXTENSIONS[self.fmt])
+
+
+    async def start(self):
+        """ Start listening. Return the (host, port) bound, which
+            gives the actual port when port=0.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port)
+        return self._server.sockets[0].getsockname()[:2]
+
+
+    async def serve_forever(self):
+        """ Start (if needed) and serve until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+
+    async def stop(self):
+        """ Stop accepting requests, write everything pending and
+            close every session file.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+            await self.flush()
+            sessions, self.sessions = self.sessions, {}
+            await asyncio.to_thread(
+                lambda: [writer.close() for _, writer in sessions.values()])
+
+
+    ###############
+    # Persistence #
+    ###############
+    def _listener(self, writer):
+        """ Staircase listener that queues trial events for writer.
+        """
+        def queue_event(event):
+            if event['event'] == 'trial':
+                self._pending.setdefault(writer.path, (writer, []))[1].append(
+                    event)
+                self._n_pending += 1
+                if self._n_pending >= self.batch_size:
+                    self._flush_requested.set()
+        return queue_event
+
+
+    @staticmethod
+    def _write(pending):
+        """ Write batches of events to their session files (runs in
+            a worker thread). A file that fails does not stop the
+            others; return the number of batches that failed.
+        """
+        failed = 0
+        for writer, events in pending:
+            try:
+                for event in events:
+                    writer(event)
+                writer.flush()
+            except (OSError, ValueError):
+                failed += 1
+        return failed
+
+
+    async def flush(self):
+        """ Write every pending event.
+        """
+        async with self._flush_lock:
+            if not self._n_pending:
+                return
+            pending = list(self._pending.values())
+            self._pending = {}
+            self._n_pending = 0
+            start = time.perf_counter()
+            failed = await asyncio.to_thread(self._write, pending)
+            if failed:
+                self._count_persist_errors(failed)
+            if self.metrics is not None:
+                self.metrics.observe('persist', time.perf_counter() - start)
+
+
+    def _count_persist_errors(self, n):
+        """ Count batches (or flushes) that could not be written.
+        """
+        self.persist_errors += n
+        if self.metrics is not None:
+            self.metrics.count('persist_errors', n)
+
+
+    async def _flush_loop(self):
+        """ Flush every flush_interval seconds, or sooner once
+            batch_size events are waiting.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(),
+                                       self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            # Let a flush in progress finish if the loop is cancelled.
+            # A failed flush must not stop later ones.
+            try:
+                await asyncio.shield(self.flush())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._count_persist_errors(1)
+
+
+    ##############
+    # Operations #
+    ##############
+    def _session(self, request):
+        """ Return the live (Staircase, SessionWriter) of a request.
+        """
+        session_id = request.get('session')
+        if session_id not in self.sessions:
+            raise RequestError(f"Unknown session: {session_id}")
+        return self.sessions[session_id]
+
+
+    @staticmethod
+    def _status(session_id, s):
+        """ Summarize a session's state for a reply.
+        """
+        mean, sd = s.threshold()
+        return {
+            'session': session_id,
+            'level': s.current_level,
+            'trial_number': s._trial_num,
+            'n_reversals': s._n_reversals,
+            'finished': s.finished,
+            'threshold': mean,
+            'threshold_sd': sd,
+        }
+
+
+    async def _create(self, request):
+        session_id = request.get('session') or uuid.uuid4().hex
+        if not isinstance(session_id, str) or \
+        not _SESSION_ID.fullmatch(session_id):
+            raise RequestError(f"Invalid session ID: {session_id!r}")
+        if session_id in self.sessions:
+            raise RequestError(f"Session already open: {session_id}")
+        if self.max_sessions is not None and \
+        len(self.sessions) >= self.max_sessions:
+            raise RequestError("Too many open sessions")
+
+        path = self.path(session_id)
+        resumed = os.path.exists(path)
+        if resumed:
+            try:
+                s = await asyncio.to_thread(
+                    session.resume_staircase, path, self.fmt)
+            except (OSError, ValueError, KeyError) as e:
+                raise RequestError(f"Cannot resume {session_id}: {e}")
+        else:
+            config = request.get('config')
+            if not isinstance(config, dict):
+                raise RequestError("create needs a config object")
+            if not config.get('step_sizes'):
+                raise RequestError("Invalid config: step_sizes is empty")
+            try:
+                s = Staircase(**config)
+            except (TypeError, ValueError) as e:
+                raise RequestError(f"Invalid config: {e}")
+        if s.nTrials > self.max_trials:
+            raise RequestError(f"nTrials is limited to {self.max_trials}")
+
+        writer = await asyncio.to_thread(
+            session.SessionWriter, s, path, self.fmt, sys.maxsize,
+            self.fsync, False)
+        if self.metrics is not None:
+            s.enable_metrics(self.metrics)
+        s.add_listener(self._listener(writer))
+        self.sessions[session_id] = (s, writer)
+        reply = self._status(session_id, s)
+        reply['resumed'] = resumed
+        return reply
+
+
+    async def _respond(self, request):
+        s, _ = self._session(request)
+        response = request.get('response')
+        if response not in (1, -1):
+            raise RequestError(f"Invalid response: {response!r}")
+        if self._n_pending >= self.max_pending:
+            await self.flush()
+        ignored = s.finished
+        s.add_response(response, request.get('onset_time'),
+                       request.get('response_time'))
+        reply = self._status(request['session'], s)
+        reply['ignored'] = ignored
+        if not ignored:
+            reply['reversal'] = bool(s.dw.last_data_point().reversal)
+        return reply
+
+
+    async def _status_op(self, request):
+        s, _ = self._session(request)
+        return self._status(request['session'], s)
+
+
+    async def _close(self, request):
+        s, writer = self._session(request)
+        # Release the ID before awaiting, so no request can queue
+        # events for the writer being closed
+        del self.sessions[request['session']]
+        await self.flush()
+        await asyncio.to_thread(writer.close)
+        return self._status(request['session'], s)
+
+
+    async def _metrics_op(self, request):
+        if self.metrics is None:
+            raise RequestError("Metrics are not enabled")
+        return {'metrics': self.metrics.snapshot()}
+
+
+    async def handle(self, request):
+        """ Carry out one request dictionary and return the reply
+            dictionary.
+        """
+        handlers = {
+            'create': self._create,
+            'respond': self._respond,
+            'status': self._status_op,
+            'close': self._close,
+            'metrics': self._metrics_op,
+        }
+        if self.metrics is not None:
+            self.metrics.count('requests')
+        try:
+            if not isinstance(request, dict) or \
+            request.get('op') not in handlers:
+                op = request.get('op') if isinstance(request, dict) else None
+                raise RequestError(f"Unknown op: {op!r}")
+            reply = await handlers[request['op']](request)
+        except Exception as e:
+            # Report unexpected failures too, rather than dropping
+            # the connection
+            if self.metrics is not None:
+                self.metrics.count('request_errors')
+            if isinstance(e, RequestError):
+                return {'ok': False, 'error': str(e)}
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        reply['ok'] = True
+        return reply
+
+
+    ###########
+    # Framing #
+    ###########
+    async def _reply(self, body):
+        """ Decode a JSON request body and return the encoded reply.
+        """
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            return _encode({'ok': False, 'error': f"Invalid JSON: {e}"})
+        return _encode(await self.handle(request))
+
+
+    async def _handle_http(self, request_line, reader, writer):
+        """ Answer one HTTP request. Return False if the client
+            asked to close the connection.
+        """
+        target = _HTTP_REQUEST.match(request_line).group(1).decode()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        if request_line.startswith(b'GET /metrics') and \
+        self.metrics is not None:
+            data = self.metrics.to_prometheus().encode()
+            writer.write("HTTP/1.1 200 OK\r\n"
+                         "Content-Type: text/plain; version=0.0.4\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode() +
+                         data)
+            return headers.get('connection', '').lower() != 'close'
+
+        try:
+            request = json.loads(body) if body.strip() else {}
+        except ValueError as e:
+            reply = {'ok': False, 'error': f"Invalid JSON: {e}"}
+        else:
+            if isinstance(request, dict):
+                request.setdefault('op', target.strip('/'))
+            reply = await self.handle(request)
+        data = _encode(reply)
+        status = '200 OK' if reply['ok'] else '400 Bad Request'
+        writer.write(f"HTTP/1.1 {status}\r\n"
+                     "Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        return headers.get('connection', '').lower() != 'close'
+
+
+    async def _handle_connection(self, reader, writer):
+        """ Answer requests on one connection until it closes.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if _HTTP_REQUEST.match(line):
+                    keep_alive = await self._handle_http(line, reader, writer)
+                    await writer.drain()
+                    if not keep_alive:
+                        break
+                elif line.strip():
+                    writer.write(await self._reply(line) + b'\n')
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class SessionClient:
+    """ Minimal asyncio client for the line-delimited JSON protocol.
+        Calls send one request and wait for its reply.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+
+    async def request(self, op, **fields):
+        """ Send one request and return the reply dictionary.
+        """
+        self._writer.write(json.dumps({'op': op, **fields}).encode() + b'\n')
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def main(argv=None):
+    """ Serve sessions from the command line until interrupted.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('root', help="Directory for session files")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--format', default='jsonl',
+                        choices=sorted(_EXTENSIONS))
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--fsync', action='store_true')
+    parser.add_argument('--metrics', action='store_true',
+                        help="Collect runtime metrics (GET /metrics)")
+    args = parser.parse_args(argv)
+
+    server = SessionServer(args.root, args.format, args.host, args.port,
+                           batch_size=args.batch_size, fsync=args.fsync,
+                           metrics=Metrics() if args.metrics else None)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
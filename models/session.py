@@ -0,0 +1,351 @@
+""" Streaming, append-only storage of Staircase sessions.
+
+    SessionWriter listens to a Staircase and appends each trial to
+    disk as it happens, so a crash loses at most one unwritten batch.
+    Three formats are supported:
+        'csv'    - header comment with the configuration, then one
+                   row per trial
+        'jsonl'  - configuration line, then one JSON object per trial
+        'binary' - a directory with config.json and one raw typed
+                   file per DataWrangler column
+
+    load_session reads a file back into columns, ignoring a partially
+    written final record. resume_staircase rebuilds a Staircase from
+    a session file so that testing can continue where it stopped.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import csv
+import json
+import os
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models.staircase import DataWrangler
+
+
+#########
+# BEGIN #
+#########
+def _infer_format(path):
+    """ Guess the session format from the path.
+    """
+    if str(path).endswith('.csv'):
+        return 'csv'
+    if str(path).endswith('.jsonl'):
+        return 'jsonl'
+    return 'binary'
+
+
+def _truncate_partial_line(path):
+    """ Cut a text session back to its last complete line, so
+        that rows appended after a crash do not join a partial row.
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - 4096, 0)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            f.truncate(position)
+
+
+def _missing_column(name, n):
+    """ Column for sessions written before the column existed.
+    """
+    return DataWrangler._new_column(name, n)
+
+
+class _CSVFormat:
+    """ Configuration comment, header row, one row per trial.
+    """
+    def __init__(self, path):
+        self.path = path
+
+
+    def open(self, config):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path)
+        if exists:
+            _truncate_partial_line(self.path)
+        self._file = open(self.path, 'a', newline='')
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._file.write(f"# {json.dumps(config)}\n")
+            self._writer.writerow(DataWrangler.columns)
+
+
+    def write_rows(self, rows):
+        self._writer.writerows(
+            [[row[name] for name in DataWrangler.columns] for row in rows])
+
+
+    def flush(self):
+        self._file.flush()
+        return [self._file.fileno()]
+
+
+    def close(self):
+        self._file.close()
+
+
+    def read(self, names=None):
+        names = list(names or DataWrangler.columns)
+        with open(self.path, newline='') as f:
+            config = json.loads(f.readline()[2:])
+            header = next(csv.reader([f.readline()]))
+            present = [name for name in names if name in header]
+            where = [header.index(name) for name in present]
+            values = [[] for _ in present]
+            n = 0
+            # Stream rows, keeping only the requested fields. Skip
+            # anything after the last newline, which a crash can
+            # leave as a partial row.
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                row = next(csv.reader([line]))
+                for column, i in zip(values, where):
+                    column.append(row[i])
+                n += 1
+        columns = {}
+        for name, column in zip(present, values):
+            dtype = DataWrangler.columns[name]
+            if dtype is np.bool_:
+                columns[name] = np.array(column) == 'True'
+            else:
+                columns[name] = np.array(column, dtype=float).astype(dtype)
+        return config, {
+            name: columns[name] if name in columns
+            else _missing_column(name, n)
+            for name in names
+        }
+
+
+class _JSONLinesFormat:
+    """ Configuration line, one JSON object per trial.
+    """
+    def __init__(self, path):
+        self.path = path
+
+
+    def open(self, config):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path)
+        if exists:
+            _truncate_partial_line(self.path)
+        self._file = open(self.path, 'a')
+        if not exists:
+            self._file.write(json.dumps({'config': config}) + "\n")
+
+
+    def write_rows(self, rows):
+        self._file.write(
+            "".join(json.dumps(row) + "\n" for row in rows))
+
+
+    def flush(self):
+        self._file.flush()
+        return [self._file.fileno()]
+
+
+    def close(self):
+        self._file.close()
+
+
+    def read(self, names=None):
+        names = list(names or DataWrangler.columns)
+        values = {name: [] for name in names}
+        n = 0
+        with open(self.path) as f:
+            config = json.loads(f.readline())['config']
+            for line in f:
+                # A crash can leave a partial final line
+                if not line.endswith('\n'):
+                    break
+                row = json.loads(line)
+                if not n:
+                    present = [name for name in names if name in row]
+                for name in present:
+                    values[name].append(row[name])
+                n += 1
+        return config, {
+            name: np.array(values[name], dtype=DataWrangler.columns[name])
+            if values[name] or not n else _missing_column(name, n)
+            for name in names
+        }
+
+
+class _BinaryFormat:
+    """ Directory of config.json plus one raw file per column.
+    """
+    def __init__(self, path):
+        self.path = path
+
+
+    def open(self, config):
+        os.makedirs(self.path, exist_ok=True)
+        config_path = os.path.join(self.path, 'config.json')
+        if not os.path.exists(config_path):
+            with open(config_path, 'w') as f:
+                json.dump(config, f)
+
+        # Cut every column back to the rows complete in all of them,
+        # so that a crash mid-batch does not misalign later rows
+        sizes = {}
+        for name, dtype in DataWrangler.columns.items():
+            path = os.path.join(self.path, name)
+            if os.path.exists(path):
+                sizes[name] = os.path.getsize(path) // np.dtype(dtype).itemsize
+        n = min(sizes.values(), default=0)
+        for name in sizes:
+            with open(os.path.join(self.path, name), 'rb+') as f:
+                f.truncate(n * np.dtype(DataWrangler.columns[name]).itemsize)
+
+        self._files = {
+            name: open(os.path.join(self.path, name), 'ab')
+            for name in DataWrangler.columns
+        }
+
+
+    def write_rows(self, rows):
+        for name, dtype in DataWrangler.columns.items():
+            np.array([row[name] for row in rows], dtype=dtype).tofile(
+                self._files[name])
+
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+        return [f.fileno() for f in self._files.values()]
+
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+    def read(self, names=None, mmap=False):
+        names = list(names or DataWrangler.columns)
+        with open(os.path.join(self.path, 'config.json')) as f:
+            config = json.load(f)
+        columns = {}
+        for name in names:
+            dtype = DataWrangler.columns[name]
+            path = os.path.join(self.path, name)
+            if not os.path.exists(path):
+                continue
+            if mmap and os.path.getsize(path):
+                columns[name] = np.memmap(path, dtype=dtype, mode='r')
+            else:
+                columns[name] = np.fromfile(path, dtype=dtype)
+        # A crash can leave columns of unequal length
+        n = min((len(col) for col in columns.values()), default=0)
+        return config, {
+            name: columns[name][:n] if name in columns
+            else _missing_column(name, n)
+            for name in names
+        }
+
+
+_FORMATS = {
+    'csv': _CSVFormat,
+    'jsonl': _JSONLinesFormat,
+    'binary': _BinaryFormat,
+}
+
+
+class SessionWriter:
+    """ Append each trial of a Staircase to a session file.
+
+        Rows are buffered and written in batches of batch_size
+        (1 = write every trial). Each batch is flushed to the
+        operating system, and also synced to disk if fsync is True.
+        Writing to an existing session file appends to it. With
+        listen=False the writer does not register itself with the
+        staircase, and events must be passed to it (e.g. from a
+        worker thread by SessionServer).
+    """
+    def __init__(self, staircase, path, fmt=None, batch_size=1,
+                 fsync=False, listen=True):
+        self.staircase = staircase
+        self.path = path
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.listen = listen
+        self._buffer = []
+        self._format = _FORMATS[fmt or _infer_format(path)](path)
+        self._format.open(staircase.config())
+        if listen:
+            staircase.add_listener(self)
+
+
+    def __call__(self, event):
+        """ Buffer trial events and write full batches.
+        """
+        if event['event'] == 'trial':
+            self._buffer.append(event)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+
+    def flush(self):
+        """ Write buffered rows and flush them to the operating system.
+        """
+        if self._buffer:
+            self._format.write_rows(self._buffer)
+            self._buffer = []
+        fileno = self._format.flush()
+        if self.fsync:
+            for fd in fileno:
+                os.fsync(fd)
+
+
+    def close(self):
+        """ Write any buffered rows, stop listening and close the file.
+        """
+        self.flush()
+        if self.listen:
+            self.staircase.remove_listener(self)
+        self._format.close()
+
+
+def load_session(path, fmt=None, mmap=False, names=None):
+    """ Read a session file. Return (config, columns), where columns
+        is a dictionary of DataWrangler column name: array. Text
+        formats are streamed line by line. names limits the columns
+        read (default: all). Binary sessions can be memory-mapped
+        instead of read.
+    """
+    reader = _FORMATS[fmt or _infer_format(path)](path)
+    if isinstance(reader, _BinaryFormat):
+        return reader.read(names, mmap=mmap)
+    return reader.read(names)
+
+
+def resume_staircase(path, fmt=None):
+    """ Rebuild a Staircase from a session file by replaying the
+        stored responses. Raise ValueError if the replayed levels
+        do not match the stored levels.
+    """
+    config, columns = load_session(path, fmt)
+    s = replay.to_staircase(config, columns['response'])
+
+    if not np.array_equal(s.dw.column('level'), columns['level']):
+        raise ValueError(f"Replayed levels do not match {path}")
+
+    return s
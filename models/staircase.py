@@ -2,29 +2,273 @@
 
     Written by: Travis M. Moore
     Created: June 06, 2023
-    Last edited: December 14, 2023
+    Last edited: October 16, 2026
 """
 
 ###########
 # Imports #
 ###########
+# Import system packages
+import struct
+import time
+
 # Import data science packages
 import numpy as np
-import pandas as pd
-import scipy.stats as stats
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-rcParams.update({'figure.autolayout': True})
+
+# Import custom modules
+from models import rules
 
 
 #########
 # BEGIN #
 #########
-class Staircase:
+def _pyplot():
+    """ Import matplotlib on first use, so importing this module
+        stays fast when nothing is plotted.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib import rcParams
+    rcParams.update({'figure.autolayout': True})
+    return plt
+
+
+def latency_summary(values, bins=10):
+    """ Return count, mean, percentiles, maximum and a histogram
+        (counts and bin edges) of a set of latencies, ignoring nan.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {'count': 0}
+    counts, edges = np.histogram(values, bins=bins)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(values),
+        'mean': values.mean(),
+        'median': p50,
+        'p95': p95,
+        'p99': p99,
+        'max': values.max(),
+        'histogram': counts,
+        'bin_edges': edges,
+    }
+
+
+def reversal_window(phase_starts, n_reversals, last=4, exclude=0,
+                    phase=None):
+    """ Return the (start, stop) reversal indexes averaged by
+        Staircase.threshold, given the reversal count at which each
+        step-size phase began and the total reversal count. An
+        empty window (start >= stop) means too few reversals.
+    """
+    if phase is None:
+        start, stop = 0, n_reversals
+    elif phase >= len(phase_starts):
+        return 0, 0
+    else:
+        start = phase_starts[phase]
+        if phase + 1 < len(phase_starts):
+            stop = phase_starts[phase + 1]
+        else:
+            stop = n_reversals
+
+    start += exclude
+    if last is not None:
+        start = max(start, stop - last)
+    return start, stop
+
+
+def _map_rule_state(old, new, state):
+    """ Return the state of rule table `new` matching `state` of
+        rule table `old`, or the state just after a level change in
+        the same direction if the counts do not exist under `new`.
+    """
+    direction, n_correct, n_incorrect, reversed_ = old.states[state]
+    for key in ((direction, n_correct, n_incorrect, reversed_),
+                (direction, 0, 0, reversed_)):
+        if key in new.states:
+            return new.states.index(key)
+    return 0
+
+
+class StaircaseSnapshot:
+    """ The state a Staircase needs to continue a track: the
+        current level, rule state, reversal flag, step index, trial
+        number, reversal count and phase starts, plus (optionally)
+        a copy-on-write view of the trial history.
+
+        lineage is the (config, origin) of the Staircase the
+        snapshot was taken from (see Staircase.snapshot), so that a
+        Staircase restored with the history can rebuild states from
+        before the snapshot.
+
+        to_bytes packs everything but the history and lineage into a
+        few dozen bytes for checkpointing; from_bytes reverses it.
+    """
+    __slots__ = ('level', 'rule_state', 'reversal_pattern', 'step_index',
+                 'trial_num', 'n_reversals', 'phase_starts', 'history',
+                 'lineage')
+
+    # level, rule state, reversal flag, step index, trial number,
+    # reversal count and number of phase starts, then one int64 per
+    # phase start
+    _HEADER = struct.Struct('<dq?qqqq')
+
+    def __init__(self, level, rule_state, reversal_pattern, step_index,
+                 trial_num, n_reversals, phase_starts, history=None,
+                 lineage=None):
+        self.level = level
+        self.rule_state = rule_state
+        self.reversal_pattern = reversal_pattern
+        self.step_index = step_index
+        self.trial_num = trial_num
+        self.n_reversals = n_reversals
+        self.phase_starts = tuple(phase_starts)
+        self.history = history
+        self.lineage = lineage
+
+
+    def to_bytes(self):
+        """ Pack the state (without history) into bytes.
+        """
+        return self._HEADER.pack(
+            self.level, self.rule_state, self.reversal_pattern,
+            self.step_index, self.trial_num, self.n_reversals,
+            len(self.phase_starts)) + \
+            struct.pack(f'<{len(self.phase_starts)}q', *self.phase_starts)
+
+
+    @classmethod
+    def from_bytes(cls, data, history=None):
+        """ Unpack a snapshot written by to_bytes, optionally
+            attaching a DataWrangler as its history.
+        """
+        *fields, n = cls._HEADER.unpack_from(data)
+        phase_starts = struct.unpack_from(f'<{n}q', data, cls._HEADER.size)
+        return cls(*fields, phase_starts, history)
+
+
+class Tracker:
+    """ Trial log, listeners and the add_response/run loop shared by
+        Staircase and models.bayesian.BayesianStaircase.
+
+        Subclasses create self.dw (a DataWrangler) and
+        self._listeners (a list) and provide current_level,
+        finished, add_data_point(response), which logs a trial, and
+        _update(dp, response), which scores it, chooses the next
+        level and advances the trial counter.
+    """
+    # Reversal count reported with each trial event
+    _n_reversals = 0
+
+    def add_listener(self, listener):
+        """ Register a callable to receive event dictionaries.
+            With no listeners, no events are built.
+        """
+        self._listeners.append(listener)
+
+
+    def remove_listener(self, listener):
+        """ Stop sending events to a registered listener.
+        """
+        self._listeners.remove(listener)
+
+
+    def _emit(self, event):
+        """ Send an event dictionary to every listener.
+        """
+        for listener in self._listeners:
+            listener(event)
+
+
+    @property
+    def levels(self):
+        """ Presentation level of every trial.
+        """
+        return self.dw.column('level').tolist()
+
+
+    @property
+    def scores(self):
+        """ Every valid (1 or -1) response.
+        """
+        responses = self.dw.column('response')
+        return responses[responses != 0].tolist()
+
+
+    def _add_trial(self, response, onset_time=None, response_time=None):
+        """ Log current level, response and timestamps, update the
+            tracker and report the trial to listeners.
+        """
+        start = time.perf_counter()
+
+        # Log current level and response
+        dp = self.add_data_point(response)
+        if onset_time is not None:
+            dp.onset_time = onset_time
+        if response_time is not None:
+            dp.response_time = response_time
+
+        self._update(dp, response)
+        dp.update_time = time.perf_counter() - start
+
+        # Report trial to listeners
+        if self._listeners:
+            event = dp.to_dict()
+            event['event'] = 'trial'
+            event['n_reversals'] = self._n_reversals
+            event['next_level'] = self.current_level
+            self._emit(event)
+            if self.finished:
+                self._emit({'event': 'finished',
+                            'trial_number': dp.trial_number})
+
+        return dp
+
+
+    def add_response(self, response, onset_time=None, response_time=None):
+        """ Add a trial. Responses after the track has finished
+            are ignored.
+
+            onset_time and response_time are optional
+            time.perf_counter() timestamps of stimulus onset and of
+            the response; the time spent updating the tracker is
+            always recorded as update_time.
+        """
+        if self.finished:
+            if self._listeners:
+                self._emit({'event': 'ignored', 'response': response})
+            return
+
+        self._add_trial(response, onset_time, response_time)
+
+
+    def run(self, responder):
+        """ Run the track to completion.
+            responder is called with the current level and must
+            return 1 (correct) or -1 (incorrect).
+        """
+        while not self.finished:
+            self._add_trial(responder(self.current_level))
+
+
+class Staircase(Tracker):
+    # Metrics collector while enable_metrics is on
+    _metrics = None
+
+    # Methods timed by enable_metrics: (attribute, timer, counter)
+    _INSTRUMENTED = (
+        ('_add_trial', 'add_response', 'trials'),
+        ('_calc_reversals', 'calc_reversals', 'reversals'),
+        ('_calc_level', 'calc_level', None),
+        ('plot_data', 'plot_data', None),
+    )
+
     def __init__(self, start_val, step_sizes, nUp, nDown, nTrials,
                  nReversals, rapid_descend, min_val, max_val):
 
         # Assign arguments to attributes
+        self.start_val = start_val
         self.current_level= start_val
         self.step_sizes = step_sizes
         self.nUp = nUp
@@ -36,51 +280,283 @@ class Staircase:
         self.max_val = max_val
 
         # Additional attributes
-        self.scores = []
-        self.reversals = {}
-        self.levels = []
-        self._level_tracker = []
         self._step_index = 0
         self._trial_num = 0
-        self._n_back = self.nDown + 1
+        self._n_reversals = 0
+
+        # Compiled level and reversal rule, the current rule state,
+        # the level move decided by the last response and whether
+        # that response produced a reversal
+        self._rule = rules.compile_rule(nUp, nDown, rapid_descend)
+        self._rule_state = 0
+        self._move = 0
+        self._reversal_pattern = False
+
+        # Number of reversals at the start of each step-size phase
+        self._phase_starts = [0]
 
         # Create DataWrangler to hold data points
         self.dw = DataWrangler()
 
+        # Callables that receive per-trial event dictionaries
+        self._listeners = []
+
+        # Where the track began if not at trial 0 under this
+        # configuration: (state at the first trial, lineage of the
+        # staircase it continued from or None); see restore
+        self._origin = None
+
+
+    def config(self):
+        """ Return the constructor arguments as a dictionary.
+        """
+        return {
+            'start_val': self.start_val,
+            'step_sizes': list(self.step_sizes),
+            'nUp': self.nUp,
+            'nDown': self.nDown,
+            'nTrials': self.nTrials,
+            'nReversals': self.nReversals,
+            'rapid_descend': self.rapid_descend,
+            'min_val': self.min_val,
+            'max_val': self.max_val,
+        }
+
+
+    def snapshot(self, trial=None, history=True):
+        """ Return a StaircaseSnapshot of the state before trial
+            `trial` (default: the current state). Earlier states are
+            rebuilt by replaying the recorded responses, each under
+            the configuration and from the starting state of the
+            staircase (or fork) that recorded them. Raise ValueError
+            if the history held does not reach back to trial. With
+            history, the snapshot shares the trial history up to
+            that point copy-on-write instead of copying it.
+        """
+        if trial is None or trial >= self._trial_num:
+            state = {
+                'current_level': self.current_level,
+                '_rule_state': self._rule_state,
+                '_reversal_pattern': self._reversal_pattern,
+                '_step_index': self._step_index,
+                '_trial_num': self._trial_num,
+                '_n_reversals': self._n_reversals,
+                '_phase_starts': self._phase_starts,
+            }
+        else:
+            state = self._replay_to(trial)
+        # A restore without history holds rows from its first trial on
+        offset = self._trial_num - len(self.dw)
+        return StaircaseSnapshot(
+            state['current_level'], state['_rule_state'],
+            state['_reversal_pattern'], state['_step_index'],
+            state['_trial_num'], state['_n_reversals'],
+            state['_phase_starts'],
+            self.dw.share(state['_trial_num'] - offset) if history else None,
+            (self.config(), self._origin))
+
+
+    def _replay_to(self, trial):
+        """ Rebuild the state before an earlier trial by replaying
+            the recorded responses of the segment that contains it.
+        """
+        from models import replay
+        offset = self._trial_num - len(self.dw)
+        config, origin = self.config(), self._origin
+        start = None if origin is None else origin[0]
+        while start is not None and trial < start.trial_num:
+            if origin[1] is None:
+                raise ValueError(
+                    f"Trial {trial} is before the history held")
+            config, origin = origin[1]
+            start = None if origin is None else origin[0]
+        first = 0 if start is None else start.trial_num
+        if first < offset:
+            raise ValueError(f"Trial {trial} is before the history held")
+        responses = self.dw.column('response')[first - offset:trial - offset]
+        _, state = replay.replay(config, responses, start)
+        if state['_trial_num'] != trial:
+            raise ValueError(f"Trial {trial} cannot be replayed from the "
+                             "history held")
+        return state
+
+
+    @classmethod
+    def restore(cls, config, snapshot):
+        """ Return a Staircase with the given configuration that
+            continues from a snapshot taken under the same nUp,
+            nDown and rapid_descend (see fork to change them).
+        """
+        s = cls(**config)
+        s.current_level = snapshot.level
+        s._reversal_pattern = snapshot.reversal_pattern
+        s._step_index = min(snapshot.step_index, len(s.step_sizes) - 1)
+        s._trial_num = snapshot.trial_num
+        s._n_reversals = snapshot.n_reversals
+        # With fewer step sizes, the current phase keeps its start
+        s._phase_starts = list(snapshot.phase_starts[:s._step_index]) + \
+            [snapshot.phase_starts[snapshot.step_index]]
+        if snapshot.history is not None:
+            s.dw = snapshot.history.share()
+        s._rule_state = snapshot.rule_state
+        s._set_origin(snapshot)
+        return s
+
+
+    def _set_origin(self, snapshot):
+        """ Record the current state as where this track began,
+            continuing the lineage of snapshot if its history is
+            held.
+        """
+        self._origin = (
+            StaircaseSnapshot(
+                self.current_level, self._rule_state,
+                self._reversal_pattern, self._step_index, self._trial_num,
+                self._n_reversals, self._phase_starts),
+            snapshot.lineage if snapshot.history is not None else None)
+
+
+    def fork(self, snapshot=None, **changes):
+        """ Return a new Staircase continuing from a snapshot
+            (default: the current state, sharing history), with any
+            constructor arguments in changes replaced. If the rule
+            changes, the counts since the last level change carry
+            over where the new rule allows them and are reset
+            otherwise. Listeners are not copied.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        s = self.restore({**self.config(), **changes}, snapshot)
+        if s._rule is not self._rule:
+            s._rule_state = _map_rule_state(
+                self._rule, s._rule, snapshot.rule_state)
+            s._set_origin(snapshot)
+        return s
+
+
+    def enable_metrics(self, metrics=None):
+        """ Start collecting runtime metrics in metrics (default:
+            a new models.metrics.Metrics), which is returned:
+                timers   - add_response (whole trial update, also
+                           from run), calc_reversals, calc_level,
+                           plot_data
+                counters - trials, reversals, clamp_min, clamp_max
+            plus the DataWrangler metrics (see
+            DataWrangler.enable_metrics). Without metrics enabled
+            nothing is measured and no time is spent on it.
+        """
+        from models.metrics import Metrics, instrument
+        self.disable_metrics()
+        self._metrics = Metrics() if metrics is None else metrics
+        instrument(self, self._metrics, self._INSTRUMENTED)
+        self.dw.enable_metrics(self._metrics)
+        return self._metrics
+
+
+    def disable_metrics(self):
+        """ Stop collecting metrics.
+        """
+        from models.metrics import uninstrument
+        uninstrument(self, self._INSTRUMENTED)
+        self.__dict__.pop('_metrics', None)
+        self.dw.disable_metrics()
+
+
+    @property
+    def reversals(self):
+        """ Dictionary of trial number: level for each reversal.
+        """
+        rows = self.dw.reversal_rows()
+        return dict(zip(
+            self.dw.column('trial_number')[rows].tolist(),
+            self.dw.reversal_levels().tolist()
+        ))
+
+
+    def threshold(self, last=4, exclude=0, phase=None):
+        """ Return (mean, sd) of the levels at the last `last`
+            reversals, ignoring the first `exclude` reversals.
+            If `phase` is given, only reversals that occurred while
+            step_sizes[phase] was active are considered, and
+            `exclude` counts from the start of that phase. Use
+            last=None for all remaining reversals.
+
+            Updated in O(1) per reversal; cheap to poll every trial.
+            Returns nan when too few reversals are available.
+            After restoring a snapshot without history, only the
+            reversals since the restore are available, and phases
+            count from the first of them.
+        """
+        n_held = len(self.dw.reversal_rows())
+        offset = self._n_reversals - n_held
+        starts = self._phase_starts
+        if offset > 0:
+            starts = [max(start - offset, 0) for start in starts]
+        start, stop = reversal_window(starts, n_held, last, exclude, phase)
+        _, mean, sd = self.dw.reversal_stats(start, stop)
+        return mean, sd
+
+
+    def threshold_ci(self, last=4, n_resamples=10000, ci=0.95, seed=None):
+        """ Bootstrap the mean of the last `last` reversal levels.
+            Return a dictionary with threshold, ci, se and
+            n_resamples (see models.bootstrap.resample_reversals).
+        """
+        from models import bootstrap
+        levels = self.dw.reversal_levels()
+        levels = levels[max(len(levels) - last, 0):]
+        return bootstrap.resample_reversals(levels, n_resamples, ci, seed)
+
+
+    def timing_summary(self, bins=10):
+        """ Summarize reaction times (response_time - onset_time)
+            and update times (time spent in add_response), in
+            seconds. Trials without timestamps are skipped.
+        """
+        return {
+            'reaction_time': latency_summary(
+                self.dw.column('response_time') -
+                self.dw.column('onset_time'), bins),
+            'update_time': latency_summary(
+                self.dw.column('update_time'), bins),
+        }
+
+
+    @property
+    def _level_tracker(self):
+        """ Scores since the last level change, rebuilt from the
+            rule state.
+        """
+        n_correct, n_incorrect = self._rule.counts(self._rule_state)
+        return [1] * n_correct + [-1] * n_incorrect
+
 
     def _calc_level(self):
-        """ Calculate the next presentation level based on previous 
-            performance.
-        """
-        # Must use np.array_equal(A,B) to test for shape and elements
-        # Using any()/all() results in weird behavior with different 
-        #  length arrays and/or empty arrays
-        if np.array_equal(self._level_tracker, np.ones(self.nDown)):
-            self.current_level= self.current_level- self.step_sizes[self._step_index]
-            self._level_tracker = []
-        elif -1 in self._level_tracker:
-            self.current_level= self.current_level+ self.step_sizes[self._step_index]
-            self._level_tracker = []
+        """ Calculate the next presentation level by applying the
+            move decided by the last response.
+        """
+        if self._move:
+            self.current_level = self.current_level + \
+                self._move * self.step_sizes[self._step_index]
+            self._move = 0
 
         # Make sure levels stay within the provided limits
         if self.current_level > self.max_val:
             self.current_level = self.max_val
+            if self._metrics is not None:
+                self._metrics.count('clamp_max')
         elif self.current_level < self.min_val:
             self.current_level = self.min_val
+            if self._metrics is not None:
+                self._metrics.count('clamp_min')
 
 
     def _calc_reversals(self):
         """ Determine whether a reversal has occurred.
         """
-        # Create variables
-        correct_vals = np.ones(self.nDown)
-        reversal_1 = np.append(correct_vals, -1)
-        reversal_2 = np.insert(correct_vals, 0, -1)
-
-        # Check for reversals
-        if np.array_equal(self.scores[-self._n_back:], reversal_1) or \
-        np.array_equal(self.scores[-self._n_back:], reversal_2):
-            self.reversals[self._trial_num] = self.current_level
+        if self._reversal_pattern:
+            self.dw.last_data_point().reversal = True
+            self._n_reversals += 1
             return True
         else:
             return False
@@ -93,43 +569,55 @@ class Staircase:
 
 
     def _handle_response(self, response):
-        """ Score and log response and level tracker.
+        """ Score response: look up the next rule state, level move
+            and reversal in the transition table. An invalid
+            response leaves the rule state unchanged and is never a
+            reversal.
         """
-        # Score response
-        if response == 1:
-            print("staircase: Correct")
-            # Log response
-            self.scores.append(1)
-            # Update level tracker
-            self._level_tracker.append(1)
-        elif response == -1:
-            # Log response
-            self.scores.append(-1)
-            # Update level tracker
-            self._level_tracker.append(-1)
-            print("staircase: Incorrect")
+        outcome = rules.OUTCOMES.get(response)
+        if outcome is not None:
+            self._rule_state, self._move, self._reversal_pattern = \
+                self._rule.transitions[self._rule_state][outcome]
         else:
-            print("staircase: Invalid response!")
+            self._reversal_pattern = False
 
 
-    def add_response(self, response):
-        """ Log current level. 
-            Score and log response and level tracker.
-            Check for reversals.
-            Calculate next level.
-            Increase trial counter.
+    def _update_step_index(self):
+        """ Move to the next step size once the current phase has
+            nReversals reversals. The final step size is kept until
+            the staircase finishes.
         """
-        print(f"\nstaircase: Trial number: {self._trial_num}")
-        dp = self.add_data_point(response)
+        n_rev = self._n_reversals
+        if n_rev - self._phase_starts[-1] >= self.nReversals and \
+        self._step_index < len(self.step_sizes) - 1:
+            self._step_index += 1
+            self._phase_starts.append(n_rev)
 
-        # Log current level
-        self.levels.append(self.current_level)
 
-        # Score and log response
+    @property
+    def finished(self):
+        """ True once nTrials trials have been run, or the final
+            step size has reached nReversals reversals.
+        """
+        if self._trial_num >= self.nTrials:
+            return True
+        return self._step_index == len(self.step_sizes) - 1 and \
+            self._n_reversals - self._phase_starts[-1] >= self.nReversals
+
+
+    def _update(self, dp, response):
+        """ Score response and update level tracker.
+            Check for reversals and advance step size.
+            Calculate next level.
+            Increase trial counter.
+        """
+        # Score response
         self._handle_response(response)
 
         # Check for reversal
         dp.reversal = self._calc_reversals()
+        if dp.reversal:
+            self._update_step_index()
 
         # Calculate next level
         self._calc_level()
@@ -137,9 +625,6 @@ class Staircase:
         # Increase trial counter - must come last!!
         self._increase_trial_num()
 
-        print(f"staircase: {dp.__dict__}")
-        print(f"staircase: # of reversals: {len(self.reversals.items())}")
-
 
     def add_data_point(self, response):
         """ Instantiate a new DataPoint using the DataWrangler.
@@ -151,7 +636,8 @@ class Staircase:
         # Update variables
         dp.trial_number = self._trial_num
         dp.level = self.current_level
-        dp.response = response
+        dp.response = response if response in (1, -1) else 0
+        dp.step_size = self.step_sizes[self._step_index]
 
         return dp
 
@@ -168,35 +654,45 @@ class Staircase:
         return attr_list
 
 
-    def plot_data(self):
+    def _plot_series(self):
         """ Organize data by response type and reversal.
-            Plot color-coded data and return average of
+            Return a dictionary of (x, y) arrays for all trials,
+            correct and incorrect responses, and reversals.
+        """
+        trial_number = self.dw.column('trial_number')
+        level = self.dw.column('level')
+        correct = self.dw.correct_rows()
+        incorrect = self.dw.incorrect_rows()
+
+        return {
+            'all': (trial_number, level),
+            'correct': (trial_number[correct], level[correct]),
+            'incorrect': (trial_number[incorrect], level[incorrect]),
+            'reversals': (trial_number[self.dw.reversal_rows()],
+                          self.dw.reversal_levels()),
+        }
+
+
+    def plot_data(self):
+        """ Plot color-coded data and return average of
             last n reversals.
         """
+        plt = _pyplot()
+        series = self._plot_series()
+
         # ALL DATA
-        x_all = self._make_attribute_list(self.dw.datapoints, 'trial_number')
-        y_all = self._make_attribute_list(self.dw.datapoints, 'level')
-        plt.plot(x_all, y_all, color='k', linestyle='dashed')
+        plt.plot(*series['all'], color='k', linestyle='dashed')
 
         # CORRECT RESPONSES
-        correct = self.dw._get_correct()
-        x_correct = self._make_attribute_list(correct, 'trial_number')
-        y_correct = self._make_attribute_list(correct, 'level')
-        plt.plot(x_correct, y_correct, color="green", linestyle="none", 
+        plt.plot(*series['correct'], color="green", linestyle="none",
                  marker='o', label="Correct")
 
         # INCORRECT RESPONSES
-        incorrect = self.dw._get_incorrect()
-        x_incorrect = self._make_attribute_list(incorrect, 'trial_number')
-        y_incorrect = self._make_attribute_list(incorrect, 'level')
-        plt.plot(x_incorrect, y_incorrect, color='red', linestyle='none',
+        plt.plot(*series['incorrect'], color='red', linestyle='none',
                  marker='o', label="Incorrect")
 
         # REVERSALS
-        reversals = self.dw._get_reversals()
-        x_rev = self._make_attribute_list(reversals, 'trial_number')
-        y_rev = self._make_attribute_list(reversals, 'level')
-        plt.plot(x_rev, y_rev, marker='o', ms=15, markeredgewidth=3, 
+        plt.plot(*series['reversals'], marker='o', ms=15, markeredgewidth=3, 
                  linestyle='none', color='k', fillstyle='none', 
                  label="Reversal")
 
@@ -204,7 +700,10 @@ class Staircase:
         plt.xlabel("Trial Number")
         plt.ylabel("Level (dB SPL)")
         #plt.xticks()
-        plt.title(f"Average of last 4 reversals: {np.mean(y_rev[-4:])}")
+        # Seeded, so the same data always get the same title
+        estimate = self.threshold_ci(4, n_resamples=2000, seed=0)
+        plt.title(f"Average of last 4 reversals: {estimate['threshold']} "
+                  f"(95% CI {estimate['ci'][0]:.1f} to {estimate['ci'][1]:.1f})")
         plt.legend()
         plt.show()
         plt.close()
@@ -213,42 +712,395 @@ class Staircase:
 class DataWrangler:
     """ Represent a collection of data points that can 
         be searched.
+
+        Trial data are stored column-wise in growable typed
+        arrays, one row per data point. Invalid responses are
+        stored as 0.
     """
-    def __init__(self):
-        """Initialize a DataWrangler with an empty list.
+    # Column name: dtype
+    columns = {
+        'trial_number': np.int32,
+        'level': np.float64,
+        'response': np.int8,
+        'reversal': np.bool_,
+        'step_size': np.float64,
+        'onset_time': np.float64,
+        'response_time': np.float64,
+        'update_time': np.float64,
+    }
+
+    # Value of unset cells, where 0 would be misleading
+    missing = {
+        'onset_time': np.nan,
+        'response_time': np.nan,
+        'update_time': np.nan,
+    }
+
+    # Metrics collector while enable_metrics is on
+    _metrics = None
+
+    # Methods timed by enable_metrics: (attribute, timer, counter)
+    _INSTRUMENTED = (
+        ('_grow', 'dw_grow', None),
+        ('_rebuild_indexes', 'dw_rebuild_indexes', None),
+        ('extend', 'dw_extend', None),
+    )
+
+    def __init__(self, capacity=64):
+        """ Initialize a DataWrangler with empty columns and indexes.
         """
-        self.datapoints = []
+        self._n = 0
+        self._data = {name: self._new_column(name, capacity)
+                      for name in self.columns}
+
+        # Row positions of correct, incorrect and reversal trials,
+        # plus the level of each reversal, kept in trial order
+        self._index = {
+            'correct': np.zeros(capacity, dtype=np.int64),
+            'incorrect': np.zeros(capacity, dtype=np.int64),
+            'reversal': np.zeros(capacity, dtype=np.int64),
+            'reversal_level': np.zeros(capacity, dtype=np.float64),
+            'reversal_sum': np.zeros(capacity, dtype=np.float64),
+            'reversal_sumsq': np.zeros(capacity, dtype=np.float64),
+        }
+        self._index_n = dict.fromkeys(self._index, 0)
+
+        # Running sums of reversal levels are taken relative to the
+        # first reversal level to limit round-off in the variance
+        self._shift = 0.0
+
+        # Copy-on-write state (see share): whether the arrays belong
+        # to another DataWrangler, and how many leading rows other
+        # DataWranglers can see
+        self._borrowed = False
+        self._frozen = 0
+
+
+    def __len__(self):
+        return self._n
+
+
+    @classmethod
+    def _new_column(cls, name, size):
+        """ Return an unset column of the given size.
+        """
+        return np.full(size, cls.missing.get(name, 0),
+                       dtype=cls.columns[name])
+
+
+    def _grow(self):
+        """ Double the capacity of every column.
+        """
+        for name, arr in self._data.items():
+            new = self._new_column(name, 2 * len(arr))
+            new[:self._n] = arr[:self._n]
+            self._data[name] = new
+
+
+    def _append_index(self, name, value):
+        """ Append a value to an index, doubling its capacity if full.
+        """
+        arr = self._index[name]
+        n = self._index_n[name]
+        if n == len(arr):
+            arr = np.concatenate([arr, np.zeros_like(arr)])
+            self._index[name] = arr
+        arr[n] = value
+        self._index_n[name] = n + 1
+
+
+    def _index_row(self, row):
+        """ Add a row to the indexes that match its values.
+        """
+        response = self._data['response'][row]
+        if response == 1:
+            self._append_index('correct', row)
+        elif response == -1:
+            self._append_index('incorrect', row)
+        if self._data['reversal'][row]:
+            level = self._data['level'][row]
+            self._append_index('reversal', row)
+            self._append_index('reversal_level', level)
+            self._append_reversal_sums(level)
+
+
+    def _append_reversal_sums(self, level):
+        """ Extend the cumulative sums of reversal levels.
+        """
+        n = self._index_n['reversal_sum']
+        if n == 0:
+            self._shift = level
+            total = total_sq = 0.0
+        else:
+            total = self._index['reversal_sum'][n - 1]
+            total_sq = self._index['reversal_sumsq'][n - 1]
+        value = level - self._shift
+        self._append_index('reversal_sum', total + value)
+        self._append_index('reversal_sumsq', total_sq + value * value)
+
+
+    def _unindex_last_row(self, row):
+        """ Remove the most recent row from the indexes. Indexes are
+            in row order, so it can only be the final entry of each.
+        """
+        for name in ('correct', 'incorrect', 'reversal'):
+            n = self._index_n[name]
+            if n and self._index[name][n - 1] == row:
+                self._index_n[name] = n - 1
+                if name == 'reversal':
+                    self._index_n['reversal_level'] -= 1
+                    self._index_n['reversal_sum'] -= 1
+                    self._index_n['reversal_sumsq'] -= 1
+
+
+    def _rebuild_indexes(self):
+        """ Recompute every index from the columns.
+        """
+        response = self.column('response')
+        reversal = np.flatnonzero(self.column('reversal'))
+        reversal_level = self.column('level')[reversal]
+        self._shift = reversal_level[0] if len(reversal_level) else 0.0
+        shifted = reversal_level - self._shift
+        values = {
+            'correct': np.flatnonzero(response == 1),
+            'incorrect': np.flatnonzero(response == -1),
+            'reversal': reversal,
+            'reversal_level': reversal_level,
+            'reversal_sum': np.cumsum(shifted),
+            'reversal_sumsq': np.cumsum(shifted * shifted),
+        }
+        for name, arr in values.items():
+            self._index[name] = np.concatenate(
+                [arr, np.zeros(max(len(arr), 1), dtype=arr.dtype)])
+            self._index_n[name] = len(arr)
+
+
+    def enable_metrics(self, metrics):
+        """ Collect metrics in a models.metrics.Metrics: timers
+            dw_grow (capacity doublings), dw_rebuild_indexes and
+            dw_extend, and the counter dw_copies (copy-on-write
+            copies, see share).
+        """
+        from models.metrics import instrument
+        self.disable_metrics()
+        self._metrics = metrics
+        instrument(self, metrics, self._INSTRUMENTED)
+
+
+    def disable_metrics(self):
+        """ Stop collecting metrics.
+        """
+        from models.metrics import uninstrument
+        uninstrument(self, self._INSTRUMENTED)
+        self.__dict__.pop('_metrics', None)
+
+
+    def share(self, n=None):
+        """ Return a DataWrangler holding the first n rows (default:
+            all) without copying them. Both share the arrays until
+            either writes to a shared row, which copies the writer's
+            arrays first; the original can keep appending rows in
+            place.
+        """
+        n = self._n if n is None else n
+        view = object.__new__(type(self))
+        view._n = n
+        view._data = dict(self._data)
+        view._index = dict(self._index)
+        view._shift = self._shift
+
+        # Index entries are in row order, so the entries for the
+        # first n rows are a prefix of each index
+        rows = {name: np.searchsorted(
+                    self._index[name][:self._index_n[name]], n)
+                for name in ('correct', 'incorrect', 'reversal')}
+        view._index_n = {
+            'correct': rows['correct'],
+            'incorrect': rows['incorrect'],
+            'reversal': rows['reversal'],
+            'reversal_level': rows['reversal'],
+            'reversal_sum': rows['reversal'],
+            'reversal_sumsq': rows['reversal'],
+        }
+        view._borrowed = True
+        view._frozen = n
+        self._frozen = max(self._frozen, n)
+        return view
+
+
+    def _writable(self, row):
+        """ Copy the arrays before writing a row that another
+            DataWrangler can see. Rows past this DataWrangler's own
+            are reset, since they may hold the other's later trials.
+        """
+        if self._borrowed or row < self._frozen:
+            if self._metrics is not None:
+                self._metrics.count('dw_copies')
+            self._data = {name: arr.copy() for name, arr in self._data.items()}
+            for name, arr in self._data.items():
+                arr[self._n:] = self.missing.get(name, 0)
+            self._index = {name: arr.copy()
+                           for name, arr in self._index.items()}
+            self._borrowed = False
+            self._frozen = 0
+
+
+    def _set_value(self, name, row, value):
+        """ Write one cell and keep the indexes current. Updates to
+            the most recent row cost O(1); editing older rows
+            rebuilds the indexes.
+        """
+        self._writable(row)
+        self._data[name][row] = value
+        if name in ('response', 'reversal', 'level'):
+            if row == self._n - 1:
+                self._unindex_last_row(row)
+                self._index_row(row)
+            else:
+                self._rebuild_indexes()
+
+
+    def extend(self, columns):
+        """ Append rows in bulk from a dictionary of column name:
+            array, all of the same length. Columns not given are
+            left unset. The indexes are rebuilt once.
+        """
+        n = len(next(iter(columns.values())))
+        self._writable(self._n)
+        while self._n + n > len(self._data['level']):
+            self._grow()
+        for name, values in columns.items():
+            self._data[name][self._n:self._n + n] = values
+        self._n += n
+        self._rebuild_indexes()
+
+
+    def column(self, name):
+        """ Return a view of the filled part of a column.
+        """
+        return self._data[name][:self._n]
+
+
+    @property
+    def datapoints(self):
+        """ List of DataPoint views, one per row.
+        """
+        return [DataPoint(self, row) for row in range(self._n)]
 
 
     def new_data_point(self):
-        """ Create new DataPoint object and append to list.
+        """ Append an empty row and return a DataPoint view of it.
         """
-        dp = DataPoint()
-        self.datapoints.append(dp)
-        return dp
+        self._writable(self._n)
+        if self._n == len(self._data['level']):
+            self._grow()
+        self._n += 1
+        return DataPoint(self, self._n - 1)
+
+
+    def last_data_point(self):
+        """ Return a DataPoint view of the most recent row.
+        """
+        return DataPoint(self, self._n - 1)
+
+
+    def correct_rows(self):
+        """ Return a view of row positions with a correct response.
+        """
+        return self._index['correct'][:self._index_n['correct']]
+
+
+    def incorrect_rows(self):
+        """ Return a view of row positions with an incorrect response.
+        """
+        return self._index['incorrect'][:self._index_n['incorrect']]
+
+
+    def reversal_rows(self):
+        """ Return a view of row positions with a reversal.
+        """
+        return self._index['reversal'][:self._index_n['reversal']]
+
+
+    def reversal_levels(self):
+        """ Return a view of the level at each reversal, in order.
+        """
+        return self._index['reversal_level'][:self._index_n['reversal_level']]
+
+
+    def reversal_stats(self, start, stop):
+        """ Return (count, mean, sd) of the levels of reversals
+            start through stop-1, in O(1) from the running sums.
+            The sample SD (ddof=1) is nan for fewer than two
+            reversals; the mean is nan for none.
+        """
+        count = stop - start
+        if count <= 0:
+            return 0, np.nan, np.nan
+        cumsum = self._index['reversal_sum']
+        cumsum_sq = self._index['reversal_sumsq']
+        total = cumsum[stop - 1] - (cumsum[start - 1] if start else 0.0)
+        total_sq = cumsum_sq[stop - 1] - \
+            (cumsum_sq[start - 1] if start else 0.0)
+        mean = total / count
+        if count < 2:
+            return count, mean + self._shift, np.nan
+        var = max(total_sq - count * mean * mean, 0.0) / (count - 1)
+        return count, mean + self._shift, np.sqrt(var)
 
 
     def _get_correct(self):
         """ Return a list of all DataPoint objects with a correct response.
         """
-        return [datum for datum in self.datapoints if datum.response == 1]
+        return [DataPoint(self, row) for row in self.correct_rows()]
 
 
     def _get_incorrect(self):
         """ Return a list of all DataPoint objects with an incorrect response.
         """
-        return [datum for datum in self.datapoints if datum.response == -1]
+        return [DataPoint(self, row) for row in self.incorrect_rows()]
 
 
     def _get_reversals(self):
-        """ Find all data points that match the given filter.
+        """ Return a list of all DataPoint objects with a reversal.
         """
-        return [datum for datum in self.datapoints if datum.reversal]
+        return [DataPoint(self, row) for row in self.reversal_rows()]
+
+
+def _column_property(name):
+    """ Read/write access to one column of a DataPoint's row.
+    """
+    def getter(self):
+        return self._dw._data[name][self._row].item()
+
+
+    def setter(self, value):
+        self._dw._set_value(name, self._row, value)
+
+    return property(getter, setter)
 
 
 class DataPoint:
-    def __init__(self):
-        self.trial_number = None
-        self.level = None
-        self.response = None
-        self.reversal = None
+    """ Lightweight view of one row of a DataWrangler.
+    """
+    __slots__ = ('_dw', '_row')
+
+    def __init__(self, dw, row):
+        self._dw = dw
+        self._row = row
+
+
+    trial_number = _column_property('trial_number')
+    level = _column_property('level')
+    response = _column_property('response')
+    reversal = _column_property('reversal')
+    step_size = _column_property('step_size')
+    onset_time = _column_property('onset_time')
+    response_time = _column_property('response_time')
+    update_time = _column_property('update_time')
+
+
+    def to_dict(self):
+        """ Return the row as a dictionary of column: value.
+        """
+        return {name: getattr(self, name) for name in DataWrangler.columns}
@@ -0,0 +1,157 @@
+""" Parallel parameter sweeps of simulated staircases.
+
+    Each combination of parameter values in a grid is one condition.
+    The runs of a condition are split into chunks, every chunk is
+    simulated with BatchStaircase against an observer model (see
+    models.observers; LogisticObserver by default) in a worker
+    process, and the results are aggregated per condition into a
+    pandas DataFrame.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+# Import data science packages
+import numpy as np
+import pandas as pd
+
+# Import custom modules
+from models import rules
+from models.batch import BatchStaircase, reversal_thresholds
+from models.observers import LogisticObserver
+
+
+#########
+# BEGIN #
+#########
+STAIRCASE_PARAMS = ('start_val', 'step_sizes', 'nUp', 'nDown', 'nTrials',
+                    'nReversals', 'rapid_descend', 'min_val', 'max_val')
+OBSERVER_PARAMS = ('threshold', 'slope', 'guess_rate', 'lapse_rate')
+
+
+class Wrapped:
+    """ Picklable observer factory for wrapped observers: called
+        with observer arguments, it returns
+        wrapper(observer(**arguments), **kwargs), e.g.
+        Wrapped(FatigueObserver, LogisticObserver, drift=0.05).
+    """
+    def __init__(self, wrapper, observer, **kwargs):
+        self.wrapper = wrapper
+        self.observer = observer
+        self.kwargs = kwargs
+
+
+    def __call__(self, **arguments):
+        return self.wrapper(self.observer(**arguments), **self.kwargs)
+
+
+    def __repr__(self):
+        kwargs = ''.join(f", {k}={v!r}" for k, v in self.kwargs.items())
+        return f"{self.wrapper.__name__}({_name(self.observer)}{kwargs})"
+
+
+def _name(factory):
+    """ Readable name of an observer factory for result rows.
+    """
+    return getattr(factory, '__name__', None) or repr(factory)
+
+
+def _make_observer(params, seed=None):
+    """ Build a condition's observer from its 'observer' factory
+        (default LogisticObserver) and whichever of OBSERVER_PARAMS
+        it gives.
+    """
+    factory = params.get('observer', LogisticObserver)
+    return factory(seed=seed,
+                   **{k: params[k] for k in OBSERVER_PARAMS if k in params})
+
+
+def _simulate_chunk(params, n, seed):
+    """ Simulate n runs of one condition. Return per-run thresholds,
+        trial counts and whether each run reached its reversal target.
+    """
+    b = BatchStaircase(n=n, **{k: params[k] for k in STAIRCASE_PARAMS})
+    levels, _, reversals = b.run(_make_observer(params, seed))
+
+    thresholds = reversal_thresholds(levels, reversals, params['nReversals'])
+    n_trials = (~np.isnan(levels)).sum(axis=0)
+    return thresholds, n_trials, b.converged
+
+
+def _summarize(params, thresholds, n_trials, converged):
+    """ Aggregate the runs of one condition into a result row.
+    """
+    # The level where the rule's expected step is zero
+    target = _make_observer(params).level_at(
+        rules.convergence_point(params['nUp'], params['nDown']))
+
+    row = dict(params)
+    if 'observer' in row:
+        row['observer'] = _name(row['observer'])
+    row['target_level'] = target
+    row['threshold_mean'] = np.nanmean(thresholds)
+    row['threshold_bias'] = row['threshold_mean'] - target
+    row['threshold_var'] = np.nanvar(thresholds, ddof=1)
+    row['converged'] = converged.mean()
+    row['trials_to_converge'] = n_trials[converged].mean() \
+        if converged.any() else np.nan
+    return row
+
+
+def run_sweep(grid, base=None, n_runs=1000, chunk_size=1000, seed=0,
+              max_workers=None):
+    """ Simulate every combination of the values in grid.
+
+        grid maps parameter names to lists of values; base holds
+        parameters shared by all conditions. Together they must give
+        every Staircase argument plus the observer's arguments from
+        OBSERVER_PARAMS (threshold and slope; guess_rate and
+        lapse_rate are optional). 'observer' chooses the observer
+        model: a callable taking those arguments and seed, such as
+        an observer class, a functools.partial of one with further
+        arguments, or a Wrapped. It defaults to LogisticObserver,
+        must be picklable unless max_workers=1, and its level_at
+        gives each condition's target level. The results show it by
+        name.
+
+        Each chunk of chunk_size runs is seeded from (seed, condition,
+        chunk), so results depend only on those and not on the number
+        of workers. max_workers=1 runs in the calling process.
+
+        Return a DataFrame with one row per condition.
+    """
+    names = list(grid)
+    conditions = [dict(base or {}, **dict(zip(names, values)))
+                  for values in itertools.product(*grid.values())]
+
+    tasks = []
+    for c, params in enumerate(conditions):
+        for k, start in enumerate(range(0, n_runs, chunk_size)):
+            n = min(chunk_size, n_runs - start)
+            tasks.append((c, params, n,
+                          np.random.SeedSequence(seed, spawn_key=(c, k))))
+
+    if max_workers == 1:
+        results = [_simulate_chunk(params, n, ss)
+                   for _, params, n, ss in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_simulate_chunk, params, n, ss)
+                       for _, params, n, ss in tasks]
+            results = [f.result() for f in futures]
+
+    rows = []
+    for c, params in enumerate(conditions):
+        chunks = [r for (t, *_), r in zip(tasks, results) if t == c]
+        rows.append(_summarize(
+            params, *(np.concatenate(arrays) for arrays in zip(*chunks))))
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,111 @@
+""" Unit tests for cohort analysis of session files.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import os
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import analysis
+from models import session
+from models import staircase
+from models.observers import LogisticObserver
+
+
+#########
+# Begin #
+#########
+class TestAnalysis(TestCase):
+    def setUp(self):
+        """ Write one simulated session in each format.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.staircases = {}
+        for i, name in enumerate(('a.csv', 'b.jsonl', 'c')):
+            s = staircase.Staircase(
+                start_val=70, step_sizes=[8,4,2], nUp=1, nDown=2,
+                nTrials=60, nReversals=3, rapid_descend=False,
+                min_val=20, max_val=90)
+            path = os.path.join(self.tmp.name, name)
+            writer = session.SessionWriter(s, path, batch_size=10)
+            s.run(LogisticObserver(threshold=50, slope=0.3, seed=i))
+            writer.close()
+            self.staircases[path] = s
+
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+    def test_find_sessions(self):
+        """ Files and binary session directories are found.
+        """
+        # Assertions
+        self.assertEqual(analysis.find_sessions(self.tmp.name),
+                         sorted(self.staircases))
+
+
+    def test_partial_columns(self):
+        """ load_session can read a subset of columns.
+        """
+        for path in self.staircases:
+            _, columns = session.load_session(path, names=analysis.COLUMNS)
+
+            # Assertions
+            self.assertEqual(list(columns), list(analysis.COLUMNS))
+
+
+    def test_matches_staircase(self):
+        """ Statistics match the Staircase that wrote each file.
+        """
+        for path, s in self.staircases.items():
+            config, columns = session.load_session(path)
+            for kwargs in ({}, {'last': None, 'exclude': 1},
+                           {'phase': 1, 'last': 2}, {'phase': 2}):
+                stats = analysis.summarize_session(config, columns, **kwargs)
+                mean, sd = s.threshold(**kwargs)
+
+                # Assertions
+                np.testing.assert_allclose(stats['threshold'], mean)
+                np.testing.assert_allclose(stats['threshold_sd'], sd)
+            self.assertEqual(analysis.phase_starts(config, len(s.reversals)),
+                             s._phase_starts)
+            self.assertEqual(stats['n_trials'], len(s.levels))
+            self.assertEqual(stats['n_reversals'], len(s.reversals))
+            self.assertEqual(stats['finished'], s.finished)
+
+
+    def test_analyze_sessions(self):
+        """ One row per session, the same with and without workers;
+            unreadable files are reported rather than raised.
+        """
+        bad = os.path.join(self.tmp.name, 'bad.jsonl')
+        with open(bad, 'w') as f:
+            f.write("not json\n")
+
+        serial = analysis.analyze_sessions(self.tmp.name, max_workers=1)
+        parallel = analysis.analyze_sessions(self.tmp.name, max_workers=2)
+
+        # Assertions
+        self.assertEqual(len(serial), 4)
+        self.assertTrue(serial.equals(parallel))
+        errors = serial.set_index('path')['error']
+        self.assertIsNotNone(errors[bad])
+        self.assertTrue(errors.drop(bad).isna().all())
+        for path, s in self.staircases.items():
+            row = serial.set_index('path').loc[path]
+            self.assertAlmostEqual(row['threshold'], s.threshold()[0])
+            self.assertEqual(row['nDown'], 2)
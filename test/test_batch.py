@@ -0,0 +1,157 @@
+""" Unit tests for BatchStaircase class.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import batch
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestBatchStaircase(TestCase):
+    def setUp(self):
+        """ Create BatchStaircase.
+        """
+        self.params = dict(
+            start_val=60,
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=40,
+            nReversals=2,
+            rapid_descend=False,
+            min_val=50,
+            max_val=80
+        )
+        self.b = batch.BatchStaircase(n=3, **self.params)
+
+
+    def tearDown(self):
+        del self.b
+
+
+    ##############
+    # Unit Tests #
+    ##############
+    def test_batch_defaults_on_init(self):
+        """ Test that per-run arrays are initialized.
+        """
+        np.testing.assert_array_equal(self.b.current_level, [60, 60, 60])
+        np.testing.assert_array_equal(self.b.n_reversals, [0, 0, 0])
+        np.testing.assert_array_equal(self.b._step_index, [0, 0, 0])
+        self.assertEqual(self.b._trial_num, 0)
+
+
+    def test_add_response_lockstep(self):
+        # Correct/correct, incorrect/incorrect, correct/incorrect
+        self.b.add_response([1, -1, 1])
+        self.b.add_response([1, -1, -1])
+
+        # Assertions
+        np.testing.assert_array_equal(self.b.current_level, [52, 76, 68])
+        self.assertEqual(self.b._trial_num, 2)
+
+
+    def test_add_response_invalid(self):
+        with self.assertRaises(ValueError):
+            self.b.add_response([1, 0, -1])
+
+
+    def test_finished_runs_stop_updating(self):
+        b = batch.BatchStaircase(n=2, **dict(self.params, nReversals=1))
+        # Run 0 reverses once per step size and finishes
+        for responses in [[1, -1], [1, -1], [-1, -1], [1, -1], [1, -1]]:
+            b.add_response(responses)
+        level = b.current_level[0]
+        b.add_response([-1, -1])
+
+        # Assertions
+        np.testing.assert_array_equal(b.finished, [True, False])
+        np.testing.assert_array_equal(b._step_index, [1, 0])
+        self.assertEqual(b.current_level[0], level)
+
+
+    def test_finished_at_matches_mask(self):
+        """ finished_at agrees with finished for every run, whether
+            a run stops on reversals or on trials.
+        """
+        b = batch.BatchStaircase(n=20, **dict(self.params, nTrials=12))
+        rng = np.random.default_rng(4)
+        checked = 0
+        while not b.finished.all():
+            b.add_response(rng.choice([1, -1], size=20))
+            for run in range(20):
+                self.assertEqual(b.finished_at(run), b.finished[run])
+                checked += 1
+
+        # Assertions
+        self.assertEqual(b.n_phases, 2)
+        self.assertTrue(b.converged.any())
+        self.assertFalse(b.converged.all())
+        self.assertGreater(checked, 0)
+
+
+    def test_per_run_limits(self):
+        b = batch.BatchStaircase(
+            n=2, **dict(self.params, min_val=[50, 56]))
+        b.add_response([1, 1])
+        b.add_response([1, 1])
+
+        # Assertions
+        np.testing.assert_array_equal(b.current_level, [52, 56])
+
+
+    #####################
+    # Integration Tests #
+    #####################
+    def test_run_matches_staircase(self):
+        """ Each batch run must reproduce the scalar Staircase.
+        """
+        rng = np.random.default_rng(0)
+        n, n_trials = 20, 40
+        responses = rng.choice([1, -1], size=(n_trials, n), p=[0.7, 0.3])
+        trial = iter(responses)
+
+        b = batch.BatchStaircase(n=n, **self.params)
+        levels, scores, reversals = b.run(lambda levels: next(trial))
+
+        for run in range(n):
+            s = staircase.Staircase(**self.params)
+            for response in responses[:, run]:
+                s.add_response(response)
+            n_run = len(s.levels)
+
+            np.testing.assert_array_equal(levels[:n_run, run], s.levels)
+            self.assertTrue(np.isnan(levels[n_run:, run]).all())
+            np.testing.assert_array_equal(scores[:n_run, run], s.scores)
+            self.assertEqual(
+                list(np.flatnonzero(reversals[:, run])),
+                list(s.reversals.keys())
+            )
+            self.assertEqual(b.n_reversals[run], len(s.reversals))
+            self.assertEqual(b._step_index[run], s._step_index)
+            self.assertEqual(b.current_level[run], s.current_level)
+            self.assertEqual(b.finished[run], s.finished)
+
+
+    def test_reversal_thresholds(self):
+        levels = np.array([[60, 60], [52, 56], [60, 60], [56, np.nan]])
+        reversals = np.array([[0, 0], [1, 1], [1, 0], [1, 0]], dtype=bool)
+
+        # Assertions
+        np.testing.assert_array_equal(
+            batch.reversal_thresholds(levels, reversals, 2), [58, 56])
@@ -0,0 +1,149 @@
+""" Unit tests for the Bayesian adaptive tracker.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import os
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import session
+from models.bayesian import BayesianStaircase
+from models.observers import LogisticObserver
+
+
+#########
+# Begin #
+#########
+class TestBayesianStaircase(TestCase):
+    def setUp(self):
+        """ Create a tracker and a known observer.
+        """
+        self.b = BayesianStaircase(start_val=70.4, min_val=20, max_val=90,
+                                   nTrials=120, slopes=[0.3])
+        self.observer = LogisticObserver(threshold=50, slope=0.3, seed=0)
+
+
+    def test_start_level(self):
+        """ The first level is the grid level nearest start_val.
+        """
+        # Assertions
+        self.assertEqual(self.b.current_level, 70)
+
+
+    def test_converges(self):
+        """ The posterior mean approaches the observer's threshold
+            and its SD shrinks.
+        """
+        sd_before = self.b.threshold()[1]
+        self.b.run(self.observer)
+        mean, sd = self.b.threshold()
+
+        # Assertions
+        self.assertEqual(len(self.b.levels), 120)
+        self.assertAlmostEqual(mean, 50, delta=4)
+        self.assertLess(sd, sd_before / 5)
+
+
+    def test_quest_and_slope_grid(self):
+        """ QUEST placement with a slope grid also converges.
+        """
+        b = BayesianStaircase(start_val=70, min_val=20, max_val=90,
+                              nTrials=200, slopes=np.geomspace(0.05, 2, 8),
+                              method='quest')
+        b.run(self.observer)
+
+        # Assertions
+        self.assertAlmostEqual(b.threshold()[0], 50, delta=4)
+        self.assertGreater(b.slope()[0], 0.05)
+        with self.assertRaises(ValueError):
+            BayesianStaircase(70, 20, 90, 10, method='staircase')
+
+
+    def test_sd_stop(self):
+        """ The track stops early once the posterior is narrow.
+        """
+        b = BayesianStaircase(start_val=70, min_val=20, max_val=90,
+                              nTrials=500, slopes=[0.3], sd_stop=2)
+        b.run(self.observer)
+
+        # Assertions
+        self.assertLess(len(b.levels), 500)
+        self.assertLess(b.threshold()[1], 2)
+
+
+    def test_invalid_response(self):
+        """ Invalid responses are logged as 0 and leave the
+            posterior and level unchanged.
+        """
+        posterior = self.b.posterior.copy()
+        level = self.b.current_level
+        self.b.add_response(0)
+
+        # Assertions
+        np.testing.assert_array_equal(self.b.posterior, posterior)
+        self.assertEqual(self.b.current_level, level)
+        self.assertEqual(self.b.dw.column('response').tolist(), [0])
+        self.assertEqual(self.b.scores, [])
+
+
+    def test_events_and_persistence(self):
+        """ Listeners and SessionWriter work as with Staircase.
+        """
+        events = []
+        self.b.add_listener(events.append)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'session.jsonl')
+            writer = session.SessionWriter(self.b, path)
+            for _ in range(10):
+                self.b.add_response(self.observer(self.b.current_level))
+            writer.close()
+            config, columns = session.load_session(path)
+
+        # Assertions
+        self.assertEqual(len(events), 10)
+        self.assertEqual(events[-1]['next_level'], self.b.current_level)
+        self.assertEqual(config['method'], 'psi')
+        np.testing.assert_array_equal(columns['level'], self.b.levels)
+
+
+    def test_shared_trial_loop(self):
+        """ Timestamps, reversal counts and ignored responses
+            behave as for Staircase.
+        """
+        b = BayesianStaircase(start_val=50, min_val=20, max_val=90,
+                              nTrials=2)
+        events = []
+        b.add_listener(events.append)
+        b.add_response(1, onset_time=10.0, response_time=10.5)
+        b.add_response(-1)
+        b.add_response(1)
+
+        # Assertions
+        self.assertEqual(b.dw.column('onset_time')[0], 10.0)
+        self.assertEqual(b.dw.column('response_time')[0], 10.5)
+        self.assertEqual(b.scores, [1, -1])
+        self.assertEqual([e['event'] for e in events],
+                         ['trial', 'trial', 'finished', 'ignored'])
+        self.assertEqual(events[0]['n_reversals'], 0)
+
+
+    def test_update_time(self):
+        """ A trial update takes well under a millisecond.
+        """
+        self.b.run(self.observer)
+
+        # Assertions
+        self.assertLess(np.median(self.b.dw.column('update_time')), 1e-3)
@@ -0,0 +1,77 @@
+""" Unit tests for the micro-benchmark suite.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import custom modules
+from benchmarks import bench_staircase
+
+
+#########
+# Begin #
+#########
+class TestBenchmarks(TestCase):
+    def test_small_runs_produce_metrics(self):
+        """ Each benchmark returns positive costs.
+        """
+        results = {}
+        results.update(bench_staircase.bench_add_response(n=200))
+        results.update(bench_staircase.bench_calc_vs_nDown(
+            nDowns=(1, 3), number=10))
+        results.update(bench_staircase.bench_queries_vs_history(
+            sizes=(50,), number=10))
+        results.update(bench_staircase.bench_plot_series(
+            sizes=(50,), number=5))
+        results.update(bench_staircase.bench_memory_per_trial(n=200))
+
+        # Assertions
+        self.assertIn('add_response_s', results)
+        self.assertIn('calc_level_nDown3_s', results)
+        self.assertIn('threshold_50_s', results)
+        self.assertIn('plot_series_50_s', results)
+        self.assertIn('memory_per_trial_bytes', results)
+        for name, value in results.items():
+            self.assertGreater(value, 0, name)
+
+
+    def test_baselines_cover_full_suite(self):
+        """ Stored baselines exist for the default benchmarks.
+        """
+        baselines = bench_staircase.load_baselines()
+
+        # Assertions
+        for name in ('add_response_s', 'calc_reversals_nDown8_s',
+                     'correct_rows_100000_s', 'plot_series_100000_s',
+                     'memory_per_trial_bytes'):
+            self.assertIn(name, baselines)
+
+
+    def test_compare(self):
+        """ Only metrics beyond the threshold are regressions.
+        """
+        baselines = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        results = {'a': 1.2, 'b': 1.3, 'c': 0.5, 'd': 9.0}
+        regressions = bench_staircase.compare(results, baselines, 0.25)
+
+        # Assertions
+        self.assertEqual(regressions, {'b': (1.3, 1.0)})
+
+
+    def test_median_results(self):
+        """ Baselines are the median of several runs, so one lucky
+            run does not set them.
+        """
+        runs = [{'a': 1.0, 'b': 5.0}, {'a': 0.2, 'b': 4.0},
+                {'a': 1.1, 'b': 6.0}]
+
+        # Assertions
+        self.assertEqual(bench_staircase.median_results(runs),
+                         {'a': 1.0, 'b': 5.0})
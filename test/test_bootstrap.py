@@ -0,0 +1,130 @@
+""" Unit tests for bootstrap threshold intervals.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import os
+import subprocess
+import sys
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import bootstrap
+from models.observers import LogisticObserver
+from models.staircase import Staircase
+
+
+#########
+# Begin #
+#########
+class TestBootstrap(TestCase):
+    def setUp(self):
+        """ Run a track against a known observer.
+        """
+        self.s = Staircase(start_val=70, step_sizes=[4,2], nUp=1, nDown=2,
+                           nTrials=80, nReversals=8, rapid_descend=False,
+                           min_val=20, max_val=90)
+        self.s.run(LogisticObserver(threshold=50, slope=0.3, seed=1))
+
+
+    def test_resample_reversals(self):
+        """ The interval brackets the observed mean and is
+            reproducible for a seed.
+        """
+        levels = [48, 52, 46, 54, 50, 50]
+        result = bootstrap.resample_reversals(levels, seed=0)
+        again = bootstrap.resample_reversals(levels, seed=0)
+
+        # Assertions
+        self.assertEqual(result['threshold'], 50)
+        self.assertEqual(result['n_resamples'], 10000)
+        self.assertLess(result['ci'][0], 50)
+        self.assertGreater(result['ci'][1], 50)
+        self.assertGreater(result['se'], 0)
+        self.assertEqual(result, again)
+
+
+    def test_resample_constant_levels(self):
+        """ Identical reversal levels give a zero-width interval.
+        """
+        result = bootstrap.resample_reversals([50, 50, 50], seed=0)
+
+        # Assertions
+        self.assertEqual(result['ci'], (50, 50))
+        self.assertEqual(result['se'], 0)
+
+
+    def test_resample_no_reversals(self):
+        """ No reversals give nan.
+        """
+        result = bootstrap.resample_reversals([])
+
+        # Assertions
+        self.assertTrue(np.isnan(result['threshold']))
+        self.assertEqual(result['n_resamples'], 0)
+
+
+    def test_threshold_ci(self):
+        """ Staircase.threshold_ci resamples the last reversals.
+        """
+        result = self.s.threshold_ci(last=4, seed=0)
+        levels = self.s.dw.reversal_levels()[-4:]
+
+        # Assertions
+        self.assertAlmostEqual(result['threshold'], self.s.threshold(4)[0])
+        self.assertGreaterEqual(result['ci'][0], levels.min())
+        self.assertLessEqual(result['ci'][1], levels.max())
+
+
+    def test_resimulate(self):
+        """ Re-simulating against the true observer gives an
+            interval around its 70.7% point.
+        """
+        observer = LogisticObserver(threshold=50, slope=0.3, seed=0)
+        result = bootstrap.resimulate(self.s, observer, n_resamples=2000)
+
+        # Assertions
+        self.assertEqual(result['threshold'], self.s.threshold(4)[0])
+        self.assertEqual(result['n_resamples'], 2000)
+        self.assertLess(result['ci'][0], observer.level_at(0.5 ** 0.5))
+        self.assertGreater(result['ci'][1], observer.level_at(0.5 ** 0.5))
+
+
+    def test_resimulate_fitted_observer(self):
+        """ Without an observer, one is fitted to the track.
+        """
+        a = bootstrap.resimulate(self.s, n_resamples=500, seed=3)
+        b = bootstrap.resimulate(self.s, n_resamples=500, seed=3)
+
+        # Assertions
+        self.assertEqual(a, b)
+        self.assertLess(a['ci'][0], a['ci'][1])
+
+
+    def test_import_is_light(self):
+        """ Importing bootstrap (as Staircase.threshold_ci does) does
+            not load pandas or process pools.
+        """
+        code = (
+            "import sys\n"
+            "from models import bootstrap\n"
+            "print(','.join(m for m in ('pandas', 'models.sweep',"
+            " 'concurrent.futures.process') if m in sys.modules))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root,
+                             capture_output=True, text=True, check=True)
+
+        # Assertions
+        self.assertEqual(out.stdout.strip(), "")
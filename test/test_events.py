@@ -0,0 +1,122 @@
+""" Unit tests for Staircase event listeners.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+from unittest import mock
+
+# Import system packages
+import json
+import logging
+import os
+import tempfile
+
+# Import custom modules
+from models import events
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestEvents(TestCase):
+    def setUp(self):
+        """ Create Staircase.
+        """
+        self.s = staircase.Staircase(
+            start_val=60,
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=10,
+            nReversals=1,
+            rapid_descend=False,
+            min_val=50,
+            max_val=80
+        )
+
+
+    def tearDown(self):
+        del self.s
+
+
+    def test_trial_events(self):
+        received = []
+        self.s.add_listener(received.append)
+        for response in [1, 1, -1]:
+            self.s.add_response(response)
+
+        # Assertions
+        self.assertEqual([e['event'] for e in received],
+                         ['trial', 'trial', 'trial'])
+        self.assertEqual(received[2]['level'], 52)
+        self.assertTrue(received[2]['reversal'])
+        self.assertEqual(received[2]['n_reversals'], 1)
+        self.assertEqual(received[2]['next_level'], 56)
+
+
+    def test_finished_and_ignored_events(self):
+        received = []
+        self.s.add_listener(received.append)
+        for response in [1, 1, -1, 1, 1, 1]:
+            self.s.add_response(response)
+
+        # Assertions
+        self.assertEqual([e['event'] for e in received[-3:]],
+                         ['trial', 'finished', 'ignored'])
+
+
+    def test_remove_listener(self):
+        received = []
+        self.s.add_listener(received.append)
+        self.s.remove_listener(received.append)
+        self.s.add_response(1)
+
+        # Assertions
+        self.assertEqual(received, [])
+
+
+    def test_console_listener(self):
+        self.s.add_listener(events.console_listener)
+        with mock.patch('builtins.print') as mock_print:
+            self.s.add_response(-1)
+
+        # Assertions
+        printed = [c.args[0] for c in mock_print.call_args_list]
+        self.assertEqual(printed[0], "\nstaircase: Trial number: 0")
+        self.assertEqual(printed[1], "staircase: Incorrect")
+        self.assertEqual(printed[3], "staircase: # of reversals: 0")
+
+
+    def test_logging_listener(self):
+        logger = logging.getLogger('test_events')
+        self.s.add_listener(events.LoggingListener(logger))
+        with self.assertLogs(logger, level='INFO') as logs:
+            self.s.add_response(1)
+
+        # Assertions
+        self.assertEqual(logs.records[0].event['trial_number'], 0)
+
+
+    def test_async_file_listener(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.jsonl')
+            listener = events.AsyncFileListener(path)
+            self.s.add_listener(listener)
+            for response in [1, 1]:
+                self.s.add_response(response)
+            listener.close()
+
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+
+        # Assertions
+        self.assertEqual([e['trial_number'] for e in lines], [0, 1])
+        self.assertEqual(lines[1]['next_level'], 52)
@@ -0,0 +1,109 @@
+""" Unit tests for interleaved staircases.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import interleave
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestInterleavedStaircases(TestCase):
+    def setUp(self):
+        """ Define a descending and an ascending track.
+        """
+        self.params = dict(
+            start_val=[70, 30],
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=30,
+            nReversals=2,
+            rapid_descend=False,
+            min_val=20,
+            max_val=80
+        )
+
+
+    def _make(self, schedule):
+        return interleave.InterleavedStaircases(
+            n=2, labels=['down', 'up'], schedule=schedule, seed=1,
+            **self.params)
+
+
+    def test_round_robin_alternates(self):
+        m = self._make('round_robin')
+        tracks = []
+        for _ in range(4):
+            track, _ = m.next_track()
+            tracks.append(track)
+            m.add_response(1)
+
+        # Assertions
+        self.assertEqual(tracks, [0, 1, 0, 1])
+        self.assertEqual(m.status(0)['level'], 62)
+        self.assertEqual(m.status(1)['level'], 22)
+
+
+    def test_least_converged_first(self):
+        m = self._make('least_converged')
+        # Track 0 reverses after two correct and one incorrect
+        for response in [1, 1, -1]:
+            m.current_track = 0
+            m.add_response(response)
+
+        # Assertions
+        self.assertEqual(m.next_track()[0], 1)
+
+
+    def test_add_response_requires_track(self):
+        m = self._make('random')
+        with self.assertRaises(RuntimeError):
+            m.add_response(1)
+
+
+    def test_bad_schedule(self):
+        with self.assertRaises(ValueError):
+            self._make('alphabetical')
+
+
+    def test_tracks_match_separate_staircases(self):
+        """ Each interleaved track must follow its own Staircase.
+        """
+        m = self._make('random')
+        rng = np.random.default_rng(3)
+        responses = {0: [], 1: []}
+        while not m.finished:
+            track, level = m.next_track()
+            response = 1 if rng.random() < 0.7 else -1
+            responses[track].append(response)
+            m.add_response(response)
+
+        for track, start_val in enumerate([70, 30]):
+            s = staircase.Staircase(**dict(self.params, start_val=start_val))
+            for response in responses[track]:
+                s.add_response(response)
+            status = m.status(track)
+
+            # Assertions
+            self.assertTrue(status['finished'])
+            self.assertEqual(status['trials'], len(s.levels))
+            self.assertEqual(status['reversals'], len(s.reversals))
+            self.assertEqual(status['level'], s.current_level)
+            self.assertAlmostEqual(status['threshold'],
+                                   s.threshold(last=None, phase=1)[0])
+        self.assertIsNone(m.next_track())
@@ -0,0 +1,91 @@
+""" Unit tests for the live track plot.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+from unittest import mock
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import staircase
+from views import live_plot
+
+
+#########
+# Begin #
+#########
+class TestLiveTrackPlot(TestCase):
+    def setUp(self):
+        """ Create Staircase and an off-screen live plot.
+        """
+        self.s = staircase.Staircase(
+            start_val=60,
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=100,
+            nReversals=50,
+            rapid_descend=False,
+            min_val=50,
+            max_val=80
+        )
+        self.plot = live_plot.LiveTrackPlot(self.s, n_trials=8)
+
+
+    def tearDown(self):
+        del self.plot
+        del self.s
+
+
+    def _image(self):
+        return np.asarray(self.plot.canvas.buffer_rgba()).copy()
+
+
+    def test_trials_are_blitted_without_full_redraw(self):
+        before = self._image()
+        with mock.patch.object(self.plot.canvas, 'draw') as draw:
+            for response in [1, 1, -1]:
+                self.s.add_response(response)
+
+        # Assertions
+        draw.assert_not_called()
+        self.assertFalse(np.array_equal(before, self._image()))
+        self.assertEqual(self.plot._last, (2, 52))
+
+
+    def test_full_redraws_double_x_axis(self):
+        with mock.patch.object(self.plot, 'redraw',
+                               wraps=self.plot.redraw) as redraw:
+            for response in [1, -1] * 20:
+                self.s.add_response(response)
+
+        # Assertions
+        self.assertEqual(redraw.call_count, 3)
+        self.assertEqual(self.plot.ax.get_xlim()[1], 64)
+        np.testing.assert_array_equal(self.plot._track.get_xdata(),
+                                      np.arange(33))
+
+
+    def test_redraw_matches_incremental_image(self):
+        empty = self._image()
+        for response in [1, 1, -1, 1]:
+            self.s.add_response(response)
+        incremental = self._image()
+        self.plot.redraw()
+        full = self._image()
+
+        # Assertions
+        # Only dash phase and marker stacking order may differ
+        changed = np.any(incremental != empty, axis=2).mean()
+        differs = np.any(incremental != full, axis=2).mean()
+        self.assertLess(differs, 0.01)
+        self.assertLess(differs, changed / 2)
@@ -0,0 +1,149 @@
+""" Unit tests for runtime metrics.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import asyncio
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import staircase
+from models.metrics import Metrics
+from models.server import SessionClient, SessionServer
+
+
+#########
+# Begin #
+#########
+class TestMetrics(TestCase):
+    def setUp(self):
+        """ Create Staircase and responses that reach both limits.
+        """
+        self.config = dict(start_val=60, step_sizes=[8,4], nUp=1, nDown=2,
+                           nTrials=400, nReversals=1000, rapid_descend=False,
+                           min_val=45, max_val=80)
+        self.s = staircase.Staircase(**self.config)
+        rng = np.random.default_rng(0)
+        self.responses = np.where(rng.random(300) < 0.7, 1, -1).tolist()
+
+
+    def test_counters_and_timers(self):
+        metrics = self.s.enable_metrics()
+        for response in self.responses:
+            self.s.add_response(response)
+        snapshot = metrics.snapshot()
+        counters, timers = snapshot['counters'], snapshot['timers']
+
+        # Assertions
+        self.assertEqual(counters['trials'], 300)
+        self.assertEqual(counters['reversals'], len(self.s.dw.reversal_rows()))
+        self.assertGreater(counters['clamp_min'], 0)
+        self.assertGreater(counters['clamp_max'], 0)
+        self.assertIn(45, self.s.levels)
+        self.assertIn(80, self.s.levels)
+        self.assertEqual(timers['add_response']['count'], 300)
+        self.assertEqual(timers['calc_level']['count'], 300)
+        self.assertEqual(sum(timers['add_response']['buckets'].values()), 300)
+        self.assertGreater(timers['dw_grow']['count'], 0)
+        self.assertLessEqual(timers['calc_level']['total'],
+                             timers['add_response']['total'])
+
+
+    def test_disable(self):
+        """ Disabled staircases run the plain class methods and
+            record nothing.
+        """
+        metrics = self.s.enable_metrics()
+        self.s.add_response(1)
+        self.s.disable_metrics()
+        for response in self.responses:
+            self.s.add_response(response)
+
+        # Assertions
+        self.assertEqual(metrics.counters['trials'], 1)
+        self.assertNotIn('_add_trial', vars(self.s))
+        self.assertNotIn('_grow', vars(self.s.dw))
+        self.assertIsNone(self.s._metrics)
+        self.assertIsNone(self.s.dw._metrics)
+
+
+    def test_shared_metrics_and_copies(self):
+        """ Several staircases can record into one Metrics, and
+            copy-on-write copies are counted.
+        """
+        metrics = Metrics()
+        self.s.enable_metrics(metrics)
+        for response in self.responses[:50]:
+            self.s.add_response(response)
+        fork = self.s.fork()
+        fork.enable_metrics(metrics)
+        for response in self.responses[50:60]:
+            fork.add_response(response)
+            self.s.add_response(response)
+
+        # Assertions
+        self.assertEqual(metrics.counters['trials'], 70)
+        self.assertEqual(metrics.counters['dw_copies'], 1)
+
+
+    def test_prometheus(self):
+        metrics = Metrics()
+        metrics.count('trials', 3)
+        metrics.observe('calc_level', 5e-6)
+        metrics.observe('calc_level', 0.5)
+        lines = metrics.to_prometheus().splitlines()
+
+        # Assertions
+        self.assertIn('# TYPE staircase_trials_total counter', lines)
+        self.assertIn('staircase_trials_total 3', lines)
+        self.assertIn('# TYPE staircase_calc_level_seconds histogram', lines)
+        self.assertIn('staircase_calc_level_seconds_bucket{le="1e-05"} 1',
+                      lines)
+        self.assertIn('staircase_calc_level_seconds_bucket{le="+Inf"} 2',
+                      lines)
+        self.assertIn('staircase_calc_level_seconds_count 2', lines)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()['timers']['calc_level']['count'],
+                         0)
+
+
+    def test_server_metrics(self):
+        async def main(root):
+            server = SessionServer(root, metrics=Metrics())
+            host, port = await server.start()
+            client = await SessionClient.connect(host, port)
+            await client.request('create', session='a', config=self.config)
+            for response in self.responses[:20]:
+                await client.request('respond', session='a',
+                                     response=response)
+            snapshot = await client.request('metrics')
+            await client.close()
+
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+            text = await reader.read()
+            writer.close()
+            await server.stop()
+            return snapshot, text
+
+        with tempfile.TemporaryDirectory() as root:
+            snapshot, text = asyncio.run(main(root))
+
+        # Assertions
+        self.assertEqual(snapshot['metrics']['counters']['trials'], 20)
+        self.assertEqual(snapshot['metrics']['counters']['requests'], 22)
+        self.assertIn(b'text/plain', text)
+        self.assertIn(b'staircase_trials_total 20', text)
@@ -0,0 +1,170 @@
+""" Unit tests for simulated observers.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import observers
+from models.batch import BatchStaircase
+from models.staircase import Staircase
+
+
+#########
+# Begin #
+#########
+class TestObservers(TestCase):
+    def setUp(self):
+        """ Many presentations at one level.
+        """
+        self.levels = np.full(200000, 52.0)
+
+
+    def test_rates_match_p_correct(self):
+        """ Response rates agree with the psychometric functions.
+        """
+        library = [
+            observers.LogisticObserver(50, 0.3, lapse_rate=0.05, seed=0),
+            observers.GumbelObserver(50, 3, seed=0),
+            observers.TwoIntervalObserver(50, 1.0, seed=0),
+            observers.TwoIntervalObserver(50, 1.0, bias=0.5, lapse_rate=0.1,
+                                          seed=0),
+        ]
+        for observer in library:
+            rate = np.mean(observer(self.levels) == 1)
+
+            # Assertions
+            self.assertAlmostEqual(rate, observer.p_correct(52.0), delta=0.01)
+
+
+    def test_level_at_inverts_p_correct(self):
+        library = [
+            observers.LogisticObserver(50, 0.3),
+            observers.GumbelObserver(50, 3, lapse_rate=0.02),
+            observers.TwoIntervalObserver(50, 1.5, lapse_rate=0.02),
+            observers.AttentionLapseObserver(
+                observers.LogisticObserver(50, 0.3), p_lapse=0.05,
+                mean_duration=3),
+        ]
+        for observer in library:
+            p = float(observer.p_correct(55.0))
+
+            # Assertions
+            self.assertAlmostEqual(observer.level_at(p), 55.0)
+            self.assertTrue(np.isnan(observer.level_at(0.2)))
+
+
+    def test_seeded_and_split_calls(self):
+        """ A seed fixes the responses, whether levels come one at a
+            time or all at once.
+        """
+        levels = np.linspace(40, 60, 500)
+        batch = observers.LogisticObserver(50, 0.3, seed=4)(levels)
+        single = observers.LogisticObserver(50, 0.3, seed=4)
+        one_by_one = [single(level) for level in levels.tolist()]
+
+        # Assertions
+        np.testing.assert_array_equal(batch, one_by_one)
+        self.assertIn(single(50.0), (1, -1))
+
+
+    def test_two_interval_intervals(self):
+        observer = observers.TwoIntervalObserver(50, 1.0, seed=1)
+        stimulus, chosen = observer.intervals(np.full(10000, 90.0))
+
+        # Assertions
+        self.assertEqual(set(np.unique(stimulus)), {1, 2})
+        self.assertAlmostEqual(np.mean(stimulus == 1), 0.5, delta=0.02)
+        np.testing.assert_array_equal(stimulus, chosen)
+
+
+    def test_fatigue_drift(self):
+        """ The threshold rises by drift per trial, per call or per
+            sequence.
+        """
+        observer = observers.FatigueObserver(
+            observers.LogisticObserver(50, 0.3, seed=2), drift=0.05)
+        for _ in range(40):
+            observer(50.0)
+        p_call = observer.p_correct(52.0)
+        observer.reset()
+        responses = observer.sequence(np.full(2000, 50.0))
+
+        # Assertions
+        self.assertEqual(observer.trial, 2000)
+        self.assertAlmostEqual(p_call, 0.75)
+        self.assertAlmostEqual(observer.level_at(0.75), 150.0)
+        self.assertGreater(np.mean(responses[:200] == 1),
+                           np.mean(responses[1000:] == 1) + 0.05)
+
+
+    def test_attention_lapses(self):
+        """ Lapses come in bouts of the requested mean length, at the
+            rate p_correct predicts, both trial by trial and in
+            sequences.
+        """
+        observer = observers.AttentionLapseObserver(
+            observers.LogisticObserver(50, 0.3, seed=3), p_lapse=0.05,
+            mean_duration=5)
+        sequence = observer.sequence(np.full(200000, 90.0))
+        observer.reset()
+        batch = np.array([observer(np.full(500, 90.0)) for _ in range(400)])
+        errors = np.flatnonzero(sequence == -1)
+
+        # Assertions
+        expected = observer.p_correct(90.0)
+        self.assertAlmostEqual(np.mean(sequence == 1), expected, delta=0.01)
+        self.assertAlmostEqual(np.mean(batch == 1), expected, delta=0.01)
+        # Errors cluster: neighbouring trials of an error are errors
+        # more often than chance
+        neighbours = np.mean(sequence[errors[:-1] + 1] == -1)
+        self.assertGreater(neighbours, 2 * np.mean(sequence == -1))
+
+
+    def test_wrappers_compose(self):
+        """ Wrappers see the guess_rate and lapse_rate of the
+            observer they wrap, however deeply it is wrapped.
+        """
+        base = observers.LogisticObserver(50, 0.3, guess_rate=0.5,
+                                          lapse_rate=0.02, seed=7)
+        observer = observers.AttentionLapseObserver(
+            observers.FatigueObserver(base, drift=1e-4), p_lapse=0.05,
+            mean_duration=3)
+        single = np.array([observer(90.0) for _ in range(100)])
+        sequence = observer.sequence(np.full(20000, 90.0))
+
+        # Assertions
+        self.assertEqual(observer.guess_rate, 0.5)
+        self.assertEqual(observer.lapse_rate, 0.02)
+        self.assertEqual(observer.observer.guess_rate, 0.5)
+        self.assertTrue(np.isin(single, [1, -1]).all())
+        # Lapsed trials are correct with the base guess_rate
+        self.assertAlmostEqual(np.mean(sequence == 1),
+                               observer.p_correct(90.0), delta=0.01)
+
+
+    def test_drives_staircases(self):
+        observer = observers.AttentionLapseObserver(
+            observers.GumbelObserver(50, 3, seed=5), p_lapse=0.02)
+        s = Staircase(start_val=70, step_sizes=[4, 2], nUp=1, nDown=2,
+                      nTrials=60, nReversals=4, rapid_descend=False,
+                      min_val=20, max_val=90)
+        s.run(observer)
+        b = BatchStaircase(50, start_val=70, step_sizes=[4, 2], nUp=1,
+                           nDown=2, nTrials=60, nReversals=4,
+                           rapid_descend=False, min_val=20, max_val=90)
+        levels, _, _ = b.run(observers.TwoIntervalObserver(50, seed=6))
+
+        # Assertions
+        self.assertTrue(s.finished)
+        self.assertEqual(levels.shape[1], 50)
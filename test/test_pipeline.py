@@ -0,0 +1,127 @@
+""" Unit tests for the asyncio session pipeline.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import asyncio
+import threading
+import tkinter as tk
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import pipeline
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class FakeRoot:
+    """ Stand-in for a Tk window that submits queued clicks on
+        update() and closes after a set number of updates.
+    """
+    def __init__(self, session, clicks, n_updates):
+        self.session = session
+        self.clicks = list(clicks)
+        self.n_updates = n_updates
+
+
+    def update(self):
+        self.n_updates -= 1
+        if self.n_updates < 0:
+            raise tk.TclError("application has been destroyed")
+        if self.clicks:
+            self.session.submit(self.clicks.pop(0))
+
+
+class TestSessionPipeline(TestCase):
+    def setUp(self):
+        """ Create Staircase.
+        """
+        self.s = staircase.Staircase(
+            start_val=60,
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=10,
+            nReversals=1,
+            rapid_descend=False,
+            min_val=50,
+            max_val=80
+        )
+
+
+    def tearDown(self):
+        del self.s
+
+
+    def test_stages_receive_events_in_order(self):
+        persisted, displayed, threads = [], [], set()
+
+        def persist(event):
+            threads.add(threading.get_ident())
+            persisted.append(event)
+
+        session = pipeline.SessionPipeline(
+            self.s, persist=[persist], display=[displayed.append])
+
+        async def main():
+            for response in [1, 1, -1, 1]:
+                session.submit(response)
+            session.stop()
+            await session.run()
+
+        asyncio.run(main())
+
+        # Assertions
+        self.assertEqual([e['trial_number'] for e in persisted], [0, 1, 2, 3])
+        self.assertEqual(persisted, displayed)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(self.s.levels, [60, 60, 52, 56])
+        self.assertEqual(self.s._listeners, [])
+        self.assertFalse(
+            np.isnan(self.s.dw.column('response_time')).any())
+
+
+    def test_session_ends_when_staircase_finishes(self):
+        displayed = []
+        session = pipeline.SessionPipeline(self.s, display=[displayed.append])
+
+        async def main():
+            for response in [1, 1, -1, 1, 1, 1]:
+                session.submit(response)
+            await session.run()
+
+        asyncio.run(main())
+
+        # Assertions
+        self.assertTrue(self.s.finished)
+        self.assertEqual(displayed[-1]['event'], 'finished')
+        self.assertEqual(len(self.s.levels), 5)
+
+
+    def test_pump_tk_drives_ui_callbacks(self):
+        session = pipeline.SessionPipeline(self.s)
+        root = FakeRoot(session, clicks=[1, 1, -1], n_updates=10)
+
+        async def main():
+            await asyncio.gather(
+                session.run(),
+                pipeline.pump_tk(root, interval=0, on_close=session.stop)
+            )
+
+        asyncio.run(main())
+
+        # Assertions
+        self.assertEqual(self.s.levels, [60, 60, 52])
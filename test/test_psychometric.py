@@ -0,0 +1,157 @@
+""" Unit tests for psychometric function fitting.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import psychometric
+from models.observers import GumbelObserver, LogisticObserver
+from models.staircase import Staircase
+
+
+#########
+# Begin #
+#########
+class TestPsychometric(TestCase):
+    def setUp(self):
+        """ Simulate many trials from a known observer.
+        """
+        rng = np.random.default_rng(0)
+        self.observer = LogisticObserver(threshold=50, slope=0.3, seed=1)
+        self.levels = rng.integers(30, 71, 2000).astype(float)
+        self.responses = self.observer(self.levels)
+
+
+    def test_bin_trials(self):
+        """ Trials collapse to counts per unique level, skipping
+            invalid responses.
+        """
+        levels, n, k = psychometric.bin_trials(
+            [40, 50, 40, 50, 60], [1, -1, -1, 0, 1])
+
+        # Assertions
+        np.testing.assert_array_equal(levels, [40, 50, 60])
+        np.testing.assert_array_equal(n, [2, 1, 1])
+        np.testing.assert_array_equal(k, [1, 0, 1])
+
+
+    def test_logistic_recovers_parameters(self):
+        """ Threshold and slope are recovered within their CIs.
+        """
+        result = psychometric.fit(self.levels, self.responses)
+
+        # Assertions
+        self.assertTrue(result['converged'])
+        self.assertEqual(result['n_trials'], 2000)
+        self.assertLess(result['threshold_ci'][0], 50)
+        self.assertGreater(result['threshold_ci'][1], 50)
+        self.assertLess(result['slope_ci'][0], 0.3)
+        self.assertGreater(result['slope_ci'][1], 0.3)
+
+
+    def test_binned_likelihood_matches_per_trial(self):
+        """ The binned likelihood equals the sum over single trials.
+        """
+        levels, n, k = psychometric.bin_trials(self.levels, self.responses)
+        params = np.array([48, np.log(0.25)])
+        binned = psychometric._nll(params, levels, n, k, 0.5, 0.0, False,
+                                   'logistic')
+        p = psychometric.psychometric(self.levels, 48, 0.25)
+        per_trial = -np.sum(np.where(self.responses == 1,
+                                     np.log(p), np.log(1 - p)))
+
+        # Assertions
+        self.assertAlmostEqual(binned, per_trial, places=6)
+
+
+    def test_fit_lapse(self):
+        """ A fitted lapse rate stays within bounds.
+        """
+        result = psychometric.fit(self.levels, self.responses, fit_lapse=True)
+
+        # Assertions
+        self.assertGreaterEqual(result['lapse_rate'], 0)
+        self.assertLessEqual(result['lapse_rate'], psychometric.MAX_LAPSE)
+        self.assertAlmostEqual(result['threshold'], 50, delta=2)
+
+
+    def test_weibull(self):
+        """ Weibull fits place threshold near the logistic midpoint
+            and reject non-positive levels.
+        """
+        result = psychometric.fit(self.levels, self.responses,
+                                  function='weibull')
+
+        # Assertions
+        self.assertAlmostEqual(result['threshold'], 52, delta=3)
+        with self.assertRaises(ValueError):
+            psychometric.fit([-5, 5], [1, -1], function='weibull')
+
+
+    def test_gumbel_matches_observer(self):
+        """ Gumbel fits recover a GumbelObserver's threshold and
+            slope, including at negative levels.
+        """
+        rng = np.random.default_rng(2)
+        observer = GumbelObserver(threshold=-10, slope=3, seed=3)
+        levels = rng.integers(-30, 11, 4000).astype(float)
+        result = psychometric.fit(levels, observer(levels),
+                                  function='gumbel')
+
+        # Assertions
+        np.testing.assert_allclose(
+            psychometric.psychometric(levels, -10, 3, function='gumbel'),
+            observer.p_correct(levels))
+        self.assertLess(result['threshold_ci'][0], -10)
+        self.assertGreater(result['threshold_ci'][1], -10)
+        self.assertLess(result['slope_ci'][0], 3)
+        self.assertGreater(result['slope_ci'][1], 3)
+
+
+    def test_too_few_levels(self):
+        """ A single level cannot be fitted.
+        """
+        # Assertions
+        with self.assertRaises(ValueError):
+            psychometric.fit([50, 50], [1, -1])
+
+
+    def test_fit_staircase(self):
+        """ A completed track can be fitted directly.
+        """
+        s = Staircase(start_val=70, step_sizes=[4,2], nUp=1, nDown=2,
+                      nTrials=200, nReversals=50, rapid_descend=False,
+                      min_val=20, max_val=90)
+        s.run(self.observer)
+        result = psychometric.fit_staircase(s)
+
+        # Assertions
+        self.assertEqual(result['n_trials'], 200)
+        self.assertAlmostEqual(result['threshold'], 50, delta=6)
+
+
+    def test_fit_many(self):
+        """ Warm-started fits match cold fits; unfittable sessions
+            give None.
+        """
+        sessions = [(self.levels[i:i + 200], self.responses[i:i + 200])
+                    for i in range(0, 2000, 200)]
+        sessions.append(([50], [1]))
+        warm = psychometric.fit_many(sessions)
+        cold = psychometric.fit_many(sessions, warm_start=False)
+
+        # Assertions
+        self.assertIsNone(warm[-1])
+        for w, c in zip(warm[:-1], cold[:-1]):
+            self.assertAlmostEqual(w['threshold'], c['threshold'], delta=0.1)
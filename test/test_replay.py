@@ -0,0 +1,135 @@
+""" Unit tests for replaying response sequences.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import os
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models import session
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestReplay(TestCase):
+    def setUp(self):
+        """ Random responses, including invalid ones, and a
+            reference Staircase that received them.
+        """
+        self.config = dict(start_val=60, step_sizes=[8,4,2], nUp=1, nDown=2,
+                           nTrials=150, nReversals=4, rapid_descend=False,
+                           min_val=30, max_val=80)
+        rng = np.random.default_rng(0)
+        self.responses = rng.choice([1, -1, 0], size=200, p=[0.65, 0.3, 0.05])
+        self.s = staircase.Staircase(**self.config)
+        for response in self.responses.tolist():
+            self.s.add_response(response)
+
+
+    def test_replay_matches_staircase(self):
+        """ Replayed columns and state equal the Staircase's.
+        """
+        columns, state = replay.replay(self.config, self.responses)
+
+        # Assertions
+        for name, values in columns.items():
+            np.testing.assert_array_equal(values, self.s.dw.column(name))
+        for name, value in state.items():
+            self.assertEqual(value, getattr(self.s, name), name)
+
+
+    def test_replay_stops_when_finished(self):
+        """ Responses after the staircase finishes are ignored.
+        """
+        columns, state = replay.replay(self.config, [1] * 500)
+
+        # Assertions
+        self.assertEqual(len(columns['level']), self.config['nTrials'])
+        self.assertEqual(state['_trial_num'], self.config['nTrials'])
+
+
+    def test_to_staircase(self):
+        """ A rebuilt Staircase continues like the original.
+        """
+        s = replay.to_staircase(self.config, self.responses[:60])
+        reference = staircase.Staircase(**self.config)
+        for response in self.responses[:60].tolist():
+            reference.add_response(response)
+        for response in (1, 1, -1, 1, 1, 1):
+            s.add_response(response)
+            reference.add_response(response)
+
+        # Assertions
+        np.testing.assert_array_equal(s.dw.column('level'),
+                                      reference.dw.column('level'))
+        self.assertEqual(s.reversals, reference.reversals)
+        self.assertEqual(s.threshold(), reference.threshold())
+
+
+    def test_extend(self):
+        """ Bulk-loaded rows are indexed.
+        """
+        dw = staircase.DataWrangler(capacity=2)
+        dw.extend({'level': [50, 46, 50], 'response': [1, -1, 1],
+                   'reversal': [False, True, True]})
+
+        # Assertions
+        self.assertEqual(len(dw), 3)
+        np.testing.assert_array_equal(dw.correct_rows(), [0, 2])
+        np.testing.assert_array_equal(dw.reversal_levels(), [46, 50])
+        self.assertEqual(dw.reversal_stats(0, 2)[1], 48)
+
+
+    def test_verify(self):
+        """ Stored trajectories are confirmed, and tampering is
+            located.
+        """
+        columns = {name: self.s.dw.column(name).copy()
+                   for name in ('level', 'response', 'reversal')}
+        report = replay.verify(self.config, columns)
+
+        # Assertions
+        self.assertTrue(report['match'])
+        self.assertIsNone(report['level_mismatch'])
+
+        columns['level'][10] += 1
+        columns['reversal'][20] = not columns['reversal'][20]
+        report = replay.verify(self.config, columns)
+
+        # Assertions
+        self.assertFalse(report['match'])
+        self.assertEqual(report['level_mismatch'], 10)
+        self.assertEqual(report['reversal_mismatch'], 20)
+
+
+    def test_verify_session(self):
+        """ Session files can be verified directly.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'session.jsonl')
+            s = staircase.Staircase(**self.config)
+            writer = session.SessionWriter(s, path)
+            for response in self.responses[:40].tolist():
+                s.add_response(response)
+            writer.close()
+            report = replay.verify_session(path)
+
+        # Assertions
+        self.assertTrue(report['match'])
+        self.assertEqual(report['n_trials'], 40)
@@ -0,0 +1,130 @@
+""" Unit tests for compiled up-down rules.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import batch
+from models import replay
+from models import rules
+from models import staircase
+
+
+#########
+# Begin #
+#########
+def _staircase(nUp=1, nDown=2, rapid_descend=False):
+    return staircase.Staircase(
+        start_val=60, step_sizes=[4], nUp=nUp, nDown=nDown, nTrials=100,
+        nReversals=100, rapid_descend=rapid_descend, min_val=0, max_val=100)
+
+
+class TestRules(TestCase):
+    def test_tables_are_small_and_cached(self):
+        """ Tables grow with nUp * nDown and are compiled once.
+        """
+        table = rules.compile_rule(2, 3, True)
+
+        # Assertions
+        self.assertIs(table, rules.compile_rule(2, 3, True))
+        self.assertLessEqual(len(table), 3 * 2 * 3 * 2)
+        self.assertEqual(table.next_state.shape, (len(table), 2))
+        with self.assertRaises(ValueError):
+            rules.compile_rule(0, 2, False)
+
+
+    def test_nUp_honored(self):
+        """ 2-up 1-down: two consecutive incorrect responses step up.
+        """
+        s = _staircase(nUp=2, nDown=1)
+        for response in [-1, 1, -1, -1, 1]:
+            s.add_response(response)
+
+        # Assertions
+        self.assertEqual(s.levels, [60, 60, 56, 56, 60])
+        self.assertEqual(s.current_level, 56)
+        self.assertEqual(list(s.reversals), [3, 4])
+
+
+    def test_rapid_descend(self):
+        """ Each correct response steps down until the first
+            reversal, then nDown correct are needed.
+        """
+        s = _staircase(nDown=2, rapid_descend=True)
+        for response in [1, 1, 1, -1, 1, 1, 1]:
+            s.add_response(response)
+
+        # Assertions
+        self.assertEqual(s.levels, [60, 56, 52, 48, 52, 52, 48])
+        self.assertEqual(list(s.reversals), [3, 5])
+
+
+    def test_rapid_descend_after_initial_incorrect(self):
+        """ A first step up followed by a step down is the first
+            reversal.
+        """
+        s = _staircase(nDown=3, rapid_descend=True)
+        for response in [-1, 1, 1, 1]:
+            s.add_response(response)
+
+        # Assertions
+        self.assertEqual(s.levels, [60, 64, 60, 60])
+        self.assertEqual(list(s.reversals), [1])
+
+
+    def test_batch_and_replay_match_staircase(self):
+        """ Mixed rules in one batch, and replays, reproduce the
+            scalar Staircase.
+        """
+        rng = np.random.default_rng(4)
+        nUp = np.array([1, 2, 3, 1, 2])
+        nDown = np.array([3, 1, 2, 2, 2])
+        rapid = np.array([True, False, True, False, True])
+        responses = rng.choice([1, -1], size=(80, 5), p=[0.6, 0.4])
+        b = batch.BatchStaircase(
+            n=5, start_val=60, step_sizes=[8, 4], nUp=nUp, nDown=nDown,
+            nTrials=80, nReversals=3, rapid_descend=rapid, min_val=0,
+            max_val=100)
+        trial = iter(responses)
+        levels, _, reversals = b.run(lambda levels: next(trial))
+
+        for run in range(5):
+            config = dict(start_val=60, step_sizes=[8, 4],
+                          nUp=int(nUp[run]), nDown=int(nDown[run]),
+                          nTrials=80, nReversals=3,
+                          rapid_descend=bool(rapid[run]), min_val=0,
+                          max_val=100)
+            s = staircase.Staircase(**config)
+            for response in responses[:, run].tolist():
+                s.add_response(response)
+            n = len(s.levels)
+            columns, _ = replay.replay(config, responses[:, run])
+
+            # Assertions
+            np.testing.assert_array_equal(levels[:n, run], s.levels)
+            self.assertEqual(list(np.flatnonzero(reversals[:, run])),
+                             list(s.reversals))
+            np.testing.assert_array_equal(columns['level'], s.levels)
+
+
+    def test_convergence_point(self):
+        """ Targets match the known values for transformed rules.
+        """
+        # Assertions
+        self.assertAlmostEqual(rules.convergence_point(1, 2), 0.5 ** 0.5)
+        self.assertAlmostEqual(rules.convergence_point(1, 3),
+                               0.5 ** (1 / 3))
+        self.assertAlmostEqual(rules.convergence_point(2, 1),
+                               1 - 0.5 ** 0.5)
+        self.assertAlmostEqual(rules.convergence_point(2, 2), 0.5)
@@ -0,0 +1,307 @@
+""" Unit tests for the multi-session server.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import asyncio
+import json
+import os
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models import session
+from models.metrics import Metrics
+from models.server import SessionClient, SessionServer
+
+
+#########
+# Begin #
+#########
+class TestSessionServer(TestCase):
+    def setUp(self):
+        """ A temporary session directory, a configuration and
+            responses for several participants.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = dict(start_val=60, step_sizes=[8,4], nUp=1, nDown=2,
+                           nTrials=40, nReversals=6, rapid_descend=False,
+                           min_val=30, max_val=80)
+        rng = np.random.default_rng(0)
+        self.responses = {
+            f"booth{i}": rng.choice([1, -1], size=30, p=[0.7, 0.3]).tolist()
+            for i in range(8)
+        }
+
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+    def serve(self, client_main, **kwargs):
+        """ Run a server on a free localhost port while client_main
+            talks to it; return client_main's result.
+        """
+        async def main():
+            server = SessionServer(self.tmp.name, port=0, **kwargs)
+            host, port = await server.start()
+            try:
+                return await client_main(server, host, port)
+            finally:
+                await server.stop()
+        return asyncio.run(main())
+
+
+    def test_concurrent_sessions(self):
+        """ Interleaved participants on separate connections each
+            follow their own track, and every trial is persisted.
+        """
+        async def participant(host, port, name, responses):
+            client = await SessionClient.connect(host, port)
+            created = await client.request('create', session=name,
+                                           config=self.config)
+            levels = [created['level']]
+            for response in responses:
+                reply = await client.request('respond', session=name,
+                                             response=response)
+                levels.append(reply['level'])
+            closed = await client.request('close', session=name)
+            await client.close()
+            return levels, closed
+
+        async def client_main(server, host, port):
+            return await asyncio.gather(*(
+                participant(host, port, name, responses)
+                for name, responses in self.responses.items()))
+
+        results = self.serve(client_main, batch_size=16)
+
+        for (levels, closed), (name, responses) in zip(
+                results, self.responses.items()):
+            expected = replay.to_staircase(self.config, responses)
+            config, columns = session.load_session(
+                os.path.join(self.tmp.name, name + '.jsonl'))
+
+            # Assertions
+            self.assertTrue(closed['ok'])
+            self.assertEqual(levels[:-1], expected.levels)
+            self.assertEqual(levels[-1], expected.current_level)
+            self.assertEqual(config, self.config)
+            self.assertEqual(columns['level'].tolist(), expected.levels)
+
+
+    def test_pipelined_requests(self):
+        """ Many requests written before reading any reply are
+            answered in order.
+        """
+        name, responses = 'booth0', self.responses['booth0']
+
+        async def client_main(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            requests = [{'op': 'create', 'session': name,
+                         'config': self.config}]
+            requests += [{'op': 'respond', 'session': name, 'response': r}
+                         for r in responses]
+            writer.write(b''.join(json.dumps(r).encode() + b'\n'
+                                  for r in requests))
+            replies = [json.loads(await reader.readline())
+                       for _ in requests]
+            writer.close()
+            return replies
+
+        replies = self.serve(client_main)
+        expected = replay.to_staircase(self.config, responses)
+
+        # Assertions
+        self.assertTrue(all(reply['ok'] for reply in replies))
+        self.assertEqual([r['trial_number'] for r in replies[1:]],
+                         list(range(1, len(responses) + 1)))
+        self.assertEqual(replies[-1]['level'], expected.current_level)
+
+
+    def test_http(self):
+        async def post(reader, writer, path, body):
+            data = json.dumps(body).encode()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode() +
+                         data)
+            status = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b'\r\n':
+                key, _, value = line.decode().partition(':')
+                headers[key.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            return status, json.loads(body)
+
+        async def client_main(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            replies = [
+                await post(reader, writer, '/create',
+                           {'session': 'tablet', 'config': self.config}),
+                await post(reader, writer, '/respond',
+                           {'session': 'tablet', 'response': 1}),
+                await post(reader, writer, '/status', {'session': 'nobody'}),
+            ]
+            writer.close()
+            return replies
+
+        replies = self.serve(client_main)
+
+        # Assertions
+        self.assertIn(b'200 OK', replies[0][0])
+        self.assertEqual(replies[1][1]['trial_number'], 1)
+        self.assertIn(b'400', replies[2][0])
+        self.assertFalse(replies[2][1]['ok'])
+
+
+    def test_errors(self):
+        async def client_main(server, host, port):
+            client = await SessionClient.connect(host, port)
+            replies = [
+                await client.request('respond', session='x', response=1),
+                await client.request('create', session='../x',
+                                     config=self.config),
+                await client.request('create', config={'start_val': 1}),
+                await client.request('create', config=dict(
+                    self.config, nTrials=10**6)),
+                await client.request('jump'),
+            ]
+            created = await client.request('create', config=self.config)
+            replies.append(await client.request(
+                'respond', session=created['session'], response=0))
+            replies += [
+                await client.request('create', config=dict(
+                    self.config, nDown=0)),
+                await client.request('create', config=dict(
+                    self.config, step_sizes=[])),
+            ]
+            # Failures inside the staircase are reported as well
+            broken = await client.request('create', config=dict(
+                self.config, step_sizes=[None]))
+            replies.append(await client.request(
+                'respond', session=broken['session'], response=-1))
+            status = await client.request('status',
+                                          session=created['session'])
+            await client.close()
+            return replies, status
+
+        replies, status = self.serve(client_main, max_trials=1000)
+
+        # Assertions
+        self.assertFalse(any(reply['ok'] for reply in replies))
+        self.assertIn('Unknown session', replies[0]['error'])
+        self.assertIn('Invalid session ID', replies[1]['error'])
+        self.assertIn('limited', replies[3]['error'])
+        self.assertIn('Invalid config', replies[6]['error'])
+        self.assertIn('step_sizes', replies[7]['error'])
+        self.assertIn('TypeError', replies[8]['error'])
+        self.assertTrue(status['ok'])
+
+
+    def test_respond_during_close(self):
+        """ A respond racing a close is rejected, and a file that
+            cannot be written does not stop the others being
+            persisted.
+        """
+        async def client_main(server, host, port):
+            for name in ('a', 'b'):
+                await server.handle({'op': 'create', 'session': name,
+                                     'config': self.config})
+            await server.handle({'op': 'respond', 'session': 'a',
+                                 'response': 1})
+            closed, late = await asyncio.gather(
+                server.handle({'op': 'close', 'session': 'a'}),
+                server.handle({'op': 'respond', 'session': 'a',
+                               'response': 1}))
+            # A session file that fails underneath the server
+            await server.handle({'op': 'create', 'session': 'c',
+                                 'config': self.config})
+            await server.handle({'op': 'respond', 'session': 'c',
+                                 'response': 1})
+            server.sessions['c'][1]._format.close()
+            for response in self.responses['booth0'][:5]:
+                await server.handle({'op': 'respond', 'session': 'b',
+                                     'response': response})
+            server._flush_requested.set()
+            await asyncio.sleep(0.1)
+            task = server._flush_task
+            del server.sessions['c']
+            return closed, late, task.done(), server.persist_errors
+
+        closed, late, stopped, errors = self.serve(
+            client_main, flush_interval=0.05, metrics=Metrics())
+        _, columns = session.load_session(
+            os.path.join(self.tmp.name, 'b.jsonl'))
+        _, closed_columns = session.load_session(
+            os.path.join(self.tmp.name, 'a.jsonl'))
+
+        # Assertions
+        self.assertTrue(closed['ok'])
+        self.assertFalse(late['ok'])
+        self.assertIn('Unknown session', late['error'])
+        self.assertEqual(len(closed_columns['level']), 1)
+        self.assertFalse(stopped)
+        self.assertEqual(errors, 1)
+        self.assertEqual(len(columns['level']), 5)
+
+
+    def test_resume_after_restart(self):
+        """ A session reopened under the same ID continues from its
+            file.
+        """
+        name, responses = 'booth1', self.responses['booth1']
+
+        async def first(server, host, port):
+            await server.handle({'op': 'create', 'session': name,
+                                 'config': self.config})
+            for response in responses[:12]:
+                await server.handle({'op': 'respond', 'session': name,
+                                     'response': response})
+
+        async def second(server, host, port):
+            created = await server.handle({'op': 'create', 'session': name})
+            for response in responses[12:]:
+                reply = await server.handle({'op': 'respond', 'session': name,
+                                             'response': response})
+            return created, reply
+
+        self.serve(first)
+        created, reply = self.serve(second)
+        expected = replay.to_staircase(self.config, responses)
+
+        # Assertions
+        self.assertTrue(created['resumed'])
+        self.assertEqual(created['trial_number'], 12)
+        self.assertEqual(reply['level'], expected.current_level)
+
+
+    def test_pending_events_are_bounded(self):
+        name, responses = 'booth2', self.responses['booth2']
+
+        async def client_main(server, host, port):
+            await server.handle({'op': 'create', 'session': name,
+                                 'config': self.config})
+            most = 0
+            for response in responses:
+                await server.handle({'op': 'respond', 'session': name,
+                                     'response': response})
+                most = max(most, server._n_pending)
+            return most
+
+        most = self.serve(client_main, batch_size=10**6, flush_interval=60,
+                          max_pending=5)
+
+        # Assertions
+        self.assertLessEqual(most, 5)
@@ -0,0 +1,195 @@
+""" Unit tests for session persistence.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import os
+import tempfile
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models import session
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestSession(TestCase):
+    def setUp(self):
+        """ Create Staircase and a temporary directory.
+        """
+        self.s = staircase.Staircase(
+            start_val=60,
+            step_sizes=[8,4],
+            nUp=1,
+            nDown=2,
+            nTrials=20,
+            nReversals=3,
+            rapid_descend=False,
+            min_val=50,
+            max_val=80
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.responses = [1, 1, -1, 1, 1, 1, -1, -1, 1, 1, 1]
+
+
+    def tearDown(self):
+        del self.s
+        self.tmp.cleanup()
+
+
+    def _write_and_resume(self, name):
+        path = os.path.join(self.tmp.name, name)
+        writer = session.SessionWriter(self.s, path, batch_size=4)
+        for response in self.responses[:6]:
+            self.s.add_response(response)
+        writer.close()
+
+        # Resume and continue the session in the same file
+        resumed = session.resume_staircase(path)
+        writer = session.SessionWriter(resumed, path)
+        for response in self.responses[6:]:
+            resumed.add_response(response)
+        writer.close()
+        return path, resumed
+
+
+    def _assert_matches_uninterrupted(self, path, resumed):
+        s = staircase.Staircase(**self.s.config())
+        for response in self.responses:
+            s.add_response(response)
+        config, columns = session.load_session(path)
+
+        # Assertions
+        self.assertEqual(config, s.config())
+        self.assertEqual(columns['level'].tolist(), s.levels)
+        self.assertEqual(columns['trial_number'].tolist(),
+                         list(range(len(self.responses))))
+        self.assertEqual(resumed.reversals, s.reversals)
+        self.assertEqual(resumed.current_level, s.current_level)
+        self.assertEqual(resumed._step_index, s._step_index)
+
+
+    def test_csv_resume(self):
+        self._assert_matches_uninterrupted(
+            *self._write_and_resume('session.csv'))
+
+
+    def test_jsonl_resume(self):
+        self._assert_matches_uninterrupted(
+            *self._write_and_resume('session.jsonl'))
+
+
+    def test_binary_resume(self):
+        self._assert_matches_uninterrupted(
+            *self._write_and_resume('session'))
+
+
+    def test_batches_written_when_full(self):
+        path = os.path.join(self.tmp.name, 'session.jsonl')
+        writer = session.SessionWriter(self.s, path, batch_size=4)
+        for response in self.responses[:5]:
+            self.s.add_response(response)
+
+        # Assertions
+        _, columns = session.load_session(path)
+        self.assertEqual(len(columns['level']), 4)
+        writer.close()
+        _, columns = session.load_session(path)
+        self.assertEqual(len(columns['level']), 5)
+
+
+    def test_partial_final_record_ignored(self):
+        for name in ['session.csv', 'session.jsonl']:
+            path = os.path.join(self.tmp.name, name)
+            s = staircase.Staircase(**self.s.config())
+            writer = session.SessionWriter(s, path)
+            for response in self.responses[:3]:
+                s.add_response(response)
+            writer.close()
+            with open(path, 'a') as f:
+                f.write('3,60')
+
+            # Assertions
+            _, columns = session.load_session(path)
+            self.assertEqual(len(columns['level']), 3)
+
+        path = os.path.join(self.tmp.name, 'session')
+        writer = session.SessionWriter(self.s, path)
+        for response in self.responses[:3]:
+            self.s.add_response(response)
+        writer.close()
+        with open(os.path.join(path, 'level'), 'ab') as f:
+            np.array([60.0]).tofile(f)
+
+        # Assertions
+        _, columns = session.load_session(path, mmap=True)
+        self.assertEqual(len(columns['level']), 3)
+
+
+    def test_resume_after_partial_record(self):
+        """ A session that crashed mid-record can be resumed,
+            continued and read back.
+        """
+        fragments = {'session.csv': '6,99.0,1', 'session.jsonl': '{"trial_',
+                     'session': None}
+        for name, fragment in fragments.items():
+            path = os.path.join(self.tmp.name, name)
+            s = staircase.Staircase(**self.s.config())
+            writer = session.SessionWriter(s, path)
+            for response in self.responses[:6]:
+                s.add_response(response)
+            writer.close()
+            if fragment is None:
+                with open(os.path.join(path, 'level'), 'ab') as f:
+                    np.array([99.0]).tofile(f)
+                with open(os.path.join(path, 'response'), 'ab') as f:
+                    f.write(b'\x01')
+            else:
+                with open(path, 'a') as f:
+                    f.write(fragment)
+
+            resumed = session.resume_staircase(path)
+            writer = session.SessionWriter(resumed, path)
+            for response in self.responses[6:]:
+                resumed.add_response(response)
+            writer.close()
+            config, columns = session.load_session(path)
+            expected = staircase.Staircase(**config)
+            for response in self.responses:
+                expected.add_response(response)
+
+            # Assertions
+            self.assertEqual(columns['level'].tolist(), expected.levels)
+            self.assertEqual(columns['trial_number'].tolist(),
+                             list(range(len(self.responses))))
+            self.assertTrue(replay.verify_session(path)['match'])
+
+
+    def test_resume_detects_mismatch(self):
+        path = os.path.join(self.tmp.name, 'session.jsonl')
+        writer = session.SessionWriter(self.s, path)
+        for response in self.responses[:4]:
+            self.s.add_response(response)
+        writer.close()
+        with open(path) as f:
+            text = f.read()
+        with open(path, 'w') as f:
+            f.write(text.replace('"start_val": 60', '"start_val": 70'))
+
+        # Assertions
+        with self.assertRaises(ValueError):
+            session.resume_staircase(path)
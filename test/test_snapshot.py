@@ -0,0 +1,215 @@
+""" Unit tests for Staircase snapshots and forks.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import system packages
+import pickle
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import replay
+from models import staircase
+
+
+#########
+# Begin #
+#########
+class TestSnapshot(TestCase):
+    def setUp(self):
+        """ A Staircase part way through a track, and the responses
+            to continue it with.
+        """
+        self.config = dict(start_val=60, step_sizes=[8,4,2], nUp=1, nDown=2,
+                           nTrials=150, nReversals=10, rapid_descend=False,
+                           min_val=30, max_val=80)
+        rng = np.random.default_rng(1)
+        self.responses = rng.choice([1, -1, 0], size=150,
+                                    p=[0.65, 0.3, 0.05]).tolist()
+        self.s = staircase.Staircase(**self.config)
+        for response in self.responses[:60]:
+            self.s.add_response(response)
+
+
+    def continue_track(self, s, responses):
+        for response in responses:
+            s.add_response(response)
+        return s
+
+
+    def test_fork_continues_identically(self):
+        fork = self.s.fork()
+        self.continue_track(self.s, self.responses[60:])
+        self.continue_track(fork, self.responses[60:])
+
+        # Assertions
+        self.assertEqual(fork.levels, self.s.levels)
+        self.assertEqual(fork.reversals, self.s.reversals)
+        self.assertEqual(fork.threshold(), self.s.threshold())
+        self.assertEqual(fork._phase_starts, self.s._phase_starts)
+
+
+    def test_fork_from_earlier_trial(self):
+        fork = self.s.fork(self.s.snapshot(30))
+        self.continue_track(fork, self.responses[30:])
+        reference = replay.to_staircase(self.config, self.responses)
+
+        # Assertions
+        self.assertEqual(fork.levels, reference.levels)
+        self.assertEqual(fork.reversals, reference.reversals)
+
+
+    def test_fork_with_changes(self):
+        fork = self.s.fork(step_sizes=[1])
+        self.continue_track(fork, [-1, -1])
+
+        # Assertions
+        self.assertEqual(fork._step_index, 0)
+        self.assertEqual(fork.dw.column('step_size')[-1], 1)
+        self.assertEqual(len(self.s.levels), 60)
+
+
+    def test_fork_with_new_rule(self):
+        fork = self.s.fork(nUp=2, nDown=3)
+        direction, n_correct, n_incorrect, _ = \
+            self.s._rule.states[self.s._rule_state]
+
+        # Assertions
+        self.assertEqual(fork._rule.states[fork._rule_state][:3],
+                         (direction, n_correct, n_incorrect))
+
+
+    def test_fork_does_not_inherit_later_rows(self):
+        """ Rows a fork adds start unset, not with the parent's
+            later trials.
+        """
+        for row, dp in enumerate(self.s.dw.datapoints):
+            dp.onset_time = 100.0 + row
+            dp.response_time = 100.5 + row
+        fork = self.s.fork(self.s.snapshot(trial=2))
+        fork.add_response(-1)
+
+        # Assertions
+        self.assertTrue(np.isnan(fork.dw.datapoints[2].onset_time))
+        self.assertTrue(np.isnan(fork.dw.datapoints[2].response_time))
+        self.assertEqual(fork.timing_summary()['reaction_time']['count'], 2)
+        self.assertEqual(self.s.dw.datapoints[2].onset_time, 102.0)
+
+
+    def test_phase_thresholds_without_history(self):
+        """ Without history, phases count from the reversals seen
+            since the restore.
+        """
+        config = dict(self.config, nReversals=3)
+        s = staircase.Staircase(**config)
+        for response in self.responses[:6]:
+            s.add_response(response)
+        snap = staircase.StaircaseSnapshot.from_bytes(
+            s.snapshot(history=False).to_bytes())
+        restored = staircase.Staircase.restore(config, snap)
+        self.continue_track(s, self.responses[6:])
+        self.continue_track(restored, self.responses[6:])
+
+        # Assertions
+        self.assertLess(snap.step_index, 2)
+        self.assertEqual(len(restored._phase_starts), 3)
+        np.testing.assert_array_equal(restored.threshold(phase=2),
+                                      s.threshold(phase=2))
+        self.assertEqual(restored.threshold(last=None),
+                         s.threshold(last=None, exclude=snap.n_reversals))
+
+
+    def test_snapshot_of_fork(self):
+        """ Earlier states of a fork are rebuilt under the
+            configuration that recorded each trial, including forks
+            of forks.
+        """
+        fork = self.s.fork(self.s.snapshot(30), step_sizes=[1],
+                           nReversals=40)
+        self.continue_track(fork, self.responses[30:60])
+        branch = fork.fork(fork.snapshot(45), nUp=2, nDown=3)
+        self.continue_track(branch, self.responses[45:70])
+
+        # Assertions
+        for trial in (10, 30, 40, 59):
+            snap = fork.snapshot(trial)
+            self.assertEqual(snap.trial_num, trial)
+            self.assertEqual(snap.level, fork.levels[trial])
+        for trial in (10, 40, 50, 69):
+            self.assertEqual(branch.snapshot(trial).level,
+                             branch.levels[trial])
+        # Continuing from a rebuilt state matches the fork itself
+        again = fork.fork(fork.snapshot(40))
+        self.continue_track(again, self.responses[40:60])
+        self.assertEqual(again.levels, fork.levels)
+
+
+    def test_snapshot_of_restore_without_history(self):
+        """ A staircase restored without history can rebuild states
+            from its own trials only.
+        """
+        snap = staircase.StaircaseSnapshot.from_bytes(
+            self.s.snapshot(20, history=False).to_bytes())
+        restored = staircase.Staircase.restore(self.config, snap)
+        self.continue_track(restored, self.responses[20:60])
+        earlier = restored.snapshot(40)
+
+        # Assertions
+        self.assertEqual(earlier.trial_num, 40)
+        self.assertEqual(earlier.level, self.s.levels[40])
+        self.assertEqual(len(earlier.history), 20)
+        with self.assertRaises(ValueError):
+            restored.snapshot(10)
+
+
+    def test_history_is_copy_on_write(self):
+        levels = self.s.dw.column('level').copy()
+        fork = self.s.fork()
+
+        # Assertions: both share arrays until one writes
+        self.assertIs(fork.dw._data['level'], self.s.dw._data['level'])
+        self.continue_track(fork, self.responses[60:70])
+        np.testing.assert_array_equal(self.s.dw.column('level'), levels)
+        self.assertEqual(len(self.s.dw), 60)
+
+        self.s.dw.datapoints[10].level = -1
+        self.assertNotEqual(fork.dw.datapoints[10].level, -1)
+        self.assertEqual(len(fork.dw.reversal_rows()),
+                         len(fork.reversals))
+
+
+    def test_bytes_round_trip(self):
+        snap = self.s.snapshot()
+        data = snap.to_bytes()
+        fork = staircase.Staircase.restore(
+            self.config, staircase.StaircaseSnapshot.from_bytes(data))
+        self.continue_track(self.s, self.responses[60:])
+        self.continue_track(fork, self.responses[60:])
+
+        # Assertions
+        self.assertLess(len(data), 100)
+        self.assertEqual(fork.levels, self.s.levels[60:])
+        self.assertEqual(fork._n_reversals, self.s._n_reversals)
+        self.assertEqual(fork.finished, self.s.finished)
+
+
+    def test_forks_share_history(self):
+        snap = self.s.snapshot()
+        forks = [self.s.fork(snap) for _ in range(1000)]
+
+        # Assertions
+        self.assertFalse(hasattr(snap, '__dict__'))
+        self.assertTrue(all(fork.dw._data['level'] is
+                            self.s.dw._data['level'] for fork in forks))
+        self.assertEqual(pickle.loads(pickle.dumps(snap)).phase_starts,
+                         snap.phase_starts)
@@ -2,7 +2,7 @@
 
     Written by: Travis M. Moore
     Created: December 13, 2023
-    Last edited: December 14, 2023
+    Last edited: October 16, 2026
 """
 
 ###########
@@ -12,17 +12,55 @@
 from unittest import TestCase
 from unittest import mock
 
+# Import system packages
+import os
+import subprocess
+import sys
+
 # Import data science packages
 import numpy as np
 import pandas as pd
 
 # Import custom modules
+from models import replay
 from models import staircase
 
 
 #########
 # Begin #
 #########
+def _legacy_track(responses, start_val, step_sizes, nDown, min_val, max_val):
+    """ Reference implementation of the original array-matching
+        level and reversal rules, with invalid responses never
+        counted as reversals. Return levels and reversals.
+    """
+    current_level = start_val
+    scores = []
+    level_tracker = []
+    levels = []
+    reversals = {}
+    correct_vals = np.ones(nDown)
+    reversal_1 = np.append(correct_vals, -1)
+    reversal_2 = np.insert(correct_vals, 0, -1)
+    for trial_num, response in enumerate(responses):
+        levels.append(current_level)
+        if response in (1, -1):
+            scores.append(response)
+            level_tracker.append(response)
+            # Only a scored response can complete a reversal
+            if np.array_equal(scores[-(nDown + 1):], reversal_1) or \
+            np.array_equal(scores[-(nDown + 1):], reversal_2):
+                reversals[trial_num] = current_level
+        if np.array_equal(level_tracker, correct_vals):
+            current_level -= step_sizes[0]
+            level_tracker = []
+        elif -1 in level_tracker:
+            current_level += step_sizes[0]
+            level_tracker = []
+        current_level = min(max(current_level, min_val), max_val)
+    return levels, reversals
+
+
 class TestStaircase(TestCase):
     def setUp(self):
         """ Create Staircase.
@@ -35,7 +73,7 @@ class TestStaircase(TestCase):
             nDown=2,
             nTrials=10,
             nReversals=2,
-            rapid_descend=True,
+            rapid_descend=False,
             min_val=50,
             max_val=80
         )
@@ -57,7 +95,7 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s.nDown, 2)
         self.assertEqual(self.s.nTrials, 10)
         self.assertEqual(self.s.nReversals, 2)
-        self.assertEqual(self.s.rapid_descend, True)
+        self.assertEqual(self.s.rapid_descend, False)
         self.assertEqual(self.s.min_val, 50)
         self.assertEqual(self.s.max_val, 80)
 
@@ -76,6 +114,7 @@ class TestStaircase(TestCase):
     def test__handle_response_one_correct(self):
         # Add response to staircase
         response = 1
+        self.s.add_data_point(response)
         self.s._handle_response(response)
 
         # Assertions
@@ -87,37 +126,47 @@ class TestStaircase(TestCase):
         # Add two correct responses to staircase
         responses = [1, 1]
         for response in responses:
+            self.s.add_data_point(response)
             self.s._handle_response(response)
 
         # Assertions
+        # The second correct response decides a step down
         self.assertEqual(self.s.scores, [1, 1])
-        self.assertEqual(self.s._level_tracker, [1, 1])
+        self.assertEqual(self.s._level_tracker, [])
+        self.assertEqual(self.s._move, -1)
 
 
     def test__handle_response_one_incorrect(self):
         # Add response to staircase
         response = -1
+        self.s.add_data_point(response)
         self.s._handle_response(response)
 
         # Assertions
+        # An incorrect response decides a step up
         self.assertEqual(self.s.scores, [-1])
-        self.assertEqual(self.s._level_tracker, [-1])
+        self.assertEqual(self.s._level_tracker, [])
+        self.assertEqual(self.s._move, 1)
 
 
     def test__handle_response_two_incorrect(self):
         # Add two incorrect responses to staircase
         responses = [-1, -1]
         for response in responses:
+            self.s.add_data_point(response)
             self.s._handle_response(response)
 
         # Assertions
         self.assertEqual(self.s.scores, [-1, -1])
-        self.assertEqual(self.s._level_tracker, [-1, -1])
+        self.assertEqual(self.s._level_tracker, [])
+        self.assertEqual(self.s._move, 1)
 
 
     def test__calc_reversals_1(self):
-        # Update scores attribute
-        self.s.scores = [1, 1, -1]
+        # Log and score responses
+        for response in [1, 1, -1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -126,8 +175,10 @@ class TestStaircase(TestCase):
 
 
     def test__calc_reversals_2(self):
-        # Update scores attribute
-        self.s.scores = [-1, 1, 1]
+        # Log and score responses
+        for response in [-1, 1, 1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -136,8 +187,10 @@ class TestStaircase(TestCase):
 
 
     def test__calc_reversals_all_correct(self):
-        # Update scores attribute
-        self.s.scores = [1, 1, 1]
+        # Log and score responses
+        for response in [1, 1, 1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -146,8 +199,10 @@ class TestStaircase(TestCase):
 
 
     def test__calc_reversals_all_incorrect(self):
-        # Update scores attribute
-        self.s.scores = [-1, -1, -1]
+        # Log and score responses
+        for response in [-1, -1, -1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -156,8 +211,10 @@ class TestStaircase(TestCase):
 
 
     def test__calc_reversals_none_1(self):
-        # Update scores attribute
-        self.s.scores = [-1, 1, -1]
+        # Log and score responses
+        for response in [-1, 1, -1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -166,8 +223,10 @@ class TestStaircase(TestCase):
 
 
     def test__calc_reversals_none_2(self):
-        # Update scores attribute
-        self.s.scores = [1, -1, 1]
+        # Log and score responses
+        for response in [1, -1, 1]:
+            self.s.add_data_point(response)
+            self.s._handle_response(response)
         self.s._calc_reversals()
 
         # Assertions
@@ -363,3 +422,247 @@ class TestStaircase(TestCase):
 
         # No reversals should have occurred
         self.assertDictEqual(self.s.reversals, {})
+
+
+    def test_threshold_last_reversals(self):
+        # Reversals at 52, 60 with step 8, then 56, 60 with step 4
+        for response in [1, 1, -1, 1, 1, -1, 1, 1]:
+            self.s.add_response(response)
+
+        # Assertions
+        levels = np.array(list(self.s.reversals.values()))
+        mean, sd = self.s.threshold(last=3)
+        self.assertAlmostEqual(mean, levels[-3:].mean())
+        self.assertAlmostEqual(sd, levels[-3:].std(ddof=1))
+        mean, _ = self.s.threshold(last=None, exclude=1)
+        self.assertAlmostEqual(mean, levels[1:].mean())
+        self.assertEqual(self.s.threshold(phase=0)[0], 56)
+        self.assertEqual(self.s.threshold(phase=1)[0], 58)
+        self.assertTrue(np.isnan(self.s.threshold(phase=2)[0]))
+
+
+    def test_step_size_switches_after_nReversals(self):
+        for response in [1, 1, -1, 1]:
+            self.s.add_response(response)
+        self.assertEqual(self.s._step_index, 0)
+        self.s.add_response(1)
+
+        # Assertions
+        self.assertEqual(self.s._step_index, 1)
+        self.assertEqual(self.s._phase_starts, [0, 2])
+        self.assertEqual(self.s.current_level, 56)
+        self.assertFalse(self.s.finished)
+
+
+    def test_finished_after_final_phase_reversals(self):
+        for response in [1, 1, -1, 1, 1, -1, 1, 1]:
+            self.s.add_response(response)
+        self.assertTrue(self.s.finished)
+        self.s.add_response(-1)
+
+        # Assertions
+        self.assertEqual(len(self.s.levels), 8)
+
+
+    def test_finished_after_nTrials(self):
+        for response in [-1] * 12:
+            self.s.add_response(response)
+
+        # Assertions
+        self.assertTrue(self.s.finished)
+        self.assertEqual(len(self.s.levels), 10)
+
+
+    def test_run_with_responder(self):
+        with mock.patch('builtins.print') as mock_print:
+            self.s.run(lambda level: 1 if level > 55 else -1)
+
+        # Assertions
+        mock_print.assert_not_called()
+        self.assertTrue(self.s.finished)
+        self.assertEqual(len(self.s.reversals), 4)
+
+
+    def test_timestamps_logged(self):
+        self.s.add_response(1, onset_time=10.0, response_time=10.4)
+        self.s.add_response(-1)
+        dw = self.s.dw
+
+        # Assertions
+        self.assertEqual(dw.column('onset_time')[0], 10.0)
+        self.assertEqual(dw.column('response_time')[0], 10.4)
+        self.assertTrue(np.isnan(dw.column('onset_time')[1]))
+        self.assertTrue((dw.column('update_time') > 0).all())
+
+
+    def test_timing_summary(self):
+        for onset, rt in enumerate([0.3, 0.5, 0.4, 0.6]):
+            self.s.add_response(1, onset_time=onset, response_time=onset + rt)
+        self.s.add_response(1)
+        summary = self.s.timing_summary(bins=2)
+
+        # Assertions
+        self.assertEqual(summary['reaction_time']['count'], 4)
+        self.assertAlmostEqual(summary['reaction_time']['mean'], 0.45)
+        self.assertEqual(summary['reaction_time']['histogram'].tolist(), [2, 2])
+        self.assertEqual(summary['update_time']['count'], 5)
+        self.assertEqual(staircase.latency_summary([]), {'count': 0})
+
+
+    def test_invalid_responses_are_not_reversals(self):
+        """ Invalid responses after a reversal neither count as
+            reversals nor end the track, here or in a replay.
+        """
+        config = dict(start_val=60, step_sizes=[8,4], nUp=1, nDown=2,
+                      nTrials=50, nReversals=2, rapid_descend=False,
+                      min_val=0, max_val=100)
+        responses = [1, 1, -1, 0, 0, 0]
+        s = staircase.Staircase(**config)
+        for response in responses:
+            s.add_response(response)
+        _, state = replay.replay(config, responses)
+
+        # Assertions
+        self.assertEqual(s.reversals, {2: 52})
+        self.assertEqual(s._n_reversals, 1)
+        self.assertEqual(s._step_index, 0)
+        self.assertFalse(s.finished)
+        self.assertEqual(state['_n_reversals'], 1)
+        self.assertEqual(state['_step_index'], 0)
+
+
+    def test_state_machine_matches_legacy_rules(self):
+        """ Level and reversal decisions must match the original
+            array-matching rules over random response sequences,
+            including invalid responses.
+        """
+        rng = np.random.default_rng(13)
+        for nDown in [1, 2, 3, 4]:
+            for _ in range(25):
+                responses = rng.choice([1, -1, 0], size=60, p=[0.6, 0.35, 0.05])
+                s = staircase.Staircase(
+                    start_val=60,
+                    step_sizes=[4],
+                    nUp=1,
+                    nDown=nDown,
+                    nTrials=60,
+                    nReversals=60,
+                    rapid_descend=False,
+                    min_val=30,
+                    max_val=80
+                )
+                for response in responses:
+                    s.add_response(response)
+
+                levels, reversals = _legacy_track(
+                    responses, 60, [4], nDown, 30, 80)
+                self.assertEqual(s.levels, levels)
+                self.assertDictEqual(s.reversals, reversals)
+
+
+class TestDataWrangler(TestCase):
+    def setUp(self):
+        """ Create DataWrangler with a small initial capacity.
+        """
+        self.dw = staircase.DataWrangler(capacity=2)
+
+
+    def tearDown(self):
+        del self.dw
+
+
+    def test_new_data_point_row_view(self):
+        dp = self.dw.new_data_point()
+        dp.trial_number = 0
+        dp.level = 60
+        dp.response = -1
+
+        # Assertions
+        self.assertEqual(len(self.dw), 1)
+        self.assertEqual(self.dw.column('level').tolist(), [60])
+        self.assertEqual(self.dw.datapoints[0].response, -1)
+        self.assertFalse(dp.reversal)
+        with self.assertRaises(AttributeError):
+            dp.__dict__
+
+
+    def test_columns_grow(self):
+        for trial in range(5):
+            dp = self.dw.new_data_point()
+            dp.trial_number = trial
+
+        # Assertions
+        self.assertEqual(len(self.dw), 5)
+        self.assertEqual(
+            self.dw.column('trial_number').tolist(), [0, 1, 2, 3, 4])
+
+
+    def test_indexes_follow_new_data_points(self):
+        for trial, (response, reversal) in enumerate(
+                [(1, False), (-1, True), (1, False), (1, True)]):
+            dp = self.dw.new_data_point()
+            dp.trial_number = trial
+            dp.level = 60 + trial
+            dp.response = response
+            dp.reversal = reversal
+
+        # Assertions
+        self.assertEqual(self.dw.correct_rows().tolist(), [0, 2, 3])
+        self.assertEqual(self.dw.incorrect_rows().tolist(), [1])
+        self.assertEqual(self.dw.reversal_rows().tolist(), [1, 3])
+        self.assertEqual(self.dw.reversal_levels().tolist(), [61, 63])
+        self.assertEqual([dp.trial_number for dp in self.dw._get_reversals()],
+                         [1, 3])
+
+
+    def test_indexes_rebuild_on_older_row_edit(self):
+        for response in [1, 1, -1]:
+            self.dw.new_data_point().response = response
+        self.dw.datapoints[0].response = -1
+
+        # Assertions
+        self.assertEqual(self.dw.correct_rows().tolist(), [1])
+        self.assertEqual(self.dw.incorrect_rows().tolist(), [0, 2])
+
+
+    def test_reversal_stats(self):
+        for level in [60, 52, 64, 56, 58]:
+            dp = self.dw.new_data_point()
+            dp.level = level
+            dp.reversal = True
+
+        # Assertions
+        levels = np.array([52, 64, 56, 58])
+        count, mean, sd = self.dw.reversal_stats(1, 5)
+        self.assertEqual(count, 4)
+        self.assertAlmostEqual(mean, levels.mean())
+        self.assertAlmostEqual(sd, levels.std(ddof=1))
+        self.assertTrue(np.isnan(self.dw.reversal_stats(2, 3)[2]))
+        self.assertTrue(np.isnan(self.dw.reversal_stats(3, 3)[1]))
+
+
+class TestImportTime(TestCase):
+    # Wall-clock budget for a fresh interpreter running
+    # "from models import staircase", including numpy
+    IMPORT_BUDGET_S = 1.5
+
+    def test_import_budget(self):
+        """ Importing the staircase module must not load plotting,
+            statistics or pandas, and must fit the time budget.
+        """
+        code = (
+            "import sys, time\n"
+            "t = time.perf_counter()\n"
+            "from models import staircase\n"
+            "print(time.perf_counter() - t)\n"
+            "print(','.join(m for m in ('matplotlib', 'pandas', 'scipy')"
+            " if m in sys.modules))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root,
+                             capture_output=True, text=True, check=True)
+        elapsed, loaded = out.stdout.split("\n")[:2]
+
+        # Assertions
+        self.assertEqual(loaded, "")
+        self.assertLess(float(elapsed), self.IMPORT_BUDGET_S)
@@ -0,0 +1,96 @@
+""" Unit tests for parallel staircase sweeps.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+from unittest import TestCase
+
+# Import data science packages
+import pandas as pd
+
+# Import custom modules
+from models import rules
+from models import sweep
+from models.observers import (AttentionLapseObserver, FatigueObserver,
+                              GumbelObserver, LogisticObserver,
+                              TwoIntervalObserver)
+
+
+#########
+# Begin #
+#########
+class TestSweep(TestCase):
+    def setUp(self):
+        """ Define a small grid.
+        """
+        self.base = dict(
+            start_val=70,
+            step_sizes=[4,2],
+            nUp=1,
+            nTrials=60,
+            nReversals=4,
+            rapid_descend=False,
+            min_val=20,
+            max_val=80,
+            threshold=50,
+            slope=0.5,
+        )
+        self.grid = {'nDown': [2, 3], 'lapse_rate': [0.0, 0.02]}
+
+
+    def test_run_sweep_results(self):
+        df = sweep.run_sweep(self.grid, base=self.base, n_runs=300,
+                             chunk_size=100, max_workers=1)
+
+        # Assertions
+        self.assertIsInstance(df, pd.DataFrame)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df['nDown'].tolist(), [2, 2, 3, 3])
+        for column in ['threshold_bias', 'threshold_var',
+                       'trials_to_converge', 'converged']:
+            self.assertIn(column, df.columns)
+        self.assertTrue((df['threshold_bias'].abs() < 3).all())
+
+
+    def test_run_sweep_deterministic_across_workers(self):
+        serial = sweep.run_sweep(self.grid, base=self.base, n_runs=200,
+                                 chunk_size=50, seed=7, max_workers=1)
+        parallel = sweep.run_sweep(self.grid, base=self.base, n_runs=200,
+                                   chunk_size=50, seed=7, max_workers=2)
+
+        # Assertions
+        pd.testing.assert_frame_equal(serial, parallel)
+
+
+    def test_sweep_across_observers(self):
+        """ Observer models, including wrapped ones, can be swept in
+            worker processes, with targets from each model.
+        """
+        grid = {'nDown': [2], 'observer': [
+            LogisticObserver, GumbelObserver, TwoIntervalObserver,
+            sweep.Wrapped(FatigueObserver, LogisticObserver, drift=0.05),
+            sweep.Wrapped(AttentionLapseObserver, LogisticObserver,
+                          p_lapse=0.05, mean_duration=3),
+        ]}
+        df = sweep.run_sweep(grid, base=self.base, n_runs=200,
+                             chunk_size=100, max_workers=2)
+
+        # Assertions
+        self.assertEqual(df['observer'].tolist(), [
+            'LogisticObserver', 'GumbelObserver', 'TwoIntervalObserver',
+            "FatigueObserver(LogisticObserver, drift=0.05)",
+            "AttentionLapseObserver(LogisticObserver, p_lapse=0.05, "
+            "mean_duration=3)"])
+        target = LogisticObserver(50, 0.5).level_at(
+            rules.convergence_point(1, 2))
+        self.assertAlmostEqual(df['target_level'][0], target)
+        self.assertNotAlmostEqual(df['target_level'][1], target)
+        self.assertGreater(df['target_level'][4], target)
+        # Fatigue raises thresholds over the run
+        self.assertGreater(df['threshold_bias'][3], df['threshold_bias'][0])
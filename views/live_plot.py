@@ -0,0 +1,150 @@
+""" Live staircase track for embedding in a tkinter window.
+
+    LiveTrackPlot listens to a Staircase and paints each new trial
+    onto the existing image using blitting: only the newest segment,
+    response marker and reversal marker are drawn per trial, so the
+    redraw cost does not grow with session length. A full redraw only
+    happens when the x-axis has to be extended (its limit doubles
+    each time) or the window is resized.
+
+    Written by: Travis M. Moore
+    Created: October 16, 2026
+    Last edited: October 16, 2026
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+
+#########
+# BEGIN #
+#########
+class LiveTrackPlot:
+    """ Blitted live view of a Staircase track.
+
+        If master is given, the figure is embedded in that tkinter
+        widget (grid or pack self.widget). Otherwise an off-screen
+        Agg canvas is used. With listen=False the plot does not
+        register itself with the staircase, and events must be
+        passed to it (e.g. by a SessionPipeline display stage).
+    """
+    def __init__(self, staircase, master=None, n_trials=20,
+                 figsize=(5, 3), listen=True):
+        self.staircase = staircase
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+
+        if master is not None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+        else:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+
+        # Persistent artists, updated from the DataWrangler only on
+        # full redraws
+        self._track, = self.ax.plot([], [], color='k', linestyle='dashed')
+        self._correct, = self.ax.plot([], [], color='green', linestyle='none',
+                                      marker='o', label="Correct")
+        self._incorrect, = self.ax.plot([], [], color='red', linestyle='none',
+                                        marker='o', label="Incorrect")
+        self._reversals, = self.ax.plot(
+            [], [], marker='o', ms=15, markeredgewidth=3, linestyle='none',
+            color='k', fillstyle='none', label="Reversal")
+
+        # Animated artists for the newest trial
+        self._new_segment = Line2D([], [], color='k', linestyle='dashed',
+                                   animated=True)
+        self._new_point = Line2D([], [], linestyle='none', marker='o',
+                                 animated=True)
+        self._new_reversal = Line2D(
+            [], [], marker='o', ms=15, markeredgewidth=3, linestyle='none',
+            color='k', fillstyle='none', animated=True)
+        for artist in (self._new_segment, self._new_point,
+                       self._new_reversal):
+            self.ax.add_line(artist)
+
+        # Axes
+        pad = 0.05 * (staircase.max_val - staircase.min_val) or 1
+        self.ax.set_ylim(staircase.min_val - pad, staircase.max_val + pad)
+        self.ax.set_xlim(-0.5, n_trials)
+        self.ax.set_xlabel("Trial Number")
+        self.ax.set_ylabel("Level (dB SPL)")
+        self.ax.legend(loc='upper right')
+
+        self._background = None
+        self._last = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', self._sync)
+        if listen:
+            staircase.add_listener(self)
+        self.redraw()
+
+
+    def _on_draw(self, event):
+        """ Save the freshly drawn axes as the blitting background.
+        """
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+
+    def _sync(self, event=None):
+        """ Copy the full track from the DataWrangler into the
+            persistent artists.
+        """
+        dw = self.staircase.dw
+        x = dw.column('trial_number')
+        y = dw.column('level')
+        self._track.set_data(x, y)
+        for line, rows in ((self._correct, dw.correct_rows()),
+                           (self._incorrect, dw.incorrect_rows())):
+            line.set_data(x[rows], y[rows])
+        self._reversals.set_data(x[dw.reversal_rows()], dw.reversal_levels())
+        if len(x):
+            self._last = (x[-1], y[-1])
+
+
+    def redraw(self):
+        """ Redraw everything from the DataWrangler.
+        """
+        self._sync()
+        self.canvas.draw()
+
+
+    def __call__(self, event):
+        """ Paint a trial event onto the current image.
+        """
+        if event['event'] != 'trial':
+            return
+
+        x, y = event['trial_number'], event['level']
+        # Already drawn by a full redraw that read ahead of the events
+        if self._last is not None and x <= self._last[0]:
+            return
+        if x >= self.ax.get_xlim()[1]:
+            self.ax.set_xlim(-0.5, 2 * self.ax.get_xlim()[1])
+            self.redraw()
+            return
+
+        self.canvas.restore_region(self._background)
+        if self._last is not None:
+            self._new_segment.set_data([self._last[0], x], [self._last[1], y])
+            self.ax.draw_artist(self._new_segment)
+        if event['response'] in (1, -1):
+            color = 'green' if event['response'] == 1 else 'red'
+            self._new_point.set_data([x], [y])
+            self._new_point.set_color(color)
+            self.ax.draw_artist(self._new_point)
+        if event['reversal']:
+            self._new_reversal.set_data([x], [y])
+            self.ax.draw_artist(self._new_reversal)
+        self.canvas.blit(self.ax.bbox)
+
+        # The painted image becomes the background for the next trial
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._last = (x, y)